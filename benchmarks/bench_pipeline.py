@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark Suite with Regression Tracking
+
+Times the generation and validation pipeline end to end:
+
+- generate:    achieve_100_percent.generate_all_instructions (forced rebuild)
+- compile:     TauCompiler.compile_all over a DAG of synthetic ALU modules
+- orchestrate: ZKVMOrchestrator.orchestrate
+- runtime:     interpreter cycles/sec (see bench_runtime.py)
+- solver:      solve-call latency distribution through SolverPool, using
+               the fake solver so no Tau binary is needed
+
+Each run is appended to a JSON history file; `compare` diffs two runs and
+exits non-zero when a metric got worse by more than the threshold.
+
+    python3 bench_pipeline.py run [--suite generate compile ...] [--compare]
+    python3 bench_pipeline.py compare [--baseline -2] [--current -1] [--threshold 0.10]
+"""
+
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "compiler"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import achieve_100_percent
+from achieve_100_percent import generate_instruction_components
+from bench_runtime import benchmark_programs, measure
+from full_zkvm_orchestrator import ZKVMOrchestrator
+from tau_compiler import Constraint, ConstraintType, Module, TauCompiler, Variable
+from tau_solver_pool import FAKE_SOLVER_COMMAND, SolverPool, extract_commands
+
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "history.json"
+DEFAULT_THRESHOLD = 0.10
+RUNTIME_PROGRAMS = ("fibonacci_builtin", "countdown_loop")
+
+# Metric: {"value": float, "unit": str, "better": "lower" | "higher"}
+Metrics = Dict[str, Dict[str, object]]
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict[str, object]:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sample"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def bench_generate(jobs: int = 4) -> Metrics:
+    """Forced full rebuild of every instruction component"""
+    previous_dir = achieve_100_percent.OUTPUT_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        achieve_100_percent.OUTPUT_DIR = tmp
+        try:
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                report = achieve_100_percent.generate_all_instructions(force=True, jobs=jobs)
+                elapsed = time.perf_counter() - start
+        finally:
+            achieve_100_percent.OUTPUT_DIR = previous_dir
+
+    results = {
+        "generate.wall_seconds": metric(elapsed, "s"),
+        "generate.components_per_sec": metric(report["total_components"] / elapsed, "components/s", "higher"),
+    }
+    for phase, seconds in report["timing"]["phases"].items():
+        results[f"generate.phase.{phase}_seconds"] = metric(seconds, "s")
+    return results
+
+
+def synthetic_modules(count: int = 24) -> List[Module]:
+    """ALU modules in a layered DAG: module i reads modules i-1 and i//2"""
+    expressions = ["c = (a + b) mod 256", "c = a - b", "c = a * b"]
+    modules = []
+    for index in range(count):
+        a = Variable("a", width=8, is_input=True)
+        b = Variable("b", width=8, is_input=True)
+        c = Variable("c", width=8, is_output=True)
+        dependencies = sorted({f"alu_{index - 1}", f"alu_{index // 2}"} - {f"alu_{index}"}) if index else []
+        modules.append(Module(
+            name=f"alu_{index}",
+            variables=[a, b, c],
+            constraints=[Constraint(ConstraintType.ARITHMETIC, [a, b, c], expressions[index % 3])],
+            dependencies=dependencies
+        ))
+    return modules
+
+
+def bench_compile(modules: int = 24, split_mode: str = "greedy", jobs: int = 1) -> Metrics:
+    """TauCompiler.compile_all over synthetic_modules()"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = TauCompiler(output_dir=tmp, split_mode=split_mode)
+        for module in synthetic_modules(modules):
+            compiler.add_module(module)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            compiler.compile_all(jobs=jobs)
+            elapsed = time.perf_counter() - start
+
+    return {
+        "compile.wall_seconds": metric(elapsed, "s"),
+        "compile.files_per_sec": metric(len(compiler.generated_files) / elapsed, "files/s", "higher"),
+        "compile.module_cpu_seconds": metric(compiler.build_timing["module_cpu_seconds"], "s"),
+    }
+
+
+def bench_orchestrate(max_workers: int = 4) -> Metrics:
+    """One full ZKVMOrchestrator run into a scratch directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = ZKVMOrchestrator(output_dir=tmp)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            orchestrator.orchestrate(max_workers=max_workers)
+            elapsed = time.perf_counter() - start
+
+    succeeded = sum(1 for result in orchestrator.results.values() if result.success)
+    return {
+        "orchestrate.wall_seconds": metric(elapsed, "s"),
+        "orchestrate.critical_path_seconds": metric(orchestrator.schedule_stats.critical_path_time, "s"),
+        "orchestrate.utilization": metric(orchestrator.schedule_stats.utilization, "ratio", "higher"),
+        "orchestrate.tasks_succeeded": metric(succeeded, "tasks", "higher"),
+    }
+
+
+def bench_runtime(min_time: float = 0.5) -> Metrics:
+    """Interpreter throughput on the fixed benchmark programs"""
+    programs = benchmark_programs()
+    return {
+        f"runtime.{name}.cycles_per_sec": metric(
+            measure(programs[name], min_time, trace="off")["cycles_per_sec"], "cycles/s", "higher"
+        )
+        for name in RUNTIME_PROGRAMS
+    }
+
+
+def bench_solver(requests: int = 400, workers: int = 4) -> Metrics:
+    """Latency of solve calls issued concurrently to a warm pool of fake solvers"""
+    sources = [component.to_tau() for instruction in ("ADD", "AND", "EQ", "SHL")
+               for component in generate_instruction_components(instruction)]
+    commands = [extract_commands(source) for source in sources]
+
+    with SolverPool(FAKE_SOLVER_COMMAND, workers=workers) as pool:
+        # Start every worker before timing, so latencies exclude process startup
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda _: pool.solve("solve h=1"), range(workers)))
+        startup = time.perf_counter() - start
+
+        def timed(index: int) -> float:
+            began = time.perf_counter()
+            pool.solve(commands[index % len(commands)])
+            return time.perf_counter() - began
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            latencies = list(executor.map(timed, range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "solver.startup_seconds": metric(startup, "s"),
+        "solver.p50_ms": metric(percentile(latencies, 0.50) * 1000, "ms"),
+        "solver.p90_ms": metric(percentile(latencies, 0.90) * 1000, "ms"),
+        "solver.p99_ms": metric(percentile(latencies, 0.99) * 1000, "ms"),
+        "solver.max_ms": metric(max(latencies) * 1000, "ms"),
+        "solver.requests_per_sec": metric(requests / elapsed, "requests/s", "higher"),
+    }
+
+
+SUITES: Dict[str, Callable[[], Metrics]] = {
+    "generate": bench_generate,
+    "compile": bench_compile,
+    "orchestrate": bench_orchestrate,
+    "runtime": bench_runtime,
+    "solver": bench_solver,
+}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suites(names: List[str], label: str = "") -> Dict[str, object]:
+    """Run the named suites and return one history entry"""
+    metrics: Metrics = {}
+    for name in names:
+        print(f"Running {name}...", flush=True)
+        metrics.update(SUITES[name]())
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "revision": git_revision(),
+        "label": label,
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "metrics": metrics,
+    }
+
+
+def load_history(path: Path) -> List[Dict[str, object]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def append_history(path: Path, entry: Dict[str, object]):
+    """Append a run, replacing the file atomically so a crash never truncates it"""
+    history = load_history(path)
+    history.append(entry)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def compare_runs(baseline: Dict[str, object], current: Dict[str, object],
+                 threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, object]]:
+    """Per-metric changes; a change is a regression when it is worse by more than threshold"""
+    rows = []
+    for name, now in sorted(current["metrics"].items()):
+        before = baseline["metrics"].get(name)
+        if before is None:
+            continue
+        old, new = before["value"], now["value"]
+        change = (new - old) / old if old else 0.0
+        worse = change if now["better"] == "lower" else -change
+        rows.append({
+            "metric": name,
+            "unit": now["unit"],
+            "baseline": old,
+            "current": new,
+            "change": change,
+            "regression": worse > threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, object]], threshold: float):
+    print(f"{'metric':<42} {'baseline':>12} {'current':>12} {'change':>8}")
+    print("-" * 78)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['metric']:<42} {row['baseline']:>12.4g} {row['current']:>12.4g} "
+              f"{row['change']:>+7.1%}{flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{regressions} regression(s) over {threshold:.0%}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TauFoldZKVM pipeline benchmarks")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and append the results to the history")
+    run.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES))
+    run.add_argument("--label", default="", help="Free-form note stored with the run")
+    run.add_argument("--compare", action="store_true", help="Compare against the previous run afterwards")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare = commands.add_parser("compare", help="Compare two runs from the history")
+    compare.add_argument("--baseline", type=int, default=-2, help="History index of the baseline run")
+    compare.add_argument("--current", type=int, default=-1, help="History index of the run to check")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        entry = run_suites(args.suite, args.label)
+        append_history(args.history, entry)
+        for name, value in entry["metrics"].items():
+            print(f"  {name:<42} {value['value']:>12.4g} {value['unit']}")
+        print(f"\nAppended to {args.history}")
+        if not args.compare:
+            return 0
+        args.baseline, args.current = -2, -1
+
+    history = load_history(args.history)
+    try:
+        baseline, current = history[args.baseline], history[args.current]
+    except IndexError:
+        print(f"Need at least two runs in {args.history} to compare")
+        return 2
+    rows = compare_runs(baseline, current, args.threshold)
+    print_comparison(rows, args.threshold)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Runtime Microbenchmark
+
+Measures interpreter throughput (cycles/sec) of the Python runtime on the
+built-in Fibonacci program and the runtime/examples/*.json programs, with
+and without superinstruction fusion. Constraint validation is disabled so
+only the interpreter loop is timed.
+"""
+
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "runtime"))
+
+from python_runtime import TauFoldZKVM, create_fibonacci_program, load_json_program
+
+EXAMPLES_DIR = REPO_ROOT / "runtime" / "examples"
+
+
+def create_countdown_program(iterations: int = 1000) -> List[Tuple[str, List[int]]]:
+    """Tight counter loop built from fusable DUP/PUSH/EQ/JNZ and PUSH/SUB runs"""
+    return [
+        ("push", [iterations]),
+        ("dup", []), ("push", [0]), ("eq", []), ("jnz", [8]),   # Exit when counter hits 0
+        ("push", [1]), ("sub", []),                            # Decrement counter
+        ("jmp", [1]),
+        ("halt", [])
+    ]
+
+
+def benchmark_programs() -> Dict[str, List[Tuple[str, List[int]]]]:
+    """Collect the programs to benchmark, keyed by name"""
+    programs = {
+        "fibonacci_builtin": create_fibonacci_program(),
+        "countdown_loop": create_countdown_program(),
+    }
+    for path in sorted(EXAMPLES_DIR.glob("*.json")):
+        programs[path.stem] = load_json_program(path)
+    return programs
+
+
+def run_once(program: List[Tuple[str, List[int]]], superinstructions: bool = True,
+             trace: str = "list") -> Tuple[int, float]:
+    """Load and execute a program once, returning (cycles, seconds)"""
+    vm = TauFoldZKVM(validate_constraints=False, superinstructions=superinstructions, trace=trace)
+    vm.load_program(program)
+
+    # LOG/DEBUG print every call; keep them out of the timing output
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = vm.execute()
+        elapsed = time.perf_counter() - start
+
+    if not result["success"]:
+        raise RuntimeError(f"Benchmark program failed: {result['error']}")
+    return result["cycles"], elapsed
+
+
+def measure(program: List[Tuple[str, List[int]]], min_time: float = 0.5,
+            superinstructions: bool = True, trace: str = "list") -> Dict[str, float]:
+    """Repeat a program for min_time of wall clock and report execute() throughput"""
+    total_cycles = 0
+    total_time = 0.0
+    runs = 0
+
+    # VM construction is not timed, so bound the loop by wall clock
+    deadline = time.perf_counter() + min_time
+    while runs == 0 or time.perf_counter() < deadline:
+        cycles, elapsed = run_once(program, superinstructions, trace)
+        total_cycles += cycles
+        total_time += elapsed
+        runs += 1
+
+    return {
+        "runs": runs,
+        "cycles_per_run": total_cycles // runs,
+        "cycles_per_sec": total_cycles / total_time if total_time else 0.0,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TauFoldZKVM runtime microbenchmark")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to spend per program")
+    parser.add_argument("--trace", default="list", choices=["off", "list", "ring"],
+                        help="Execution trace mode to run with")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'program':<20} {'cycles/run':>10} {'cycles/sec':>14} {'unfused':>14} {'speedup':>8}")
+    print("-" * 70)
+    for name, program in benchmark_programs().items():
+        stats = measure(program, args.min_time, trace=args.trace)
+        baseline = measure(program, args.min_time, superinstructions=False, trace=args.trace)
+        stats["unfused_cycles_per_sec"] = baseline["cycles_per_sec"]
+        stats["superinstruction_speedup"] = (
+            stats["cycles_per_sec"] / baseline["cycles_per_sec"] if baseline["cycles_per_sec"] else 0.0
+        )
+        results[name] = stats
+        print(f"{name:<20} {stats['cycles_per_run']:>10} {stats['cycles_per_sec']:>14,.0f} "
+              f"{baseline['cycles_per_sec']:>14,.0f} {stats['superinstruction_speedup']:>7.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for the pipeline benchmark suite and its regression comparison"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_pipeline import (
+    append_history, bench_compile, bench_orchestrate, compare_runs, load_history, metric, percentile,
+    synthetic_modules
+)
+
+
+def run(**metrics):
+    return {"metrics": metrics}
+
+
+def test_regressions_respect_direction():
+    """Slower times and lower throughput regress; small or favourable changes do not"""
+    baseline = run(wall=metric(1.0, "s"), rate=metric(100.0, "x/s", "higher"), p50=metric(2.0, "ms"))
+    current = run(wall=metric(1.2, "s"), rate=metric(120.0, "x/s", "higher"), p50=metric(2.1, "ms"),
+                  new_metric=metric(5.0, "s"))
+    rows = {row["metric"]: row for row in compare_runs(baseline, current, threshold=0.10)}
+    assert set(rows) == {"wall", "rate", "p50"}
+    assert rows["wall"]["regression"] and abs(rows["wall"]["change"] - 0.2) < 1e-9
+    assert not rows["rate"]["regression"] and not rows["p50"]["regression"]
+
+    slower = run(rate=metric(80.0, "x/s", "higher"))
+    assert compare_runs(baseline, slower, threshold=0.10)[0]["regression"]
+    assert not compare_runs(baseline, slower, threshold=0.25)[0]["regression"]
+
+
+def test_history_appends():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.json"
+        assert load_history(path) == []
+        append_history(path, run(wall=metric(1.0, "s")))
+        append_history(path, run(wall=metric(0.5, "s")))
+        assert [entry["metrics"]["wall"]["value"] for entry in load_history(path)] == [1.0, 0.5]
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.5) == 50
+    assert percentile(samples, 0.99) == 99
+    assert percentile([7.0], 0.9) == 7.0
+
+
+def test_pipeline_suites_run():
+    """The compile and orchestrate suites run against the real pipeline"""
+    modules = synthetic_modules(6)
+    assert modules[5].dependencies == ["alu_2", "alu_4"]
+    assert bench_compile(modules=6)["compile.files_per_sec"]["value"] > 0
+    orchestrate = bench_orchestrate(max_workers=2)
+    assert orchestrate["orchestrate.tasks_succeeded"]["value"] > 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll benchmark suite tests passed")
@@ -8,16 +8,25 @@ import os
 import sys
 import json
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import List, Dict, Tuple, Set
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple, Set
 from dataclasses import dataclass
 from pathlib import Path
 from control_flow_generator import ControlFlowGenerator, generate_control_flow_instruction
+from build_writer import BuildWriter
+from constraint_bundle import open_bundle, write_bundle
+from constraint_ir import OPTIMIZER_VERSION, Conjunction, optimize
+from tau_solver_pool import DEFAULT_TAU_COMMAND
 
 # Configuration
 OUTPUT_DIR = "build/zkvm_100_percent"
 MAX_CHARS = 700  # Conservative limit
 PARALLEL_WORKERS = 8
+TAU_COMMAND = DEFAULT_TAU_COMMAND
+BUILD_MANIFEST = "build_manifest.json"      # component path -> constraint hash and expression length
+VALIDATION_CACHE = "validation_cache.json"  # .tau file hash -> verdict
+VALIDATION_CHECKPOINT = "validation_checkpoint.jsonl"  # Files finished by an unfinished run
 
 @dataclass
 class Component:
@@ -28,16 +37,17 @@ class Component:
     
     def to_tau(self) -> str:
         """Convert to Tau file content"""
-        expr = " && ".join(self.constraints)
-        if len(expr) > MAX_CHARS:
-            raise ValueError(f"{self.name}: Expression too long ({len(expr)} chars)")
+        interface = (self.assumptions or []) + (self.guarantees or [])
+        solve = Conjunction(optimize(self.constraints, keep=interface))
+        if solve.length > MAX_CHARS:
+            raise ValueError(f"{self.name}: Expression too long ({solve.length} chars)")
         
         content = f"# Component: {self.name}\n"
         if self.assumptions:
             content += f"# Assumptions: {', '.join(self.assumptions)}\n"
         if self.guarantees:
             content += f"# Guarantees: {', '.join(self.guarantees)}\n"
-        content += f"\nsolve {expr}\n\nquit"
+        content += f"\nsolve {solve.render()}\n\nquit"
         return content
 
 class ComponentGenerator:
@@ -1230,23 +1240,98 @@ def generate_instruction_components(instruction: str) -> List[Component]:
     
     return components
 
-def save_component(component: Component, output_dir: Path) -> Tuple[str, bool, int]:
-    """Save component to file and return status"""
-    try:
-        content = component.to_tau()
-        file_path = output_dir / f"{component.name}.tau"
-        
-        with open(file_path, 'w') as f:
-            f.write(content)
+def build_instruction(instruction: str, output_dir: str, previous_manifest: Dict[str, str],
+                      force: bool = False, previous_lengths: Optional[Dict[str, int]] = None) -> Dict:
+    """Generate, render and write one instruction's components (runs in a worker).
+    
+    Components matching previous_manifest (with a recorded expression
+    length in previous_lengths) are not rendered or written; the rest are
+    committed as one BuildWriter batch (atomic, skipping files whose
+    content is already on disk). Only plain data crosses back to the
+    parent: one (name, relative path, fingerprint, success, expression
+    length, written) row per component plus per-phase timings. Expression
+    lengths are those of the optimized solve expressions actually written.
+    """
+    previous_lengths = previous_lengths or {}
+    timings = {}
+    start = time.perf_counter()
+    components = generate_instruction_components(instruction)
+    timings["generate"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    inst_dir = Path(output_dir) / instruction.lower()
+    inst_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    pending_writes = []
+    for component in components:
+        relative_path = f"{instruction.lower()}/{component.name}.tau"
+        file_path = inst_dir / f"{component.name}.tau"
+        fingerprint = component_fingerprint(component)
+        
+        if (not force and previous_manifest.get(relative_path) == fingerprint
+                and relative_path in previous_lengths and file_path.exists()):
+            rows.append((component.name, relative_path, fingerprint, True, previous_lengths[relative_path], False))
+            continue
         
-        expr_len = len(" && ".join(component.constraints))
-        return component.name, True, expr_len
-        
-    except Exception as e:
-        return component.name, False, 0
+        try:
+            content = component.to_tau()
+            pending_writes.append((relative_path, content))
+            rows.append((component.name, relative_path, fingerprint, True, solve_length(content), True))
+        except Exception:
+            rows.append((component.name, relative_path, None, False, 0, False))
+    timings["render"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    writer = BuildWriter(output_dir)
+    with writer.batch():
+        for relative_path, content in pending_writes:
+            writer.write(relative_path, content)
+    timings["write"] = time.perf_counter() - start
+    
+    return {"instruction": instruction, "components": rows, "timings": timings}
+
+def solve_length(content: str) -> int:
+    """Length of the solve expression in rendered .tau content"""
+    for line in content.splitlines():
+        if line.startswith("solve "):
+            return len(line) - len("solve ")
+    return 0
+
+def component_fingerprint(component) -> str:
+    """Content hash of everything that ends up in a component's .tau file.
+    
+    Takes any component with name/constraints/assumptions/guarantees, since
+    control_flow_generator defines its own Component class.
+    """
+    payload = json.dumps([OPTIMIZER_VERSION, component.name, component.constraints,
+                          component.assumptions, component.guarantees])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def load_json(path: Path, default):
+    """Read a JSON build artifact, falling back to default if missing or corrupt"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def write_json_atomic(path: Path, data):
+    """Write JSON via a temporary file so readers never see a partial file"""
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(partial, path)
 
-def generate_all_instructions():
-    """Generate all instruction components for 100% coverage"""
+def generate_all_instructions(force: bool = False, jobs: int = PARALLEL_WORKERS):
+    """Generate all instruction components for 100% coverage.
+    
+    Each instruction is generated, rendered and written by one of `jobs`
+    worker processes (jobs=1 builds in-process). Components whose
+    fingerprint matches the build manifest and whose file still exists are
+    not rewritten; force=True rewrites everything.
+    """
+    build_start = time.perf_counter()
+    phase_times = {"generate": 0.0, "render": 0.0, "write": 0.0}
     
     # All instructions to generate
     all_instructions = [
@@ -1284,68 +1369,116 @@ def generate_all_instructions():
     # Process each instruction
     instruction_stats = {}
     
-    with ProcessPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
-        # Submit all tasks
-        future_to_instruction = {}
-        
-        for instruction in all_instructions:
-            # For now, only generate implemented instructions
-            # All instructions have been implemented through parallel subagents
-            if instruction in ["ADD", "SUB", "MUL", "DIV", "MOD", 
-                              "AND", "OR", "XOR", "NOT", "SHL", "SHR",
-                              "EQ", "NEQ", "LT", "GT", "LTE", "GTE",
-                              "LOAD", "STORE", "MLOAD", "MSTORE", "PUSH", "POP", "DUP", "SWAP",
-                              "JMP", "JZ", "JNZ", "CALL", "RET",
-                              "HASH", "VERIFY", "SIGN",
-                              "NOP", "HALT", "DEBUG", "ASSERT", "LOG", "READ", "WRITE",
-                              "SEND", "RECV", "TIME", "RAND", "ID"]:
-                components = generate_instruction_components(instruction)
-                
-                # Create instruction directory
-                inst_dir = output_dir / instruction.lower()
-                inst_dir.mkdir(exist_ok=True)
-                
-                # Submit save tasks
-                for component in components:
-                    future = executor.submit(save_component, component, inst_dir)
-                    future_to_instruction[future] = (instruction, component.name)
-            else:
-                # Placeholder for unimplemented instructions
-                instruction_stats[instruction] = {
-                    "status": "not_implemented",
-                    "components": 0,
-                    "max_chars": 0
-                }
-        
-        # Collect results
-        for future in as_completed(future_to_instruction):
-            instruction, comp_name = future_to_instruction[future]
-            name, success, expr_len = future.result()
-            
-            if instruction not in instruction_stats:
-                instruction_stats[instruction] = {
-                    "status": "success",
-                    "components": 0,
-                    "successful": 0,
-                    "failed": 0,
-                    "max_chars": 0
-                }
-            
-            instruction_stats[instruction]["components"] += 1
-            
+    # Content-addressed build state from the previous run
+    previous_build = {} if force else load_json(output_dir / BUILD_MANIFEST, {})
+    previous_manifest = previous_build.get("components", {})
+    previous_lengths = previous_build.get("expression_lengths", {})
+    manifest = {}
+    expression_lengths = {}
+    unchanged_components = 0
+    
+    def record(instruction: str, success: bool, expr_len: int):
+        nonlocal successful_components, failed_components, max_expr_length, total_components
+        if instruction not in instruction_stats:
+            instruction_stats[instruction] = {
+                "status": "success",
+                "components": 0,
+                "successful": 0,
+                "failed": 0,
+                "max_chars": 0
+            }
+        
+        instruction_stats[instruction]["components"] += 1
+        
+        if success:
+            instruction_stats[instruction]["successful"] = \
+                instruction_stats[instruction].get("successful", 0) + 1
+            successful_components += 1
+            max_expr_length = max(max_expr_length, expr_len)
+            instruction_stats[instruction]["max_chars"] = \
+                max(instruction_stats[instruction]["max_chars"], expr_len)
+        else:
+            instruction_stats[instruction]["failed"] = \
+                instruction_stats[instruction].get("failed", 0) + 1
+            failed_components += 1
+        
+        total_components += 1
+    
+    implemented_instructions = []
+    for instruction in all_instructions:
+        # For now, only generate implemented instructions
+        # All instructions have been implemented through parallel subagents
+        if instruction in ["ADD", "SUB", "MUL", "DIV", "MOD", 
+                          "AND", "OR", "XOR", "NOT", "SHL", "SHR",
+                          "EQ", "NEQ", "LT", "GT", "LTE", "GTE",
+                          "LOAD", "STORE", "MLOAD", "MSTORE", "PUSH", "POP", "DUP", "SWAP",
+                          "JMP", "JZ", "JNZ", "CALL", "RET",
+                          "HASH", "VERIFY", "SIGN",
+                          "NOP", "HALT", "DEBUG", "ASSERT", "LOG", "READ", "WRITE",
+                          "SEND", "RECV", "TIME", "RAND", "ID"]:
+            implemented_instructions.append(instruction)
+        else:
+            # Placeholder for unimplemented instructions
+            instruction_stats[instruction] = {
+                "status": "not_implemented",
+                "components": 0,
+                "max_chars": 0
+            }
+    
+    def collect(result: Dict):
+        nonlocal unchanged_components
+        for phase, seconds in result["timings"].items():
+            phase_times[phase] += seconds
+        for name, relative_path, fingerprint, success, expr_len, written in result["components"]:
             if success:
-                instruction_stats[instruction]["successful"] = \
-                    instruction_stats[instruction].get("successful", 0) + 1
-                successful_components += 1
-                max_expr_length = max(max_expr_length, expr_len)
-                instruction_stats[instruction]["max_chars"] = \
-                    max(instruction_stats[instruction]["max_chars"], expr_len)
-            else:
-                instruction_stats[instruction]["failed"] = \
-                    instruction_stats[instruction].get("failed", 0) + 1
-                failed_components += 1
-            
-            total_components += 1
+                manifest[relative_path] = fingerprint
+                expression_lengths[relative_path] = expr_len
+                if not written:
+                    unchanged_components += 1
+            record(result["instruction"], success, expr_len)
+    
+    def manifest_slice(entries: Dict, instruction: str) -> Dict:
+        prefix = f"{instruction.lower()}/"
+        return {path: value for path, value in entries.items() if path.startswith(prefix)}
+    
+    # Shard generation per instruction across workers
+    parallel_start = time.perf_counter()
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(build_instruction, instruction, str(output_dir),
+                                manifest_slice(previous_manifest, instruction), force,
+                                manifest_slice(previous_lengths, instruction))
+                for instruction in implemented_instructions
+            ]
+            for future in as_completed(futures):
+                collect(future.result())
+    else:
+        for instruction in implemented_instructions:
+            collect(build_instruction(instruction, str(output_dir), manifest_slice(previous_manifest, instruction),
+                                      force, manifest_slice(previous_lengths, instruction)))
+    build_wall_time = time.perf_counter() - parallel_start
+    
+    # Drop files of components that no longer exist or failed to save
+    cleanup_start = time.perf_counter()
+    removed_components = 0
+    for relative_path in set(previous_manifest) - set(manifest):
+        stale = output_dir / relative_path
+        if stale.exists():
+            stale.unlink()
+            removed_components += 1
+    
+    phase_times["cleanup"] = time.perf_counter() - cleanup_start
+    
+    manifest_start = time.perf_counter()
+    write_json_atomic(output_dir / BUILD_MANIFEST, {"version": 1, "components": manifest,
+                                                    "expression_lengths": expression_lengths})
+    phase_times["manifest"] = time.perf_counter() - manifest_start
+    
+    # Every component in one indexed file for the validators
+    bundle_start = time.perf_counter()
+    write_bundle(output_dir, names=sorted(manifest))
+    phase_times["bundle"] = time.perf_counter() - bundle_start
     
     # Generate report
     report = {
@@ -1357,6 +1490,16 @@ def generate_all_instructions():
         "successful_components": successful_components,
         "failed_components": failed_components,
         "max_expression_length": max_expr_length,
+        "written_components": total_components - unchanged_components,
+        "unchanged_components": unchanged_components,
+        "removed_components": removed_components,
+        "timing": {
+            "jobs": jobs,
+            "wall_seconds": time.perf_counter() - build_start,
+            "parallel_wall_seconds": build_wall_time,
+            # generate/render/write are summed over workers; the rest run in the parent
+            "phases": phase_times
+        },
         "instruction_stats": instruction_stats
     }
     
@@ -1370,6 +1513,10 @@ def generate_all_instructions():
     print(f"Successful: {successful_components} ({successful_components/total_components*100:.1f}%)")
     print(f"Failed: {failed_components}")
     print(f"Max expression length: {max_expr_length} chars")
+    print(f"Rewritten: {total_components - unchanged_components}, unchanged: {unchanged_components}, "
+          f"removed: {removed_components}")
+    print(f"Build time: {report['timing']['wall_seconds']:.2f}s with {jobs} jobs ("
+          + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phase_times.items()) + ")")
     
     print("\n=== Instruction Breakdown ===")
     for inst, stats in sorted(instruction_stats.items()):
@@ -1395,9 +1542,19 @@ def generate_all_instructions():
     
     return report
 
-def validate_all_components(report_path: str):
-    """Validate all generated components"""
-    import subprocess
+def validate_all_components(report_path: str, use_cache: bool = True, tau_command=TAU_COMMAND,
+                            workers: int = PARALLEL_WORKERS, slowest: int = 10):
+    """Validate all generated components.
+    
+    Files are solved concurrently on `workers` persistent Tau processes.
+    Verdicts are cached by .tau file content hash, so only files whose
+    content changed since the last run reach the solver. Each finished
+    file is appended to a checkpoint, so an interrupted run resumes where
+    it stopped; the checkpoint is removed once a run completes.
+    Components are read from the build's constraint bundle, whose index
+    already holds each file's hash.
+    """
+    from tau_solver_pool import SolverError, SolverPool, extract_commands
     
     report = json.load(open(report_path))
     output_dir = Path(OUTPUT_DIR)
@@ -1405,41 +1562,108 @@ def validate_all_components(report_path: str):
     print("\n=== Validating All Components ===")
     
     validation_results = {}
+    latencies = {}
     total_validated = 0
     total_satisfiable = 0
-    
-    # Find all .tau files
-    tau_files = list(output_dir.rglob("*.tau"))
+    total_cached = 0
+    total_resumed = 0
+    verdict_cache = load_json(output_dir / VALIDATION_CACHE, {}) if use_cache else {}
+    
+    # Progress of an interrupted run: path -> (file hash, verdict, seconds)
+    checkpoint_path = output_dir / VALIDATION_CHECKPOINT
+    checkpoint = {}
+    if use_cache and checkpoint_path.exists():
+        with open(checkpoint_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    checkpoint[entry["file"]] = (entry["hash"], entry["verdict"], entry["seconds"])
+                except (ValueError, KeyError):
+                    continue  # Torn last line of an interrupted run
+    
+    # Every component comes from one mapped bundle instead of a glob and an open per file
+    bundle = open_bundle(output_dir)
+    tau_files = [output_dir / entry.name for entry in bundle]
     
     print(f"Found {len(tau_files)} Tau files to validate...")
     
-    for tau_file in tau_files:
-        try:
-            result = subprocess.run(
-                ["../../../external_dependencies/run_tau.sh", str(tau_file)],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            total_validated += 1
-            
-            if "solution:" in result.stdout:
-                validation_results[str(tau_file)] = "satisfiable"
-                total_satisfiable += 1
+    def solve(tau_file: Path, text: str):
+        result = pool.solve(extract_commands(text))
+        if result.timed_out:
+            raise TimeoutError(result.error)
+        if result.error and not result.output:
+            # The solver crashed before answering: no verdict to cache or checkpoint
+            raise SolverError(result.error)
+        return "satisfiable" if "solution:" in result.output else "failed", result.elapsed
+    
+    def record(tau_file: Path, verdict: str):
+        nonlocal total_validated, total_satisfiable
+        total_validated += 1
+        validation_results[str(tau_file)] = verdict
+        if verdict == "satisfiable":
+            total_satisfiable += 1
+    
+    # Persistent Tau processes serve every file instead of one launch per file
+    with SolverPool(tau_command, workers=workers, timeout=5) as pool, \
+            ThreadPoolExecutor(max_workers=workers) as executor, \
+            open(checkpoint_path, 'a' if use_cache else 'w') as checkpoint_file:
+        futures = {}
+        for tau_file, entry in zip(tau_files, bundle):
+            file_hash = entry.sha256
+            resumed = checkpoint.get(str(tau_file))
+            if resumed and resumed[0] == file_hash:
+                total_resumed += 1
+                latencies[str(tau_file)] = resumed[2]
+                verdict_cache[file_hash] = resumed[1]
+                record(tau_file, resumed[1])
+            elif file_hash in verdict_cache:
+                total_cached += 1
+                record(tau_file, verdict_cache[file_hash])
             else:
-                validation_results[str(tau_file)] = "failed"
-                
-        except Exception as e:
-            validation_results[str(tau_file)] = f"error: {str(e)}"
+                futures[executor.submit(solve, tau_file, entry.text)] = (tau_file, file_hash)
+        
+        for future in as_completed(futures):
+            tau_file, file_hash = futures[future]
+            try:
+                verdict, seconds = future.result()
+            except Exception as e:
+                validation_results[str(tau_file)] = f"error: {str(e)}"
+                continue
+            
+            verdict_cache[file_hash] = verdict
+            latencies[str(tau_file)] = seconds
+            record(tau_file, verdict)
+            checkpoint_file.write(json.dumps({
+                "file": str(tau_file), "hash": file_hash, "verdict": verdict, "seconds": seconds
+            }) + "\n")
+            checkpoint_file.flush()
+    
+    bundle.close()
+    
+    # Errors and timeouts are never cached, so they are retried next run
+    write_json_atomic(output_dir / VALIDATION_CACHE, verdict_cache)
+    checkpoint_path.unlink()
+    
+    # Where solver time goes: slowest files and total per instruction
+    slowest_files = sorted(latencies.items(), key=lambda item: item[1], reverse=True)[:slowest]
+    instruction_seconds = {}
+    for file, seconds in latencies.items():
+        instruction = Path(file).parent.name
+        instruction_seconds[instruction] = instruction_seconds.get(instruction, 0.0) + seconds
     
     # Update report
     report["validation"] = {
         "total_files": len(tau_files),
         "total_validated": total_validated,
         "total_satisfiable": total_satisfiable,
+        "total_cached": total_cached,
+        "total_resumed": total_resumed,
+        "workers": workers,
         "success_rate": total_satisfiable / total_validated * 100 if total_validated > 0 else 0,
-        "results": validation_results
+        "results": validation_results,
+        "latency_seconds": latencies,
+        "slowest_files": [{"file": file, "seconds": seconds} for file, seconds in slowest_files],
+        "instruction_seconds": dict(sorted(instruction_seconds.items(), key=lambda item: item[1], reverse=True))
     }
     
     # Save updated report
@@ -1448,10 +1672,15 @@ def validate_all_components(report_path: str):
     
     print(f"\nValidation Results:")
     print(f"Total files: {len(tau_files)}")
-    print(f"Validated: {total_validated}")
+    print(f"Validated: {total_validated} ({total_cached} from cache, {total_resumed} resumed)")
     print(f"Satisfiable: {total_satisfiable}")
     print(f"Success rate: {report['validation']['success_rate']:.1f}%")
     
+    if slowest_files:
+        print(f"\nSlowest {len(slowest_files)} files:")
+        for file, seconds in slowest_files:
+            print(f"  {seconds * 1000:8.1f} ms  {file}")
+    
     if report['validation']['success_rate'] == 100:
         print("\n✅ 100% VALIDATION ACHIEVED!")
     else:
@@ -1461,17 +1690,28 @@ def validate_all_components(report_path: str):
 
 def main():
     """Main entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate and validate all TauFoldZKVM components")
+    parser.add_argument("--force", action="store_true",
+                        help="Rewrite every component and re-validate every file, ignoring build caches")
+    parser.add_argument("--jobs", type=int, default=PARALLEL_WORKERS,
+                        help="Worker processes for generation and Tau workers for validation (1 = in-process)")
+    args = parser.parse_args()
+    
     print("TauFoldZKVM - Achieving 100% Implementation and Validation\n")
     
     # Step 1: Generate all components
-    generation_report = generate_all_instructions()
+    generation_report = generate_all_instructions(force=args.force, jobs=args.jobs)
     
     # Step 2: Validate all components
     if generation_report["successful_components"] > 0:
         print("\nStarting validation phase...")
         time.sleep(1)
         validation_report = validate_all_components(
-            Path(OUTPUT_DIR) / "generation_report.json"
+            Path(OUTPUT_DIR) / "generation_report.json",
+            use_cache=not args.force,
+            workers=args.jobs
         )
         
         # Print final summary
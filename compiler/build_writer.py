@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Shared writer for build outputs (.tau files, summaries, archives)
+
+Generators used to open/write/close one file at a time. BuildWriter
+buffers writes and commits them in batches:
+
+- every file is written to a .partial sibling and renamed over the target,
+  so readers never see a half-written component;
+- a file whose bytes already match what is on disk is not rewritten (no
+  rename, no mtime change);
+- with fsync=True each flush syncs its files, then each touched
+  directory once, instead of paying for it per write call.
+
+pack_archive() packs a build tree into one indexed archive:
+
+    ARCHIVE_HEADER (magic, index length) | JSON index | constraint text
+
+The index maps each relative path to the offset (from the end of the
+index), length and sha256 of its UTF-8 text, plus the mtime_ns and size of
+the source file when packed from a tree. Packing from a tree also records
+a directory manifest: the mtime_ns and listing hash (see directory_state)
+of every directory holding a packed file. Readers can then tell when files
+were added or edited after packing by checking only the directories. The
+root gets its listing hash only, because writing the archive or a report
+there moves its mtime.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+DEFAULT_BUFFER_BYTES = 1 << 20      # Flush a batch early once this much is pending
+ARCHIVE_MAGIC = b"TAUARCH1"
+ARCHIVE_HEADER = struct.Struct("<8sQ")   # magic, index length in bytes
+
+PathLike = Union[str, Path]
+
+
+class BuildWriter:
+    """
+    Buffered, atomic, skip-if-unchanged writer rooted at one output directory.
+
+    Outside batch() every write is committed immediately. Inside batch(),
+    writes are buffered until the outermost batch exits or buffer_bytes of
+    content is pending; nested batches (a module inside a whole build)
+    commit once at the outer level.
+    """
+
+    def __init__(self, root: PathLike, fsync: bool = False, buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        self.root = Path(root)
+        self.fsync = fsync
+        self.buffer_bytes = buffer_bytes
+        self.stats = {"written": 0, "unchanged": 0, "bytes_written": 0, "flushes": 0, "fsyncs": 0}
+        self._pending: Dict[Path, bytes] = {}
+        self._pending_bytes = 0
+        self._depth = 0
+        self._made_dirs = set()
+
+    def write(self, relative_path: PathLike, content: Union[str, bytes]):
+        """Queue content for root/relative_path (absolute paths are used as given).
+
+        A later write to the same path before the flush wins.
+        """
+        data = content.encode() if isinstance(content, str) else content
+        path = self.root / relative_path
+        self._pending_bytes += len(data) - len(self._pending.get(path, b""))
+        self._pending[path] = data
+        if self._depth == 0 or self._pending_bytes >= self.buffer_bytes:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Buffer writes until the outermost batch exits."""
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.flush()
+
+    def flush(self):
+        """Commit every pending write: temp files first, then the renames."""
+        pending, self._pending, self._pending_bytes = self._pending, {}, 0
+        staged = []
+        for path, data in pending.items():
+            if _matches(path, data):
+                self.stats["unchanged"] += 1
+                continue
+            if path.parent not in self._made_dirs:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._made_dirs.add(path.parent)
+            partial = path.with_name(path.name + ".partial")
+            with open(partial, 'wb') as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.stats["fsyncs"] += 1
+            staged.append((partial, path))
+            self.stats["bytes_written"] += len(data)
+
+        for partial, path in staged:
+            os.replace(partial, path)
+        self.stats["written"] += len(staged)
+        if staged:
+            self.stats["flushes"] += 1
+
+        # Make the renames durable: one fsync per touched directory
+        if self.fsync:
+            for directory in {path.parent for _, path in staged}:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                self.stats["fsyncs"] += 1
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> "BuildWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _matches(path: Path, data: bytes) -> bool:
+    """True if path already holds exactly data (size checked before reading)."""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def directory_state(path: PathLike) -> Tuple[int, str]:
+    """(mtime_ns, listing hash) of a directory; the listing is its .tau files and subdirectories.
+
+    BuildWriter commits by rename, so any write through it moves the
+    directory's mtime; other files (archives, reports) do not change the listing.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    with os.scandir(path) as items:
+        listing = sorted(item.name + "/" if item.is_dir() else item.name
+                         for item in items if item.is_dir() or item.name.endswith(".tau"))
+    return mtime_ns, hashlib.sha256("\n".join(listing).encode()).hexdigest()
+
+
+def encode_archive(entries: Dict[str, str], sources: Optional[Dict[str, Tuple[int, int]]] = None,
+                   directories: Optional[Dict[str, Tuple[Optional[int], str]]] = None) -> bytes:
+    """Serialize name -> text entries into the indexed archive layout.
+
+    sources optionally maps names to the (mtime_ns, size) of the file each
+    text was read from, and directories maps relative directory paths ("" is
+    the root) to their directory_state(); both are recorded in the index for
+    staleness checks.
+    """
+    index = {}
+    blobs = []
+    offset = 0
+    sources = sources or {}
+    for name in sorted(entries):
+        data = entries[name].encode()
+        index[name] = {"offset": offset, "length": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        if name in sources:
+            index[name]["mtime_ns"], index[name]["size"] = sources[name]
+        blobs.append(data)
+        offset += len(data)
+    document = {"version": 1, "entries": index}
+    if directories is not None:
+        document["directories"] = {name: list(state) for name, state in sorted(directories.items())}
+    header = json.dumps(document, separators=(",", ":")).encode()
+    return ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, len(header)) + header + b"".join(blobs)
+
+
+def pack_archive(root: PathLike, archive_path: PathLike, pattern: str = "*.tau",
+                 names: Optional[Iterable[str]] = None, writer: Optional[BuildWriter] = None) -> int:
+    """
+    Pack files under root into one indexed archive, returning the entry count.
+
+    names (paths relative to root) selects the files; by default every file
+    matching pattern below root. The archive is committed through writer
+    (or a fresh BuildWriter), so an unchanged tree leaves it untouched.
+    """
+    root = Path(root)
+    archive_path = Path(archive_path).absolute()
+    if names is None:
+        names = (path.relative_to(root).as_posix() for path in root.rglob(pattern))
+    names = list(names)
+
+    # Directories are recorded before their files are read, so a write racing
+    # the pack leaves the archive stale rather than silently out of date
+    directories = {""}
+    for name in names:
+        parts = name.split("/")[:-1]
+        directories.update("/".join(parts[:depth]) for depth in range(1, len(parts) + 1))
+    manifest = {directory: directory_state(root / directory) for directory in directories}
+    manifest[""] = (None, manifest[""][1])
+
+    entries = {}
+    sources = {}
+    for name in names:
+        path = root / name
+        stat = path.stat()
+        entries[name] = path.read_text()
+        sources[name] = (stat.st_mtime_ns, stat.st_size)
+
+    writer = writer or BuildWriter(archive_path.parent)
+    writer.write(archive_path, encode_archive(entries, sources, manifest))
+    return len(entries)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Single-file indexed constraint bundles
+
+A bundle is the archive written by build_writer.pack_archive():
+
+    ARCHIVE_HEADER (magic, index length) | JSON index | constraint text
+
+with the index mapping each component's relative path (e.g.
+"add/add_nibble_0.tau") to the offset, length and sha256 of its text.
+ConstraintBundle memory-maps the file once, so loading every constraint
+of a build is one open + mmap instead of a glob and an open per file;
+component hashes come straight from the index without reading the text.
+
+open_bundle(root) prefers root/BUNDLE_FILE and otherwise packs the .tau
+tree below root in memory, so callers use one code path either way. The
+index records the mtime and listing of every packed directory, and each
+source file's mtime and size. If a .tau file was added or rewritten after
+packing (the fix scripts do this through BuildWriter), open_bundle repacks
+before serving, so readers never see text older than the tree. Checking
+costs one stat per directory; files are only looked at in directories
+that changed. Read-only callers (repack=False) get the tree packed in
+memory instead, and nothing is written.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from build_writer import ARCHIVE_HEADER, ARCHIVE_MAGIC, directory_state, encode_archive, pack_archive
+
+BUNDLE_FILE = "constraints.tauarch"
+
+PathLike = Union[str, Path]
+
+
+class BundleError(Exception):
+    """Raised when a bundle is truncated or not a constraint archive"""
+    pass
+
+
+class BundleEntry:
+    """One component of a bundle; its text is read from the mapping on demand"""
+
+    __slots__ = ("name", "offset", "length", "sha256", "source", "_bundle")
+
+    def __init__(self, bundle: "ConstraintBundle", name: str, offset: int, length: int, sha256: str,
+                 source: Optional[tuple] = None):
+        self.name = name
+        self.offset = offset   # Absolute offset in the bundle
+        self.length = length
+        self.sha256 = sha256
+        self.source = source   # (mtime_ns, size) of the packed file, if packed from a tree
+        self._bundle = bundle
+
+    @property
+    def data(self) -> bytes:
+        return self._bundle._buffer[self.offset:self.offset + self.length]
+
+    @property
+    def text(self) -> str:
+        return self.data.decode()
+
+    def __repr__(self):
+        return f"BundleEntry({self.name!r}, {self.length} bytes)"
+
+
+class ConstraintBundle:
+    """
+    Read-only view of a constraint bundle.
+
+    Built from a path (memory-mapped) or from bytes already in memory.
+    Entries are iterated in name order.
+    """
+
+    def __init__(self, source: Union[PathLike, bytes]):
+        self.path: Optional[Path] = None
+        self.packed_ns: Optional[int] = None   # mtime of the archive file
+        self._file = None
+        if isinstance(source, (bytes, bytearray)):
+            self._buffer = bytes(source)
+        else:
+            self.path = Path(source)
+            self._file = open(self.path, 'rb')
+            self.packed_ns = os.fstat(self._file.fileno()).st_mtime_ns
+            try:
+                self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                self._file.close()
+                raise BundleError(f"{self.path}: empty bundle")
+        # Relative directory -> (mtime_ns, listing hash) when packed; None if packed without a tree
+        self.directories: Optional[Dict[str, Tuple[Optional[int], str]]] = None
+        self.entries: Dict[str, BundleEntry] = self._read_index()
+
+    def _read_index(self) -> Dict[str, BundleEntry]:
+        where = self.path or "bundle"
+        if len(self._buffer) < ARCHIVE_HEADER.size:
+            raise BundleError(f"{where}: truncated header")
+        magic, index_length = ARCHIVE_HEADER.unpack_from(self._buffer)
+        if magic != ARCHIVE_MAGIC:
+            raise BundleError(f"{where}: not a constraint bundle")
+        start = ARCHIVE_HEADER.size + index_length
+        try:
+            document = json.loads(bytes(self._buffer[ARCHIVE_HEADER.size:start]))
+            index = document["entries"]
+        except (ValueError, KeyError) as e:
+            raise BundleError(f"{where}: corrupt index ({e})")
+        if "directories" in document:
+            self.directories = {name: tuple(state) for name, state in document["directories"].items()}
+
+        entries = {}
+        for name, entry in sorted(index.items()):
+            offset = start + entry["offset"]
+            if offset + entry["length"] > len(self._buffer):
+                raise BundleError(f"{where}: {name} extends past the end of the bundle")
+            source = (entry["mtime_ns"], entry["size"]) if "mtime_ns" in entry else None
+            entries[name] = BundleEntry(self, name, offset, entry["length"], entry["sha256"], source)
+        return entries
+
+    def entry(self, name: str) -> BundleEntry:
+        return self.entries[name]
+
+    def read_text(self, name: str) -> str:
+        return self.entries[name].text
+
+    def names(self, prefix: str = "") -> Iterator[str]:
+        """Component names, optionally only those under a directory prefix like "add/"."""
+        return (name for name in self.entries if name.startswith(prefix))
+
+    def stale(self, root: PathLike) -> List[str]:
+        """Files under root added or changed since packing, in name order.
+
+        One stat per packed directory; only a directory whose mtime moved is
+        listed (the root, recorded without an mtime, always is), and only
+        its files are compared with the index. Timestamps are coarse, so a
+        directory or file last changed no earlier than the archive itself
+        ("racy", as git calls it) is always checked, by content. Files that no longer exist are not stale: the bundle keeps
+        serving them until it is next repacked from the tree.
+        """
+        root = Path(root)
+        if self.directories is None:
+            # Packed in memory (nothing to compare), or an archive from before
+            # the manifest: report its files so open_bundle repacks it once
+            return sorted(entry.name for entry in self if entry.source is not None)
+        changed = []
+        for directory, (mtime_ns, listing) in self.directories.items():
+            path = root / directory
+            try:
+                if mtime_ns is not None and os.stat(path).st_mtime_ns == mtime_ns and not self._racy(mtime_ns):
+                    continue
+                same_listing = directory_state(path)[1] == listing
+            except FileNotFoundError:
+                continue
+            prefix = f"{directory}/" if directory else ""
+            with os.scandir(path) as items:
+                for item in items:
+                    name = prefix + item.name
+                    if item.is_dir():
+                        if not same_listing and name not in self.directories:
+                            changed.extend(found.relative_to(root).as_posix()
+                                           for found in Path(item.path).rglob("*.tau"))
+                    elif item.name.endswith(".tau"):
+                        entry = self.entries.get(name)
+                        if entry is None:
+                            if not same_listing:
+                                changed.append(name)
+                        elif entry.source is not None and self._changed(entry, item):
+                            changed.append(name)
+        return sorted(changed)
+
+    def _racy(self, mtime_ns: int) -> bool:
+        return self.packed_ns is None or mtime_ns >= self.packed_ns
+
+    def _changed(self, entry: BundleEntry, item: os.DirEntry) -> bool:
+        stat = item.stat()
+        if (stat.st_mtime_ns, stat.st_size) != entry.source:
+            return True
+        if self._racy(stat.st_mtime_ns):
+            with open(item.path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest() != entry.sha256
+        return False
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __iter__(self) -> Iterator[BundleEntry]:
+        return iter(self.entries.values())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self):
+        if self._file is not None:
+            self._buffer.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ConstraintBundle":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_bundle(root: PathLike, names: Optional[Iterable[str]] = None) -> int:
+    """Pack the .tau files under root (or just names) into root/BUNDLE_FILE."""
+    return pack_archive(root, Path(root) / BUNDLE_FILE, names=names)
+
+
+def open_bundle(root: PathLike, names: Optional[Iterable[str]] = None,
+                archive: str = BUNDLE_FILE, repack: bool = True) -> ConstraintBundle:
+    """
+    The bundle of a build directory.
+
+    Maps root/archive if it exists, repacking it first when a file was
+    added to or rewritten in its tree since it was written; otherwise packs
+    the listed files (default: every .tau file below root) in memory. With
+    repack=False a stale archive is left as it is and its files are packed
+    in memory, so the call never writes.
+    """
+    root = Path(root)
+    if (root / archive).exists():
+        bundle = ConstraintBundle(root / archive)
+        changed = bundle.stale(root)
+        if not changed:
+            return bundle
+        packed = sorted({name for name in bundle.names() if (root / name).exists()} | set(changed))
+        bundle.close()
+        if not repack:
+            return ConstraintBundle(encode_archive({name: (root / name).read_text() for name in packed}))
+        pack_archive(root, root / archive, names=packed)
+        return ConstraintBundle(root / archive)
+    if names is None:
+        names = (path.relative_to(root).as_posix() for path in root.rglob("*.tau"))
+    return ConstraintBundle(encode_archive({name: (root / name).read_text() for name in names}))
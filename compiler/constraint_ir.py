@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Constraint IR and Optimizer for Generated Tau Expressions
+
+Generators emit Tau conjuncts such as `s0=(a0+b0)` into a shared IR: an
+interned expression DAG of Node objects. Nodes are hash-consed, so equal
+subexpressions are the same object and compare by identity, and each node
+knows how many characters it renders to as soon as it is built. A
+Conjunction collects the conjuncts of one solve command and keeps its
+rendered length up to date, so fitting a conjunct under the 700-char limit
+is a constant-time check instead of building the text and measuring it.
+
+Before a component is rendered, optimize() runs four passes over it:
+
+1. constant and copy propagation (`a0=1` folds into `(a0&b0)`)
+2. algebraic simplification: XOR terms cancel in pairs and fold their
+   constants, AND/OR are idempotent and absorb 0, 1 and complements
+3. common-subexpression elimination against earlier definitions
+4. dead-variable removal of intermediates nothing observable reads
+
+Interface variables - input pins, outputs nothing else reads, and any
+name the caller passes in `keep` - keep their defining equation, so the
+result is satisfiable exactly when the input is and assigns them the same
+values. Conjuncts outside the and/or/xor/not fragment pass through
+untouched, and inputs that simplify to a contradiction are returned as
+they are so the solver reports them. When nothing survives, the result is
+the trivially true `1=1`, so a solve command is never empty.
+"""
+
+import re
+import heapq
+import threading
+import weakref
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+# Bump whenever optimizer output changes, so incremental builds re-render
+OPTIMIZER_VERSION = 3
+
+TOKEN = re.compile(r"\s*(?:([A-Za-z_]\w*)|(\d+)|(.))")
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+NATURAL = re.compile(r"(\d+)")
+
+# Binary operators, loosest binding first
+OPERATORS = ("|", "+", "&")
+SEPARATOR = " && "
+
+
+class ConstraintSyntaxError(Exception):
+    """Raised for conjuncts outside the optimizable fragment"""
+    pass
+
+
+class Node:
+    """One interned expression; build nodes with the functions below, never directly.
+
+    op is "var", "const", one of OPERATORS (terms flattened and sorted),
+    "=" for an equation (terms are its two sides) or "raw" for a conjunct
+    kept verbatim. length is the number of characters the node renders to.
+    """
+    __slots__ = ("op", "name", "terms", "length", "_text", "_variables", "__weakref__")
+
+    def __init__(self, op: str, name: str, terms: Tuple["Node", ...]):
+        self.op = op
+        self.name = name
+        self.terms = terms
+        if op == "=":
+            self.length = terms[0].length + 1 + terms[1].length
+            self._text = None
+        elif terms:
+            # "(" + terms joined by op + ")"
+            self.length = sum(term.length for term in terms) + len(terms) + 1
+            self._text = None
+        else:
+            self.length = len(name)
+            self._text = name
+        self._variables = None
+
+    @property
+    def text(self) -> str:
+        """Tau syntax; compound terms are always parenthesized"""
+        if self._text is None:
+            if self.op == "=":
+                self._text = self.terms[0].text + "=" + self.terms[1].text
+            else:
+                self._text = "(" + self.op.join(term.text for term in self.terms) + ")"
+        return self._text
+
+    @property
+    def variables(self) -> FrozenSet[str]:
+        if self._variables is None:
+            if self.op == "var":
+                self._variables = frozenset((self.name,))
+            elif self.op == "raw":
+                self._variables = frozenset(IDENTIFIER.findall(self.name))
+            else:
+                found = set()
+                for term in self.terms:
+                    found |= term.variables
+                self._variables = frozenset(found)
+        return self._variables
+
+    @property
+    def value(self) -> int:
+        return int(self.name)
+
+    def __repr__(self):
+        return f"Node({self.text!r})"
+
+
+# Hash-consing table: (op, name, terms) -> the one live node with that shape.
+# Terms are interned too, so keys hash and compare child nodes by identity.
+_NODES: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+_NODES_LOCK = threading.Lock()
+
+
+def _intern(op: str, name: str = "", terms: Tuple[Node, ...] = ()) -> Node:
+    key = (op, name, terms)
+    node = _NODES.get(key)
+    if node is None:
+        with _NODES_LOCK:
+            node = _NODES.get(key)
+            if node is None:
+                node = Node(op, name, terms)
+                _NODES[key] = node
+    return node
+
+
+# Emitters may pass conjuncts as text or as already-built equation nodes
+Conjunct = Union[str, Node]
+
+ZERO = _intern("const", "0")
+ONE = _intern("const", "1")
+
+
+def var(name: str) -> Node:
+    return _intern("var", name)
+
+
+def const(bit: int) -> Node:
+    return ONE if bit else ZERO
+
+
+def raw(text: str) -> Node:
+    """A conjunct the IR does not interpret, emitted exactly as given"""
+    return _intern("raw", text.strip())
+
+
+def equation(left: Node, right: Node) -> Node:
+    return _intern("=", "", (left, right))
+
+
+# Stands in for a component whose every conjunct was optimized away
+TRUE = equation(ONE, ONE)
+
+
+def render(node: Node) -> str:
+    return node.text
+
+
+def variables(node: Node) -> FrozenSet[str]:
+    return node.variables
+
+
+def _order(node: Node):
+    """Variables (in natural order), then compound terms, then constants"""
+    if node.op == "var":
+        return (0, [int(p) if p.isdigit() else p for p in NATURAL.split(node.name)], "")
+    if node.op == "const":
+        return (2, [], node.name)
+    return (1, [], node.text)
+
+
+def xor(*operands: Node) -> Node:
+    """Sum over GF(2): equal terms cancel pairwise, constants fold into one bit"""
+    parity = 0
+    terms: Set[Node] = set()
+    pending = list(operands)
+    while pending:
+        term = pending.pop()
+        if term.op == "const":
+            parity ^= term.value
+        elif term.op == "+":
+            pending.extend(term.terms)
+        else:
+            terms ^= {term}
+    ordered = sorted(terms, key=_order) + ([ONE] if parity else [])
+    if not ordered:
+        return ZERO
+    return ordered[0] if len(ordered) == 1 else _intern("+", "", tuple(ordered))
+
+
+def _idempotent(op: str, absorbing: Node, neutral: Node, operands: Iterable[Node]) -> Node:
+    terms: Set[Node] = set()
+    pending = list(operands)
+    while pending:
+        term = pending.pop()
+        if term is absorbing:
+            return absorbing
+        if term.op == op:
+            pending.extend(term.terms)
+        elif term is not neutral:
+            terms.add(term)
+    # x and its complement x+1 together: x&x' = 0, x|x' = 1
+    if any(xor(term, ONE) in terms for term in terms):
+        return absorbing
+    if not terms:
+        return neutral
+    ordered = sorted(terms, key=_order)
+    return ordered[0] if len(ordered) == 1 else _intern(op, "", tuple(ordered))
+
+
+def conj(*operands: Node) -> Node:
+    return _idempotent("&", ZERO, ONE, operands)
+
+
+def disj(*operands: Node) -> Node:
+    return _idempotent("|", ONE, ZERO, operands)
+
+
+def negate(operand: Node) -> Node:
+    """Complement, written x+1 (Tau's postfix ' parses to the same node)"""
+    return xor(operand, ONE)
+
+
+def assign(name: str, value: Union[int, Node]) -> Node:
+    """The conjunct name=value for a constant bit or an expression"""
+    return equation(var(name), const(value) if isinstance(value, int) else value)
+
+
+def pins(prefix: str, bits: Iterable[int]) -> List[Node]:
+    """Input pins prefix0=b0, prefix1=b1, ... (least significant bit first)"""
+    return [assign(f"{prefix}{index}", bit) for index, bit in enumerate(bits)]
+
+
+BUILDERS = {"+": xor, "&": conj, "|": disj}
+
+
+def parse_expression(text: str) -> Node:
+    """Parse Tau Boolean syntax (| + & and postfix ' over 0/1) into normal form"""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        name, number, symbol = match.groups()
+        if name:
+            tokens.append(("var", name))
+        elif number in ("0", "1"):
+            tokens.append(("const", number))
+        elif symbol and symbol in "()|+&'":
+            tokens.append(("op", symbol))
+        else:
+            raise ConstraintSyntaxError(f"Unsupported token: {(number or symbol)!r}")
+        position = match.end()
+
+    expression, position = _parse_binary(tokens, 0, 0)
+    if position != len(tokens):
+        raise ConstraintSyntaxError(f"Unexpected {tokens[position][1]!r} in {text!r}")
+    return expression
+
+
+def _parse_binary(tokens, position: int, level: int):
+    if level == len(OPERATORS):
+        return _parse_atom(tokens, position)
+    symbol = OPERATORS[level]
+    operands = []
+    operand, position = _parse_binary(tokens, position, level + 1)
+    operands.append(operand)
+    while position < len(tokens) and tokens[position] == ("op", symbol):
+        operand, position = _parse_binary(tokens, position + 1, level + 1)
+        operands.append(operand)
+    return (BUILDERS[symbol](*operands) if len(operands) > 1 else operands[0]), position
+
+
+def _parse_atom(tokens, position: int):
+    if position >= len(tokens):
+        raise ConstraintSyntaxError("Unexpected end of expression")
+    kind, value = tokens[position]
+    if kind == "var":
+        expression, position = var(value), position + 1
+    elif kind == "const":
+        expression, position = const(int(value)), position + 1
+    elif value == "(":
+        expression, position = _parse_binary(tokens, position + 1, 0)
+        if position >= len(tokens) or tokens[position] != ("op", ")"):
+            raise ConstraintSyntaxError("Unbalanced parentheses")
+        position += 1
+    else:
+        raise ConstraintSyntaxError(f"Unexpected {value!r}")
+
+    while position < len(tokens) and tokens[position] == ("op", "'"):
+        expression = xor(expression, ONE)
+        position += 1
+    return expression, position
+
+
+def parse_equation(conjunct: str) -> Tuple[Node, Node]:
+    sides = conjunct.split("=")
+    if len(sides) != 2:
+        raise ConstraintSyntaxError(f"Not an equation: {conjunct!r}")
+    return parse_expression(sides[0]), parse_expression(sides[1])
+
+
+def conjunct(item: Conjunct) -> Node:
+    """An equation node for text in the fragment, a raw node for anything else"""
+    if isinstance(item, Node):
+        return item
+    try:
+        return equation(*parse_equation(item))
+    except ConstraintSyntaxError:
+        return raw(item)
+
+
+class Conjunction:
+    """The conjuncts of one solve command, in order and without duplicates.
+
+    length is always len(render()), maintained as conjuncts are added, so
+    asking whether another conjunct fits under a limit costs O(1).
+    """
+    __slots__ = ("conjuncts", "length", "_members")
+
+    def __init__(self, conjuncts: Iterable[Conjunct] = ()):
+        self.conjuncts: List[Node] = []
+        self.length = 0
+        self._members: Set[Node] = set()
+        self.extend(conjuncts)
+
+    def cost(self, item: Conjunct) -> int:
+        """Characters adding this conjunct would append, separator included"""
+        node = conjunct(item)
+        if node in self._members:
+            return 0
+        return node.length + (len(SEPARATOR) if self.conjuncts else 0)
+
+    def fits(self, item: Conjunct, limit: int) -> bool:
+        return self.length + self.cost(item) <= limit
+
+    def add(self, item: Conjunct) -> Node:
+        node = conjunct(item)
+        if node not in self._members:
+            self.length += self.cost(node)
+            self._members.add(node)
+            self.conjuncts.append(node)
+        return node
+
+    def extend(self, items: Iterable[Conjunct]):
+        for item in items:
+            self.add(item)
+
+    def parse(self, text: str):
+        """Add every conjunct of a `a && b && ...` fragment"""
+        for part in text.split("&&"):
+            if part.strip():
+                self.add(part)
+
+    @property
+    def variables(self) -> Set[str]:
+        found: Set[str] = set()
+        for node in self.conjuncts:
+            found |= node.variables
+        return found
+
+    def render(self) -> str:
+        return SEPARATOR.join(node.text for node in self.conjuncts)
+
+    def __len__(self):
+        return len(self.conjuncts)
+
+    def __iter__(self):
+        return iter(self.conjuncts)
+
+
+def _rewrite(expression: Node, replacements: Dict[str, Node], available: Dict[Node, str]) -> Node:
+    """Substitute propagated variables, re-simplify and reuse earlier definitions"""
+    if expression.op == "var":
+        return replacements.get(expression.name, expression)
+    if expression.op == "const":
+        return expression
+    rebuilt = BUILDERS[expression.op](*(_rewrite(term, replacements, available)
+                                        for term in expression.terms))
+    if rebuilt.op in BUILDERS and rebuilt in available:
+        return var(available[rebuilt])
+    return rebuilt
+
+
+def optimize(constraints: Iterable[Conjunct], keep: Iterable[str] = ()) -> List[Node]:
+    """Optimize a component's conjuncts, preserving their order and interface.
+
+    keep may hold variable names or expressions mentioning them (such as a
+    component's guarantees); every identifier in them stays observable.
+    """
+    nodes = [conjunct(item) for item in constraints]
+    optimized = _optimize(nodes, keep)
+    return nodes if optimized is None else optimized
+
+
+def optimize_constraints(constraints: List[str], keep: Iterable[str] = ()) -> List[str]:
+    """optimize() on conjunct text, returning rendered conjuncts"""
+    optimized = _optimize([conjunct(text) for text in constraints], keep)
+    return list(constraints) if optimized is None else [node.text for node in optimized]
+
+
+def _optimize(nodes: List[Node], keep: Iterable[str]) -> Optional[List[Node]]:
+    """The passes behind optimize(); None when the conjuncts contradict"""
+    # Classify: the first equation naming a variable on its left defines it
+    items: List[Optional[tuple]] = []
+    definitions: Dict[str, Node] = {}
+    interface: Set[str] = set()
+    for text in keep:
+        interface.update(IDENTIFIER.findall(text))
+
+    seen: Set[Node] = set()
+    for node in nodes:
+        if node in seen:
+            items.append(None)
+            continue
+        seen.add(node)
+        if node.op != "=":
+            items.append(("opaque", node))
+            interface |= node.variables
+            continue
+        left, right = node.terms
+        if left.op == "var" and left.name not in definitions:
+            definitions[left.name] = right
+            items.append(("def", left.name))
+            if right.op == "const":
+                interface.add(left.name)    # Input pin
+        else:
+            items.append(("check", left, right))
+
+    # Outputs: defined variables nothing else reads
+    read: Set[str] = set()
+    for expression in definitions.values():
+        read |= expression.variables
+    for item in items:
+        if item and item[0] == "check":
+            read |= item[1].variables | item[2].variables
+    interface |= set(definitions) - read
+
+    # Kahn ordering, earliest definition first so CSE keeps the first name for
+    # a subexpression; definitions on a cycle are kept as plain checks
+    position = {name: index for index, name in enumerate(definitions)}
+    dependents: Dict[str, List[str]] = {name: [] for name in definitions}
+    pending: Dict[str, int] = {}
+    for name, expression in definitions.items():
+        needed = expression.variables & definitions.keys()
+        pending[name] = len(needed)
+        for other in needed:
+            dependents[other].append(name)
+    ready = [(position[name], name) for name, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, name = heapq.heappop(ready)
+        order.append(name)
+        for dependent in dependents[name]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, (position[dependent], dependent))
+    cyclic = {name for name, count in pending.items() if count > 0}
+
+    # Propagation, simplification and CSE in dependency order
+    replacements: Dict[str, Node] = {}
+    available: Dict[Node, str] = {}
+    optimized: Dict[str, Node] = {}
+    for name in order:
+        expression = _rewrite(definitions[name], replacements, available)
+        optimized[name] = expression
+        if expression.op in ("const", "var"):
+            replacements[name] = expression
+        else:
+            available.setdefault(expression, name)
+
+    checks: Dict[int, Tuple[Node, Node]] = {}
+    for index, item in enumerate(items):
+        if item and item[0] == "def" and item[1] in cyclic:
+            item = ("check", var(item[1]), definitions[item[1]])
+        if item and item[0] == "check":
+            left = _rewrite(item[1], replacements, available)
+            right = _rewrite(item[2], replacements, available)
+            if left is right:
+                continue
+            if left.op == "const" and right.op == "const":
+                return None     # Contradiction: leave it for the solver
+            checks[index] = (left, right)
+
+    # Dead-variable removal: only what the interface and checks reach survives
+    live = set(interface)
+    for left, right in checks.values():
+        live |= left.variables | right.variables
+    for name in reversed(order):
+        if name in live:
+            live |= optimized[name].variables
+
+    result = []
+    for index, item in enumerate(items):
+        if item is None:
+            continue
+        if item[0] == "opaque":
+            result.append(item[1])
+        elif index in checks:
+            result.append(equation(*checks[index]))
+        elif item[0] == "def" and item[1] in optimized and item[1] in live:
+            result.append(equation(var(item[1]), optimized[item[1]]))
+    return result or [TRUE]
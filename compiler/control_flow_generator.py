@@ -6,6 +6,7 @@ Implements JMP, JZ, JNZ, CALL, and RET instructions using nibble decomposition
 
 from typing import List
 from dataclasses import dataclass
+from constraint_ir import Conjunction, optimize
 
 @dataclass
 class Component:
@@ -16,16 +17,17 @@ class Component:
     
     def to_tau(self) -> str:
         """Convert to Tau file content"""
-        expr = " && ".join(self.constraints)
-        if len(expr) > 700:
-            raise ValueError(f"{self.name}: Expression too long ({len(expr)} chars)")
+        interface = (self.assumptions or []) + (self.guarantees or [])
+        solve = Conjunction(optimize(self.constraints, keep=interface))
+        if solve.length > 700:
+            raise ValueError(f"{self.name}: Expression too long ({solve.length} chars)")
         
         content = f"# Component: {self.name}\n"
         if self.assumptions:
             content += f"# Assumptions: {', '.join(self.assumptions)}\n"
         if self.guarantees:
             content += f"# Guarantees: {', '.join(self.guarantees)}\n"
-        content += f"\nsolve {expr}\n\nquit"
+        content += f"\nsolve {solve.render()}\n\nquit"
         return content
 
 class ComponentGenerator:
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Fake Tau REPL
+
+Stand-in for the Tau binary that speaks the protocol tau_solver_pool
+expects: a prompt on stdout, one command per line on stdin. `solve` answers
+"solution: {...}" unless the same variable is pinned to two different
+constants, in which case it answers "no solution". Lets the solver pool,
+validators and benchmarks run on machines without Tau.
+
+    python3 fake_tau_solver.py [--delay SECONDS] [--crash-after N] [--prompt TEXT]
+"""
+
+import argparse
+import re
+import sys
+import time
+
+ASSIGNMENT = re.compile(r"(\w+)\s*=\s*(\d+)\b")
+
+
+def answer(expression: str) -> str:
+    """Answer a solve command by checking constant assignments for conflicts"""
+    values = {}
+    for name, value in ASSIGNMENT.findall(expression):
+        if name in values and values[name] != value:
+            return "no solution"
+        values[name] = value
+    assignments = ", ".join(f"{name} := {value}" for name, value in sorted(values.items()))
+    return f"solution: {{{assignments}}}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Tau REPL for testing")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each answer")
+    parser.add_argument("--crash-after", type=int, default=0, help="Exit after N solve commands")
+    parser.add_argument("--prompt", default="tau> ", help="Prompt printed before each command")
+    args = parser.parse_args()
+
+    print("Fake Tau solver")
+    solved = 0
+    while True:
+        sys.stdout.write(args.prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            break
+
+        command = line.strip()
+        if command == "quit":
+            break
+        if not command.startswith("solve"):
+            if command:
+                print(f"Unknown command: {command}", file=sys.stderr)
+            continue
+
+        solved += 1
+        if args.crash_after and solved > args.crash_after:
+            sys.exit(1)
+        if args.delay:
+            time.sleep(args.delay)
+        print(answer(command[len("solve"):]))
+
+
+if __name__ == "__main__":
+    main()
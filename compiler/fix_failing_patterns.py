@@ -5,6 +5,11 @@ import os
 import subprocess
 from pathlib import Path
 
+from build_writer import BuildWriter
+
+# Rewrites commit by rename, which marks the constraint bundle of the build stale
+BUILD_WRITER = BuildWriter(".")
+
 def fix_dup_files():
     """Fix DUP files with simplified pattern"""
     print("Fixing DUP files...")
@@ -28,8 +33,7 @@ solve top{i}=1 && dup{i}=top{i}
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed dup_nibble_{i}.tau")
     
@@ -42,8 +46,7 @@ quit"""
 solve allok=1 && dupcomplete=allok
 
 quit"""
-        with open(agg_file, 'w') as f:
-            f.write(content)
+        BUILD_WRITER.write(agg_file, content)
         fixed_count += 1
         print(f"  ✓ Fixed dup_aggregator.tau")
     
@@ -72,8 +75,7 @@ solve a{i}=1 && b{i}=0 && swapa{i}=b{i} && swapb{i}=a{i}
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed swap_nibble_{i}.tau")
     
@@ -86,8 +88,7 @@ quit"""
 solve allswapped=1 && swapcomplete=allswapped
 
 quit"""
-        with open(agg_file, 'w') as f:
-            f.write(content)
+        BUILD_WRITER.write(agg_file, content)
         fixed_count += 1
         print(f"  ✓ Fixed swap_aggregator.tau")
     
@@ -116,8 +117,7 @@ solve a{i}=1 && b{i}=1 && prod{i}=(a{i}&b{i})
 
 quit"""
             
-            with open(partial_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(partial_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed mul_partial_{i}.tau")
     
@@ -138,8 +138,7 @@ def fix_simple_operations():
 solve halt=1 && halted=halt
 
 quit"""
-        with open(halt_file, 'w') as f:
-            f.write(content)
+        BUILD_WRITER.write(halt_file, content)
         fixed_count += 1
         print("  ✓ Fixed halt.tau")
     
@@ -152,8 +151,7 @@ quit"""
 solve nop=1 && noop=nop
 
 quit"""
-        with open(nop_file, 'w') as f:
-            f.write(content)
+        BUILD_WRITER.write(nop_file, content)
         fixed_count += 1
         print("  ✓ Fixed nop.tau")
     
@@ -5,6 +5,11 @@ import os
 import subprocess
 from pathlib import Path
 
+from build_writer import BuildWriter
+
+# Rewrites commit by rename, which marks the constraint bundle of the build stale
+BUILD_WRITER = BuildWriter(".")
+
 def fix_mload_files():
     """Fix MLOAD files with simplified pattern"""
     print("Fixing MLOAD files...")
@@ -28,8 +33,7 @@ solve maddr{i}={i%2} && memspace=1 && mdata{i}=maddr{i}
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed mload_nibble_{i}.tau")
     
@@ -58,8 +62,7 @@ solve maddr{i}={i%2} && mdata{i}={(i+1)%2} && memwrite{i}=1 && stored{i}=(mdata{
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed mstore_nibble_{i}.tau")
     
@@ -88,8 +91,7 @@ solve data{i}={(i+1)%2} && stackop=1 && pushed{i}=(data{i}&stackop)
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed push_nibble_{i}.tau")
     
@@ -102,8 +104,7 @@ quit"""
 solve carry=0 && pushcarry=carry
 
 quit"""
-            with open(file_path, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(file_path, content)
             fixed_count += 1
             print(f"  ✓ Fixed {file_path.name}")
     
@@ -132,8 +133,7 @@ solve stackop=1 && stackdata{i}={i%2} && popped{i}=(stackdata{i}&stackop)
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed pop_nibble_{i}.tau")
     
@@ -146,8 +146,7 @@ quit"""
 solve borrow=0 && popborrow=borrow
 
 quit"""
-            with open(file_path, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(file_path, content)
             fixed_count += 1
             print(f"  ✓ Fixed {file_path.name}")
     
@@ -176,8 +175,7 @@ solve sig{i}=1 && msg{i}={i%2} && pk{i}=1 && verifyok{i}=(sig{i}&msg{i}&pk{i})
 
 quit"""
             
-            with open(nibble_file, 'w') as f:
-                f.write(content)
+            BUILD_WRITER.write(nibble_file, content)
             fixed_count += 1
             print(f"  ✓ Fixed verify_nibble_{i}.tau")
     
@@ -190,8 +188,7 @@ quit"""
 solve allverified=1 && verifycomplete=allverified
 
 quit"""
-        with open(agg_file, 'w') as f:
-            f.write(content)
+        BUILD_WRITER.write(agg_file, content)
         fixed_count += 1
         print(f"  ✓ Fixed verify_aggregator.tau")
     
@@ -8,9 +8,10 @@ import os
 import sys
 import json
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import heapq
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional, Callable
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Add subagents to path
@@ -44,20 +45,167 @@ class SubagentResult:
     error: Optional[str] = None
     execution_time: float = 0.0
 
+@dataclass
+class ScheduleStats:
+    """Timing of one scheduler run"""
+    wall_time: float
+    busy_time: float
+    critical_path_time: float
+    critical_path: List[str]
+    max_workers: int
+    task_times: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker capacity spent running tasks"""
+        capacity = self.wall_time * self.max_workers
+        return self.busy_time / capacity if capacity > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_time": self.wall_time,
+            "busy_time": self.busy_time,
+            "critical_path_time": self.critical_path_time,
+            "critical_path": self.critical_path,
+            "max_workers": self.max_workers,
+            "utilization": self.utilization,
+            "tasks": self.task_times
+        }
+
+class DependencyScheduler:
+    """Runs a DAG of named tasks on a thread pool as their dependencies finish.
+    
+    A task is submitted only once all of its dependencies have succeeded, so
+    no worker ever blocks waiting for another. Among ready tasks the one
+    heading the longest estimated chain of remaining work starts first
+    (critical path first). Tasks downstream of a failure are skipped.
+    """
+    
+    def __init__(self, dependencies: Dict[str, List[str]], costs: Optional[Dict[str, float]] = None):
+        self.dependencies = {name: list(deps) for name, deps in dependencies.items()}
+        self.dependents: Dict[str, List[str]] = {name: [] for name in dependencies}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                if dep not in self.dependents:
+                    raise ValueError(f"Task {name} depends on unknown task {dep}")
+                self.dependents[dep].append(name)
+        
+        self.order = self._topological_order()
+        costs = costs or {}
+        
+        # Priority: estimated cost of the task plus its longest chain of dependents
+        self.priority: Dict[str, float] = {}
+        for name in reversed(self.order):
+            downstream = max((self.priority[d] for d in self.dependents[name]), default=0.0)
+            self.priority[name] = costs.get(name, 1.0) + downstream
+    
+    def _topological_order(self) -> List[str]:
+        remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        
+        if len(order) != len(self.dependencies):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Dependency cycle among tasks: {', '.join(cyclic)}")
+        return order
+    
+    def run(self, run_task: Callable[[str], Any], max_workers: int,
+            succeeded: Callable[[Any], bool] = lambda result: True,
+            skip: Callable[[str, str], Any] = lambda name, failed_dep: None,
+            results: Optional[Dict[str, Any]] = None) -> ScheduleStats:
+        """Run every task, filling results[name]; returns timing statistics"""
+        results = {} if results is None else results
+        remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+        sequence = {name: index for index, name in enumerate(self.order)}
+        ready = [(-self.priority[name], sequence[name], name) for name, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        
+        started: Dict[str, float] = {}
+        finished: Dict[str, float] = {}
+        running = {}
+        run_start = time.perf_counter()
+        
+        def skip_downstream(name: str, failed_dep: str):
+            for dependent in self.dependents[name]:
+                if dependent not in results:
+                    results[dependent] = skip(dependent, failed_dep)
+                    skip_downstream(dependent, failed_dep)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while ready or running:
+                while ready and len(running) < max_workers:
+                    _, _, name = heapq.heappop(ready)
+                    started[name] = time.perf_counter()
+                    running[executor.submit(run_task, name)] = name
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finished[name] = time.perf_counter()
+                    results[name] = future.result()
+                    
+                    if not succeeded(results[name]):
+                        skip_downstream(name, name)
+                        continue
+                    for dependent in self.dependents[name]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0 and dependent not in results:
+                            heapq.heappush(ready, (-self.priority[dependent], sequence[dependent], dependent))
+        
+        wall_time = time.perf_counter() - run_start
+        durations = {name: finished[name] - started[name] for name in finished}
+        
+        # Longest chain of actual task durations through the DAG
+        path_time: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in self.order:
+            best = max(self.dependencies[name], key=lambda dep: path_time[dep], default=None)
+            previous[name] = best
+            path_time[name] = durations.get(name, 0.0) + (path_time[best] if best else 0.0)
+        
+        critical_path = []
+        node = max(path_time, key=path_time.get, default=None)
+        critical_path_time = path_time[node] if node else 0.0
+        while node:
+            critical_path.append(node)
+            node = previous[node]
+        
+        return ScheduleStats(
+            wall_time=wall_time,
+            busy_time=sum(durations.values()),
+            critical_path_time=critical_path_time,
+            critical_path=list(reversed(critical_path)),
+            max_workers=max_workers,
+            task_times={
+                name: {"start": started[name] - run_start, "end": finished[name] - run_start}
+                for name in finished
+            }
+        )
+
 class ZKVMOrchestrator:
     """Master orchestrator for parallel zkVM generation"""
     
     def __init__(self, output_dir: str = "build/zkvm_full"):
         self.output_dir = output_dir
+        # FoldingGenerator and TestGenerator build results in memory and
+        # take no output directory
         self.subagents = {
             "isa": ISAGenerator(os.path.join(output_dir, "isa")),
             "memory": MemoryGenerator(os.path.join(output_dir, "memory")),
-            "folding": FoldingGenerator(os.path.join(output_dir, "folding")),
+            "folding": FoldingGenerator(),
             "execution": ExecutionGenerator(os.path.join(output_dir, "execution")),
             "proving": ProvingGenerator(os.path.join(output_dir, "proving")),
-            "test": TestGenerator(os.path.join(output_dir, "tests"))
+            "test": TestGenerator()
         }
         self.results: Dict[str, SubagentResult] = {}
+        self.schedule_stats: Optional[ScheduleStats] = None
         
     def create_task_plan(self) -> List[SubagentTask]:
         """Create parallel task execution plan"""
@@ -138,35 +286,17 @@ class ZKVMOrchestrator:
             )
         ]
     
-    def wait_for_dependencies(self, dependencies: List[str], timeout: int = 300):
-        """Wait for dependencies to complete"""
-        start_time = time.time()
-        while True:
-            all_ready = True
-            for dep in dependencies:
-                if dep not in self.results or not self.results[dep].success:
-                    all_ready = False
-                    break
-            
-            if all_ready:
-                return True
-                
-            if time.time() - start_time > timeout:
-                return False
-                
-            time.sleep(0.1)
-    
     def execute_task(self, task: SubagentTask) -> SubagentResult:
         """Execute a single subagent task"""
         print(f"[{task.name}] Starting generation...")
         start_time = time.time()
         
         try:
-            # Wait for dependencies
-            if task.dependencies:
-                print(f"[{task.name}] Waiting for dependencies: {task.dependencies}")
-                if not self.wait_for_dependencies(task.dependencies):
-                    raise Exception("Timeout waiting for dependencies")
+            # The scheduler only starts a task once its dependencies succeeded
+            missing = [dep for dep in task.dependencies
+                       if dep not in self.results or not self.results[dep].success]
+            if missing:
+                raise Exception(f"Dependencies not complete: {missing}")
             
             # Get subagent
             subagent = self.subagents[task.module]
@@ -259,37 +389,19 @@ class ZKVMOrchestrator:
         tasks = self.create_task_plan()
         print(f"Executing {len(tasks)} tasks across {len(self.subagents)} subagents...\n")
         
-        # Execute tasks in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_task = {}
-            
-            # Submit tasks based on dependencies
-            submitted = set()
-            
-            while len(submitted) < len(tasks):
-                for task in tasks:
-                    if task.name in submitted:
-                        continue
-                    
-                    # Check if dependencies are met
-                    deps_met = all(
-                        dep in self.results and self.results[dep].success
-                        for dep in task.dependencies
-                    )
-                    
-                    if not task.dependencies or deps_met:
-                        future = executor.submit(self.execute_task, task)
-                        future_to_task[future] = task
-                        submitted.add(task.name)
-                
-                # Process completed futures
-                for future in as_completed(future_to_task):
-                    task = future_to_task[future]
-                    result = future.result()
-                    self.results[task.name] = result
-                    del future_to_task[future]
-                
-                time.sleep(0.1)
+        # Execute tasks as their dependencies complete, critical path first
+        tasks_by_name = {task.name: task for task in tasks}
+        scheduler = DependencyScheduler(
+            {task.name: task.dependencies for task in tasks},
+            costs=self.estimate_task_costs(tasks)
+        )
+        self.schedule_stats = scheduler.run(
+            lambda name: self.execute_task(tasks_by_name[name]),
+            max_workers=max_workers,
+            succeeded=lambda result: result.success,
+            skip=self._skipped_result,
+            results=self.results
+        )
         
         # Generate final manifest
         self.generate_manifest()
@@ -297,6 +409,31 @@ class ZKVMOrchestrator:
         # Print summary
         self.print_summary()
     
+    def estimate_task_costs(self, tasks: List[SubagentTask]) -> Dict[str, float]:
+        """Expected task durations: last run's times from the manifest, else operation counts"""
+        costs = {task.name: float(len(task.operations)) for task in tasks}
+        try:
+            with open(os.path.join(self.output_dir, "manifest.json")) as f:
+                previous = json.load(f).get("modules", {})
+        except (OSError, ValueError):
+            return costs
+        
+        for name, module in previous.items():
+            if name in costs and module.get("execution_time"):
+                costs[name] = module["execution_time"]
+        return costs
+    
+    def _skipped_result(self, task_name: str, failed_dependency: str) -> SubagentResult:
+        print(f"[{task_name}] Skipped: dependency {failed_dependency} failed")
+        return SubagentResult(
+            task_name=task_name,
+            components_generated=0,
+            files=[],
+            contracts={},
+            success=False,
+            error=f"Dependency failed: {failed_dependency}"
+        )
+    
     def generate_manifest(self):
         """Generate complete zkVM manifest"""
         manifest = {
@@ -308,7 +445,8 @@ class ZKVMOrchestrator:
             "modules": {},
             "contracts": {},
             "composition_graph": [],
-            "validation_status": {}
+            "validation_status": {},
+            "schedule": self.schedule_stats.to_dict() if self.schedule_stats else {}
         }
         
         # Aggregate results
@@ -357,6 +495,12 @@ class ZKVMOrchestrator:
         print(f"Total execution time: {total_time:.2f}s")
         print(f"Average time per task: {total_time/len(self.results):.2f}s")
         
+        if self.schedule_stats:
+            stats = self.schedule_stats
+            print(f"Wall time: {stats.wall_time:.2f}s on {stats.max_workers} workers "
+                  f"({stats.utilization * 100:.0f}% utilization)")
+            print(f"Critical path: {stats.critical_path_time:.2f}s ({' -> '.join(stats.critical_path)})")
+        
         if failed > 0:
             print(f"\nFailed tasks:")
             for name, result in self.results.items():
@@ -18,6 +18,11 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Set, Tuple, Optional
 from enum import IntEnum
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_writer import BuildWriter
+from constraint_ir import Conjunction, optimize
 
 class ExecutionPhase(IntEnum):
     """Execution phases in the VM state machine."""
@@ -50,12 +55,12 @@ class Contract:
         all_parts = []
         all_parts.extend(self.assumptions)
         all_parts.extend(self.constraints)
-        expr = " && ".join(all_parts)
+        solve = Conjunction(optimize(all_parts, keep=list(self.variables) + self.guarantees))
         
-        if len(expr) > self.max_chars:
-            raise ValueError(f"Contract {self.name} too long: {len(expr)} chars")
+        if solve.length > self.max_chars:
+            raise ValueError(f"Contract {self.name} too long: {solve.length} chars")
         
-        return expr
+        return solve.render()
 
 @dataclass
 class ExecutionComponent:
@@ -627,30 +632,27 @@ class ExecutionGenerator:
     
     def save_components(self, results: Dict[str, ExecutionResult]):
         """Save all generated components to files."""
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        for op, result in results.items():
-            op_dir = os.path.join(self.output_dir, op.lower())
-            os.makedirs(op_dir, exist_ok=True)
-            
-            # Save each component file
-            for filename, content in result.files.items():
-                filepath = os.path.join(op_dir, filename)
-                with open(filepath, 'w') as f:
-                    f.write(content)
-            
-            # Save summary
-            summary_path = os.path.join(op_dir, "summary.txt")
-            with open(summary_path, 'w') as f:
-                f.write(f"Operation: {result.operation}\n")
-                f.write(f"Components: {len(result.components_generated)}\n")
-                f.write(f"Contracts: {len(result.contracts)}\n")
-                f.write(f"Total Constraints: {result.total_constraints}\n")
-                f.write(f"Cycles Required: {result.cycles_required}\n\n")
+        writer = BuildWriter(self.output_dir)
+        
+        with writer.batch():
+            for op, result in results.items():
+                op_dir = op.lower()
+                
+                # Save each component file
+                for filename, content in result.files.items():
+                    writer.write(os.path.join(op_dir, filename), content)
+                
+                # Save summary
+                summary = f"Operation: {result.operation}\n"
+                summary += f"Components: {len(result.components_generated)}\n"
+                summary += f"Contracts: {len(result.contracts)}\n"
+                summary += f"Total Constraints: {result.total_constraints}\n"
+                summary += f"Cycles Required: {result.cycles_required}\n\n"
                 
-                f.write("Components:\n")
+                summary += "Components:\n"
                 for comp in result.components_generated:
-                    f.write(f"  - {comp.name} (Phase: {comp.phase.name}, Cycle: {comp.cycle})\n")
+                    summary += f"  - {comp.name} (Phase: {comp.phase.name}, Cycle: {comp.cycle})\n"
+                writer.write(os.path.join(op_dir, "summary.txt"), summary)
 
 
 if __name__ == "__main__":
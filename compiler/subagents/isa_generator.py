@@ -10,6 +10,11 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Set, Tuple
 from enum import IntEnum
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_writer import BuildWriter
+from constraint_ir import Conjunction, optimize
 
 class InstructionType(IntEnum):
     """Instruction categories for the zkVM."""
@@ -36,12 +41,12 @@ class Contract:
         all_parts = []
         all_parts.extend(self.assumptions)
         all_parts.extend(self.constraints)
-        expr = " && ".join(all_parts)
+        solve = Conjunction(optimize(all_parts, keep=list(self.variables) + self.guarantees))
         
-        if len(expr) > self.max_chars:
-            raise ValueError(f"Contract {self.name} too long: {len(expr)} chars")
+        if solve.length > self.max_chars:
+            raise ValueError(f"Contract {self.name} too long: {solve.length} chars")
         
-        return expr
+        return solve.render()
 
 @dataclass
 class InstructionComponent:
@@ -1785,12 +1790,7 @@ class ISAGenerator:
     def save_instruction_files(self, instruction_result: InstructionResult):
         """Save all files for an instruction to disk."""
         inst_dir = os.path.join(self.output_dir, instruction_result.instruction.lower())
-        os.makedirs(inst_dir, exist_ok=True)
-        
-        for filename, content in instruction_result.files.items():
-            filepath = os.path.join(inst_dir, filename)
-            with open(filepath, 'w') as f:
-                f.write(content)
+        writer = BuildWriter(inst_dir)
         
         # Save summary
         summary = f"# {instruction_result.instruction} Instruction Summary\n\n"
@@ -1800,9 +1800,10 @@ class ISAGenerator:
         for comp in instruction_result.components_generated:
             summary += f"- {comp.name}: {len(comp.contract.constraints)} constraints\n"
         
-        summary_path = os.path.join(inst_dir, "summary.md")
-        with open(summary_path, 'w') as f:
-            f.write(summary)
+        with writer.batch():
+            for filename, content in instruction_result.files.items():
+                writer.write(filename, content)
+            writer.write("summary.md", summary)
 
 
 def main():
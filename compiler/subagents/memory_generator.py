@@ -16,6 +16,11 @@ Copyright (c) 2025 Dana Edwards. All rights reserved.
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from build_writer import BuildWriter
+from constraint_ir import Conjunction, optimize
 
 
 @dataclass
@@ -33,12 +38,12 @@ class Contract:
         all_parts = []
         all_parts.extend(self.assumptions)
         all_parts.extend(self.constraints)
-        expr = " && ".join(all_parts)
+        solve = Conjunction(optimize(all_parts, keep=list(self.variables) + self.guarantees))
         
-        if len(expr) > self.max_chars:
-            raise ValueError(f"Contract {self.name} too long: {len(expr)} chars")
+        if solve.length > self.max_chars:
+            raise ValueError(f"Contract {self.name} too long: {solve.length} chars")
         
-        return expr
+        return solve.render()
 
 
 @dataclass
@@ -1043,12 +1048,7 @@ class MemoryGenerator:
     def save_memory_files(self, memory_result: MemoryResult):
         """Save all files for a memory operation to disk."""
         op_dir = os.path.join(self.output_dir, memory_result.operation.lower())
-        os.makedirs(op_dir, exist_ok=True)
-        
-        for filename, content in memory_result.files.items():
-            filepath = os.path.join(op_dir, filename)
-            with open(filepath, 'w') as f:
-                f.write(content)
+        writer = BuildWriter(op_dir)
         
         # Save summary
         summary = f"# {memory_result.operation} Memory Operation Summary\n\n"
@@ -1058,6 +1058,7 @@ class MemoryGenerator:
         for comp in memory_result.components_generated:
             summary += f"- {comp.name}: {len(comp.contract.constraints)} constraints\n"
         
-        summary_path = os.path.join(op_dir, "summary.md")
-        with open(summary_path, 'w') as f:
-            f.write(summary)
\ No newline at end of file
+        with writer.batch():
+            for filename, content in memory_result.files.items():
+                writer.write(filename, content)
+            writer.write("summary.md", summary)
\ No newline at end of file
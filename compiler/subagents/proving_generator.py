@@ -18,8 +18,12 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Set, Tuple, Optional, Any
 from enum import IntEnum
 import hashlib
-import os
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constraint_ir import Conjunction, optimize
 
 class ProofPhase(IntEnum):
     """Phases in the proof generation pipeline."""
@@ -53,12 +57,12 @@ class Contract:
         all_parts = []
         all_parts.extend(self.assumptions)
         all_parts.extend(self.constraints)
-        expr = " && ".join(all_parts)
+        solve = Conjunction(optimize(all_parts, keep=list(self.variables) + self.guarantees))
         
-        if len(expr) > self.max_chars:
-            raise ValueError(f"Contract {self.name} too long: {len(expr)} chars")
+        if solve.length > self.max_chars:
+            raise ValueError(f"Contract {self.name} too long: {solve.length} chars")
         
-        return expr
+        return solve.render()
 
 @dataclass
 class ProofComponent:
@@ -6,12 +6,20 @@ Works around all major Tau limitations for production use.
 """
 
 import os
+import time
+import heapq
+import bisect
 import hashlib
-from typing import List, Dict, Tuple, Optional, Set
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
 import json
 
+from build_writer import BuildWriter, pack_archive
+from constraint_ir import SEPARATOR, Conjunct, Conjunction, Node, conjunct, optimize, raw
+
 class ConstraintType(Enum):
     """Types of constraints in our high-level language."""
     ARITHMETIC = "arithmetic"
@@ -44,6 +52,64 @@ class Module:
     constraints: List[Constraint]
     dependencies: List[str] = None
 
+class DependencyGraph:
+    """
+    Module dependency DAG, ordered once with Kahn's algorithm.
+    
+    order lists every module after its dependencies. levels[name] is the
+    length of the longest dependency chain below a module, and waves groups
+    modules by level: everything in a wave depends only on earlier waves,
+    so each wave can be compiled in parallel.
+    """
+    
+    def __init__(self, dependencies: Dict[str, List[str]]):
+        self.dependencies = {name: list(dict.fromkeys(deps or [])) for name, deps in dependencies.items()}
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.dependencies}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                if dep not in self.dependencies:
+                    raise ValueError(f"Module {name} depends on unknown module {dep}")
+                self.dependents[dep].append(name)
+        
+        self.order, self.levels = self._kahn_order()
+        self.waves: List[List[str]] = [[] for _ in range(max(self.levels.values(), default=-1) + 1)]
+        for name in self.order:
+            self.waves[self.levels[name]].append(name)
+    
+    @classmethod
+    def from_modules(cls, modules: Dict[str, Module]) -> "DependencyGraph":
+        return cls({name: module.dependencies for name, module in modules.items()})
+    
+    def _kahn_order(self) -> Tuple[List[str], Dict[str, int]]:
+        remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+        levels = {name: 0 for name, count in remaining.items() if count == 0}
+        queue = deque(levels)
+        order = []
+        while queue:
+            name = queue.popleft()
+            order.append(name)
+            for dependent in self.dependents[name]:
+                levels[dependent] = max(levels.get(dependent, 0), levels[name] + 1)
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        
+        if len(order) < len(self.dependencies):
+            cycle = self._find_cycle({name for name, count in remaining.items() if count > 0})
+            raise ValueError(f"Dependency cycle between modules: {' -> '.join(cycle)}")
+        return order, levels
+    
+    def _find_cycle(self, blocked: Set[str]) -> List[str]:
+        """Every blocked module waits on another blocked one, so following them must loop."""
+        name = next(iter(sorted(blocked)))
+        path: List[str] = []
+        position: Dict[str, int] = {}
+        while name not in position:
+            position[name] = len(path)
+            path.append(name)
+            name = next(dep for dep in self.dependencies[name] if dep in blocked)
+        return path[position[name]:] + [name]
+
 class TauCompiler:
     """
     Compiles high-level constraint modules to Tau files.
@@ -52,16 +118,27 @@ class TauCompiler:
     
     MAX_EXPR_LENGTH = 700  # Safe limit for Tau expressions
     MAX_VARS_PER_FILE = 50  # Avoid timeout issues
+    SPLIT_MODES = ("greedy", "pack", "partition")
     
-    def __init__(self, output_dir: str = "build"):
+    def __init__(self, output_dir: str = "build", split_mode: str = "greedy",
+                 archive: Optional[str] = None):
+        if split_mode not in self.SPLIT_MODES:
+            raise ValueError(f"Unknown split mode: {split_mode}")
         self.output_dir = output_dir
+        self.split_mode = split_mode
+        self.archive = archive  # Also pack compile_all's output into output_dir/archive
+        self.writer = BuildWriter(output_dir)
         self.modules: Dict[str, Module] = {}
         self.generated_files: List[str] = []
+        self.split_report: Dict[str, Dict[str, int]] = {}
+        self.build_timing: Dict[str, Any] = {}
+        self._graph: Optional[DependencyGraph] = None
         os.makedirs(output_dir, exist_ok=True)
     
     def add_module(self, module: Module):
         """Add a module to the compilation context."""
         self.modules[module.name] = module
+        self._graph = None
     
     def compile_arithmetic_constraint(self, constraint: Constraint) -> List[str]:
         """Compile arithmetic constraint to Boolean operations."""
@@ -216,47 +293,317 @@ class TauCompiler:
         # Would implement full store logic
         return ["store_placeholder=1"]
     
-    def split_constraints(self, constraints: List[str]) -> List[List[str]]:
-        """Split constraints into files respecting Tau limits."""
+    def split_constraints(self, constraints: List[Conjunct],
+                          mode: Optional[str] = None) -> List[List[Conjunct]]:
+        """Split constraints into files respecting Tau limits.
+        
+        "greedy" keeps input order and starts a new file whenever the next
+        constraint does not fit. "pack" bin-packs the constraints into as
+        few files as it can, so fewer solver runs are needed downstream.
+        "partition" groups constraints that share variables, minimizing the
+        interface variables that end up in more than one file.
+        """
+        mode = mode or self.split_mode
+        if mode == "greedy":
+            return self._split_greedy(constraints)
+        if mode == "pack":
+            return self._split_packed(constraints)
+        if mode == "partition":
+            return self._split_partitioned(constraints)
+        raise ValueError(f"Unknown split mode: {mode}")
+    
+    def interface_variables(self, files: List[List[Conjunct]]) -> Set[str]:
+        """Variables that appear in more than one file; each needs a linking check."""
+        seen: Set[str] = set()
+        shared: Set[str] = set()
+        for constraints in files:
+            variables = set()
+            for constraint in constraints:
+                variables |= self._extract_variables(constraint)
+            shared |= variables & seen
+            seen |= variables
+        return shared
+    
+    def _split_greedy(self, constraints: List[Conjunct]) -> List[List[Conjunct]]:
         files = []
         current_file = []
         current_length = 0
         current_vars = set()
         
         for constraint in constraints:
-            # Extract variables from constraint
-            vars_in_constraint = self._extract_variables(constraint)
-            
-            # Check if adding this constraint exceeds limits
-            new_length = current_length + len(constraint) + 4  # " && "
-            new_vars = current_vars.union(vars_in_constraint)
+            node = self._node(constraint)
+            vars_in_constraint = set(node.variables)
+            new_length = current_length + node.length + (len(SEPARATOR) if current_file else 0)
+            new_var_count = len(current_vars) + sum(1 for v in vars_in_constraint if v not in current_vars)
             
-            if (new_length > self.MAX_EXPR_LENGTH or 
-                len(new_vars) > self.MAX_VARS_PER_FILE) and current_file:
+            if (new_length > self.MAX_EXPR_LENGTH or
+                new_var_count > self.MAX_VARS_PER_FILE) and current_file:
                 # Start new file
                 files.append(current_file)
                 current_file = [constraint]
-                current_length = len(constraint)
+                current_length = node.length
                 current_vars = vars_in_constraint
             else:
                 # Add to current file
                 current_file.append(constraint)
                 current_length = new_length
-                current_vars = new_vars
+                current_vars |= vars_in_constraint
         
         if current_file:
             files.append(current_file)
         
         return files
     
-    def _extract_variables(self, constraint: str) -> Set[str]:
+    def _split_packed(self, constraints: List[Conjunct]) -> List[List[Conjunct]]:
+        """Best-fit decreasing: longest constraints first, each into the file
+        it adds the fewest new variables to (then the fullest one)."""
+        bins = []                       # [indices, length, variables]
+        roomy: Dict[int, None] = {}     # Bins with room for an unrelated constraint
+        bins_with = defaultdict(list)   # Variable -> bins containing it
+        nodes = [self._node(c) for c in constraints]
+        order = sorted(range(len(nodes)), key=lambda i: -nodes[i].length)
+        constraint_vars = [set(node.variables) for node in nodes]
+        shortest = min((node.length for node in nodes), default=0)
+        fewest_vars = min((len(v) for v in constraint_vars), default=0)
+        hubs = self._hub_variables(constraint_vars, shortest)
+        
+        for index in order:
+            constraint_length = nodes[index].length
+            vars_in_constraint = constraint_vars[index]
+            best = None
+            best_key = None
+            
+            # Only bins with room, or sharing a variable, can possibly take it
+            candidates = set(roomy)
+            for name in vars_in_constraint - hubs:
+                candidates.update(bins_with[name])
+            
+            for candidate in sorted(candidates):
+                _, length, variables = bins[candidate]
+                new_length = length + len(SEPARATOR) + constraint_length
+                added = sum(1 for v in vars_in_constraint if v not in variables)
+                if (new_length > self.MAX_EXPR_LENGTH or
+                    len(variables) + added > self.MAX_VARS_PER_FILE):
+                    continue
+                key = (added, -new_length)
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+            
+            if best is None:
+                best = len(bins)
+                bins.append([[], -len(SEPARATOR), set()])
+                roomy[best] = None
+            chosen = bins[best]
+            chosen[0].append(index)
+            chosen[1] += len(SEPARATOR) + constraint_length
+            for name in vars_in_constraint - chosen[2]:
+                chosen[2].add(name)
+                bins_with[name].append(best)
+            
+            if best in roomy and (chosen[1] + len(SEPARATOR) + shortest > self.MAX_EXPR_LENGTH or
+                                  len(chosen[2]) + fewest_vars > self.MAX_VARS_PER_FILE):
+                del roomy[best]
+        
+        # Keep the original constraint order inside and across files
+        groups = sorted(sorted(indices) for indices, _, _ in bins)
+        return [[constraints[i] for i in indices] for indices in groups]
+    
+    def _hub_variables(self, constraint_vars: List[Set[str]], shortest: int) -> Set[str]:
+        """Variables used by more constraints than fit in one file.
+        
+        They end up in several files whatever the split, so they are not used
+        to steer placement (doing so would make splitting quadratic).
+        """
+        capacity = (self.MAX_EXPR_LENGTH + len(SEPARATOR)) // (shortest + len(SEPARATOR))
+        uses = defaultdict(int)
+        for names in constraint_vars:
+            for name in names:
+                uses[name] += 1
+        return {name for name, count in uses.items() if count > capacity}
+    
+    def _split_partitioned(self, constraints: List[Conjunct]) -> List[List[Conjunct]]:
+        """Partition the constraint/variable incidence graph under the file limits.
+        
+        Each file is grown from the first unassigned constraint by repeatedly
+        adding the constraint sharing the most variables with it, so coupled
+        constraints such as a carry chain stay together. Remaining room is
+        filled only with whole unconnected components, which adds no cut.
+        A refinement pass then moves single constraints between files
+        whenever that removes cut variables.
+        """
+        nodes = [self._node(c) for c in constraints]
+        variables = [set(node.variables) for node in nodes]
+        lengths = [node.length for node in nodes]
+        users = defaultdict(list)
+        for index, names in enumerate(variables):
+            for name in names:
+                users[name].append(index)
+        
+        # Connected components of the incidence graph (union-find over constraints)
+        parent = list(range(len(constraints)))
+        
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        for indices in users.values():
+            root = find(indices[0])
+            for other in indices[1:]:
+                parent[find(other)] = root
+        component = [find(i) for i in range(len(constraints))]
+        component_start: Dict[int, int] = {}
+        component_size = defaultdict(int)
+        component_length = defaultdict(lambda: -len(SEPARATOR))
+        component_vars = defaultdict(set)
+        for index, root in enumerate(component):
+            component_start.setdefault(root, index)
+            component_size[root] += 1
+            component_length[root] += len(SEPARATOR) + lengths[index]
+            component_vars[root] |= variables[index]
+        unassigned = dict(component_size)
+        
+        # Components small enough to top up a file, ordered by first constraint
+        fillers = [root for root, start in component_start.items()
+                   if component_length[root] <= self.MAX_EXPR_LENGTH and
+                   len(component_vars[root]) <= self.MAX_VARS_PER_FILE]
+        filler_starts = [component_start[root] for root in fillers]
+        shortest = min((component_length[root] for root in fillers), default=0)
+        fewest_vars = min((len(component_vars[root]) for root in fillers), default=0)
+        
+        hubs = self._hub_variables(variables, min(lengths, default=0))
+        
+        assignment = [-1] * len(constraints)
+        files: List[List[int]] = []
+        next_seed = 0
+        
+        while next_seed < len(constraints):
+            if assignment[next_seed] >= 0:
+                next_seed += 1
+                continue
+            
+            file_id = len(files)
+            members: List[int] = []
+            file_vars: Set[str] = set()
+            length = -len(SEPARATOR)
+            shared = defaultdict(int)       # Candidate -> variables it shares with the file
+            candidates = []                 # (-shared, index) heap, stale entries skipped
+            # Everything before next_seed is assigned, so earlier components are used up
+            scan = bisect.bisect_left(filler_starts, next_seed)
+            
+            def fits(index):
+                added = len(variables[index]) - shared[index]
+                return (not members or
+                        (length + len(SEPARATOR) + lengths[index] <= self.MAX_EXPR_LENGTH and
+                         len(file_vars) + added <= self.MAX_VARS_PER_FILE))
+            
+            def component_fits(root):
+                return (unassigned[root] == component_size[root] and
+                        length + len(SEPARATOR) + component_length[root] <= self.MAX_EXPR_LENGTH and
+                        len(file_vars) + len(component_vars[root]) <= self.MAX_VARS_PER_FILE)
+            
+            while True:
+                chosen = None if members else next_seed
+                while chosen is None and candidates:
+                    negative, index = heapq.heappop(candidates)
+                    if assignment[index] < 0 and -negative == shared[index] and fits(index):
+                        chosen = index
+                while (chosen is None and scan < len(fillers) and
+                       length + len(SEPARATOR) + shortest <= self.MAX_EXPR_LENGTH and
+                       len(file_vars) + fewest_vars <= self.MAX_VARS_PER_FILE):
+                    if component_fits(fillers[scan]):
+                        chosen = component_start[fillers[scan]]
+                    scan += 1
+                if chosen is None:
+                    break
+                
+                assignment[chosen] = file_id
+                unassigned[component[chosen]] -= 1
+                members.append(chosen)
+                length += len(SEPARATOR) + lengths[chosen]
+                for name in variables[chosen] - file_vars:
+                    file_vars.add(name)
+                    if name in hubs:
+                        continue
+                    for user in users[name]:
+                        if assignment[user] < 0:
+                            shared[user] += 1
+                            heapq.heappush(candidates, (-shared[user], user))
+            
+            files.append(members)
+        
+        self._refine_partition(files, assignment, variables, lengths, hubs)
+        
+        groups = sorted(sorted(members) for members in files if members)
+        return [[constraints[i] for i in members] for members in groups]
+    
+    def _refine_partition(self, files: List[List[int]], assignment: List[int],
+                          variables: List[Set[str]], lengths: List[int], hubs: Set[str]):
+        """Move single constraints to neighbouring files while that shrinks the cut."""
+        occurrences = defaultdict(lambda: defaultdict(int))   # variable -> file -> count
+        for index, file_id in enumerate(assignment):
+            for name in variables[index]:
+                occurrences[name][file_id] += 1
+        var_count = [0] * len(files)
+        for per_file in occurrences.values():
+            for file_id in per_file:
+                var_count[file_id] += 1
+        total_length = [sum(lengths[i] for i in members) for members in files]
+        size = [len(members) for members in files]
+        
+        def cut_delta(index, source, target):
+            delta = 0
+            for name in variables[index]:
+                per_file = occurrences[name]
+                before = len(per_file) > 1
+                after_files = len(per_file) - (per_file[source] == 1) + (target not in per_file)
+                delta += (after_files > 1) - before
+            return delta
+        
+        moved = True
+        while moved:
+            moved = False
+            for index, source in enumerate(assignment):
+                if size[source] == 1:
+                    continue
+                targets = {f for name in variables[index] - hubs for f in occurrences[name] if f != source}
+                for target in sorted(targets):
+                    new_length = total_length[target] + lengths[index] + len(SEPARATOR) * size[target]
+                    added = sum(1 for name in variables[index] if target not in occurrences[name])
+                    if (new_length > self.MAX_EXPR_LENGTH or
+                        var_count[target] + added > self.MAX_VARS_PER_FILE or
+                        cut_delta(index, source, target) >= 0):
+                        continue
+                    
+                    for name in variables[index]:
+                        per_file = occurrences[name]
+                        per_file[source] -= 1
+                        if per_file[source] == 0:
+                            del per_file[source]
+                            var_count[source] -= 1
+                        if target not in per_file:
+                            var_count[target] += 1
+                        per_file[target] += 1
+                    files[source].remove(index)
+                    files[target].append(index)
+                    total_length[source] -= lengths[index]
+                    total_length[target] += lengths[index]
+                    size[source] -= 1
+                    size[target] += 1
+                    assignment[index] = target
+                    moved = True
+                    break
+    
+    def _node(self, constraint: Conjunct) -> Node:
+        """IR node for a constraint; text is kept verbatim so its length is exact."""
+        return constraint if isinstance(constraint, Node) else raw(constraint)
+    
+    def _extract_variables(self, constraint: Conjunct) -> Set[str]:
         """Extract variable names from a constraint."""
-        # Simple extraction - would be more sophisticated in production
-        import re
-        pattern = r'[a-zA-Z][a-zA-Z0-9]*'
-        return set(re.findall(pattern, constraint))
+        return set(self._node(constraint).variables)
     
-    def generate_tau_file(self, module: Module, constraints: List[str], 
+    def generate_tau_file(self, module: Module, constraints: List[Conjunct], 
                          file_index: int) -> str:
         """Generate a single Tau file from constraints."""
         content = f"# Module: {module.name} (Part {file_index + 1})\n"
@@ -279,8 +626,12 @@ class TauCompiler:
         # Add result check (simplified)
         solve_parts.append("result=1")
         
+        # Module variable bits are the interface; internal temporaries may be folded away
+        interface = [f"{var.name}{i}" for var in module.variables for i in range(var.width)]
+        
         # Combine into solve statement
-        content += "solve " + " && ".join(solve_parts)
+        solve = Conjunction(optimize(solve_parts, keep=interface))
+        content += "solve " + solve.render()
         content += "\n\nquit"
         
         return content
@@ -300,68 +651,127 @@ class TauCompiler:
             else:
                 raise ValueError(f"Unknown constraint type: {constraint.type}")
             
-            all_constraints.extend(parts)
+            all_constraints.extend(conjunct(part) for part in parts)
         
-        # Split into multiple files if needed
+        # Split into multiple files on the IR, whose nodes know their emitted length
         file_groups = self.split_constraints(all_constraints)
+        self.split_report[module.name] = {
+            "files": len(file_groups),
+            "interface_variables": len(self.interface_variables(file_groups))
+        }
         
-        # Generate Tau files
+        # Generate Tau files, committed together (or with the whole build under compile_all)
         generated = []
-        for i, constraints in enumerate(file_groups):
-            content = self.generate_tau_file(module, constraints, i)
-            
-            # Save file
-            filename = f"{module.name}_part{i}.tau"
-            filepath = os.path.join(self.output_dir, filename)
-            
-            with open(filepath, 'w') as f:
-                f.write(content)
-            
-            generated.append(filename)
-            self.generated_files.append(filepath)
+        with self.writer.batch():
+            for i, constraints in enumerate(file_groups):
+                content = self.generate_tau_file(module, constraints, i)
+                
+                filename = f"{module.name}_part{i}.tau"
+                self.writer.write(filename, content)
+                
+                generated.append(filename)
+                self.generated_files.append(os.path.join(self.output_dir, filename))
         
         return generated
     
-    def compile_all(self) -> Dict[str, List[str]]:
-        """Compile all modules."""
+    def compile_all(self, jobs: int = 1) -> Dict[str, List[str]]:
+        """Compile all modules.
+        
+        By default modules compile in-process, one after another, and all
+        files are committed in one batch. Parallelism is opt-in: with
+        jobs > 1, modules whose dependencies are compiled run concurrently
+        in a process pool of that size. Spawning workers only pays off for
+        builds with many large modules. Results, the manifest and
+        generated_files are in dependency order either way; with archive
+        set the generated files are also packed into a single indexed
+        archive.
+        """
+        start = time.perf_counter()
         results = {}
         
         # Order modules by dependencies
-        ordered = self._topological_sort()
+        ordered = self.dependency_graph.order
+        
+        if jobs > 1 and len(self.modules) > 1:
+            outcomes = self._compile_parallel(ordered, jobs)
+            for module_name in ordered:
+                outcome = outcomes[module_name]
+                self.split_report[module_name] = outcome["split"]
+                self.generated_files.extend(os.path.join(self.output_dir, name) for name in outcome["files"])
+        else:
+            jobs = 1
+            with self.writer.batch():
+                outcomes = {name: self._timed_compile(self.modules[name]) for name in ordered}
         
-        # Compile each module
         for module_name in ordered:
-            module = self.modules[module_name]
-            files = self.compile_module(module)
-            results[module_name] = files
+            results[module_name] = outcomes[module_name]["files"]
+        
+        module_times = {
+            name: {"cpu_seconds": outcomes[name]["cpu_seconds"], "wall_seconds": outcomes[name]["wall_seconds"]}
+            for name in ordered
+        }
+        cpu_seconds = sum(times["cpu_seconds"] for times in module_times.values())
+        wall_seconds = time.perf_counter() - start
+        self.build_timing = {
+            "jobs": jobs,
+            "wall_seconds": wall_seconds,
+            "module_cpu_seconds": cpu_seconds,
+            "parallelism": cpu_seconds / wall_seconds if wall_seconds else 0.0,
+            "modules": module_times
+        }
         
-        # Generate manifest
+        if self.archive:
+            pack_archive(self.output_dir, os.path.join(self.output_dir, self.archive),
+                         names=[name for files in results.values() for name in files], writer=self.writer)
+        
+        # Generate manifest once, after every module is written
         self._generate_manifest(results)
         
         return results
     
-    def _topological_sort(self) -> List[str]:
-        """Sort modules by dependencies."""
-        # Simple implementation - assumes no cycles
-        visited = set()
-        order = []
-        
-        def visit(name):
-            if name in visited:
-                return
-            visited.add(name)
-            
-            module = self.modules.get(name)
-            if module and module.dependencies:
-                for dep in module.dependencies:
-                    visit(dep)
-            
-            order.append(name)
-        
-        for name in self.modules:
-            visit(name)
-        
-        return order
+    def _timed_compile(self, module: Module) -> Dict[str, Any]:
+        """compile_module plus the CPU and wall time it took in this process."""
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        files = self.compile_module(module)
+        return {
+            "files": files,
+            "split": self.split_report[module.name],
+            "cpu_seconds": time.process_time() - cpu_start,
+            "wall_seconds": time.perf_counter() - wall_start
+        }
+    
+    def _compile_parallel(self, ordered: List[str], jobs: int) -> Dict[str, Dict[str, Any]]:
+        """Compile modules in a process pool, each as soon as its dependencies are done."""
+        graph = self.dependency_graph
+        pending = {name: set(graph.dependencies[name]) for name in ordered}
+        
+        outcomes = {}
+        ready = [name for name in ordered if not pending[name]]
+        running = {}
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            while ready or running:
+                for name in ready:
+                    future = pool.submit(_compile_module_job, self.output_dir, self.split_mode, self.modules[name])
+                    running[future] = name
+                ready = []
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outcomes[name] = future.result()
+                    for dependent in graph.dependents[name]:
+                        pending[dependent].discard(name)
+                        if not pending[dependent]:
+                            ready.append(dependent)
+        return outcomes
+    
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """The modules' dependency graph, rebuilt only after add_module."""
+        if self._graph is None:
+            self._graph = DependencyGraph.from_modules(self.modules)
+        return self._graph
     
     def _generate_manifest(self, results: Dict[str, List[str]]):
         """Generate manifest file for build."""
@@ -369,12 +779,18 @@ class TauCompiler:
             "modules": results,
             "total_files": len(self.generated_files),
             "output_dir": self.output_dir,
+            "archive": self.archive,
+            "split": {"mode": self.split_mode, "modules": self.split_report},
+            "waves": self.dependency_graph.waves,
+            "timing": self.build_timing,
             "compiler_version": "1.0.0"
         }
         
-        manifest_path = os.path.join(self.output_dir, "manifest.json")
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        self.writer.write("manifest.json", json.dumps(manifest, indent=2))
+
+def _compile_module_job(output_dir: str, split_mode: str, module: Module) -> Dict[str, Any]:
+    """Process-pool entry point: compile one module with a fresh compiler."""
+    return TauCompiler(output_dir, split_mode)._timed_compile(module)
 
 # Example usage
 def create_example_module():
@@ -412,6 +828,11 @@ if __name__ == "__main__":
     
     print(f"Compilation complete:")
     for module_name, files in results.items():
-        print(f"  {module_name}: {len(files)} files")
+        interfaces = compiler.split_report[module_name]["interface_variables"]
+        print(f"  {module_name}: {len(files)} files, {interfaces} interface variables")
         for file in files:
-            print(f"    - {file}")
\ No newline at end of file
+            print(f"    - {file}")
+    
+    timing = compiler.build_timing
+    print(f"Wall time: {timing['wall_seconds']:.3f}s, module CPU time: {timing['module_cpu_seconds']:.3f}s "
+          f"({timing['jobs']} jobs)")
\ No newline at end of file
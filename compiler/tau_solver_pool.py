@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Persistent Tau solver worker pool
+
+Keeps N long-lived Tau REPL processes and feeds them `solve ...` commands
+over stdin/stdout instead of starting run_tau.sh once per constraint file.
+A response is everything the REPL prints before its next prompt; stderr
+is collected per request. Workers are health-checked, killed and
+restarted on timeout, and restarted (with one retry) if they die
+mid-request.
+
+fake_tau_solver.py in this directory speaks the same protocol and can be
+used as the command when the real Tau binary is not available.
+"""
+
+import atexit
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_PROMPT = "tau> "
+DEFAULT_TIMEOUT = 10.0
+HEALTH_CHECK_COMMAND = "solve h=1"
+
+# run_tau.sh of the Tau checkout this project lives in: the file the compiler
+# scripts reach as "../../../external_dependencies/run_tau.sh" from compiler/,
+# resolved so it does not depend on the working directory
+DEFAULT_TAU_COMMAND = str((Path(__file__).resolve().parent / "../../../external_dependencies/run_tau.sh").resolve())
+
+# Fake solver stand-in for tests and machines without Tau
+FAKE_SOLVER_COMMAND = [sys.executable, str(Path(__file__).parent / "fake_tau_solver.py")]
+
+
+class SolverError(Exception):
+    """Raised when a solver worker cannot be started or stops responding"""
+    pass
+
+
+@dataclass
+class SolveResult:
+    """Outcome of one solve request"""
+    satisfiable: bool
+    output: str
+    error: Optional[str]
+    elapsed: float
+    timed_out: bool = False
+
+
+def extract_commands(tau_source: str) -> List[str]:
+    """REPL commands of a .tau file: everything except comments, blanks and quit"""
+    commands = []
+    for line in tau_source.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line == "quit":
+            continue
+        commands.append(line)
+    return commands
+
+
+class SolverWorker:
+    """One long-lived Tau REPL process"""
+
+    def __init__(self, command: Sequence[str], cwd: Optional[str] = None,
+                 prompt: str = DEFAULT_PROMPT, startup_timeout: float = 30.0):
+        self.command = list(command)
+        self.cwd = cwd
+        self.prompt = prompt
+        self.startup_timeout = startup_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.requests = 0
+        self.restarts = 0
+        self._stderr: List[str] = []
+        self._stderr_lock = threading.Lock()
+
+    def start(self):
+        """Launch the REPL and wait for its first prompt"""
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.cwd,
+                bufsize=0
+            )
+        except OSError as e:
+            raise SolverError(f"Cannot start solver {self.command[0]}: {e}")
+
+        threading.Thread(target=self._drain_stderr, args=(self.process,), daemon=True).start()
+        try:
+            self._read_until_prompt(self.startup_timeout)
+        except (SolverError, TimeoutError) as e:
+            self.stop()
+            raise SolverError(f"Solver {self.command[0]} did not start: {e}")
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def stop(self):
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.write(b"quit\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+            stream.close()
+        self.process = None
+
+    def run(self, commands: List[str], timeout: float) -> Tuple[str, str]:
+        """Send commands and return (stdout, stderr) produced before the prompt returns"""
+        if not self.alive():
+            raise SolverError("Solver process is not running")
+
+        with self._stderr_lock:
+            self._stderr.clear()
+
+        output = []
+        deadline = time.monotonic() + timeout
+        for command in commands:
+            try:
+                self.process.stdin.write(command.encode() + b"\n")
+                self.process.stdin.flush()
+            except OSError as e:
+                raise SolverError(f"Solver stdin closed: {e}")
+            output.append(self._read_until_prompt(deadline - time.monotonic()))
+
+        self.requests += 1
+        with self._stderr_lock:
+            error = "".join(self._stderr)
+        return "".join(output), error
+
+    def _read_until_prompt(self, timeout: float) -> str:
+        """Read stdout until the REPL prompt, raising TimeoutError at the deadline"""
+        fd = self.process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        buffer = b""
+        prompt = self.prompt.encode()
+
+        while not buffer.endswith(prompt):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Solver did not answer within {timeout:.1f}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise SolverError("Solver process exited")
+            buffer += chunk
+
+        return buffer[:-len(prompt)].decode(errors="replace")
+
+    def _drain_stderr(self, process: subprocess.Popen):
+        try:
+            for line in iter(process.stderr.readline, b""):
+                with self._stderr_lock:
+                    self._stderr.append(line.decode(errors="replace"))
+        except (OSError, ValueError):
+            pass  # Stream closed by stop()
+
+
+class SolverPool:
+    """Pool of persistent Tau workers, safe to share between threads"""
+
+    def __init__(self, command: Union[str, Sequence[str]], workers: int = 4, cwd: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT, prompt: str = DEFAULT_PROMPT,
+                 solution_marker: str = "solution:"):
+        self.command = [command] if isinstance(command, str) else list(command)
+        self.size = workers
+        self.cwd = cwd
+        self.timeout = timeout
+        self.prompt = prompt
+        self.solution_marker = solution_marker
+        self._idle: "queue.Queue[SolverWorker]" = queue.Queue()
+        self._workers: List[SolverWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _checkout(self) -> SolverWorker:
+        """Take an idle worker, starting a new one while below pool size"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise SolverError("Solver pool is closed")
+            worker = None
+            if len(self._workers) < self.size:
+                worker = SolverWorker(self.command, cwd=self.cwd, prompt=self.prompt)
+                self._workers.append(worker)
+
+        if worker is None:
+            return self._idle.get()
+
+        # Start outside the lock so a slow startup does not block other checkouts
+        try:
+            worker.start()
+        except SolverError:
+            with self._lock:
+                self._workers.remove(worker)
+            raise
+        return worker
+
+    def solve(self, commands: Union[str, List[str]], timeout: Optional[float] = None) -> SolveResult:
+        """Run REPL commands on a pooled worker"""
+        if isinstance(commands, str):
+            commands = [commands]
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+
+        worker = self._checkout()
+        try:
+            for attempt in range(2):
+                try:
+                    if not worker.alive():
+                        worker.restart()
+                    output, error = worker.run(commands, timeout)
+                    return SolveResult(
+                        satisfiable=self.solution_marker in output,
+                        output=output,
+                        error=error.strip() or None,
+                        elapsed=time.monotonic() - start
+                    )
+                except TimeoutError as e:
+                    # A wedged solver cannot be trusted with the next request;
+                    # it is restarted on its next checkout
+                    worker.stop()
+                    return SolveResult(False, "", str(e), time.monotonic() - start, timed_out=True)
+                except SolverError as e:
+                    # Crashed mid-request: restart and retry once
+                    worker.stop()
+                    if attempt == 1:
+                        return SolveResult(False, "", str(e), time.monotonic() - start)
+        finally:
+            self._idle.put(worker)
+
+    def solve_file(self, tau_file: Union[str, Path], timeout: Optional[float] = None) -> SolveResult:
+        """Run the solve commands of a .tau file"""
+        path = Path(tau_file)
+        if self.cwd and not path.is_absolute():
+            path = Path(self.cwd) / path
+        return self.solve(extract_commands(path.read_text()), timeout)
+
+    def health_check(self) -> Dict[str, int]:
+        """Ping idle workers with a trivial solve and restart any that fail"""
+        checked = restarted = 0
+        for _ in range(self._idle.qsize()):
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                checked += 1
+                output, _ = worker.run([HEALTH_CHECK_COMMAND], self.timeout)
+                if self.solution_marker not in output:
+                    raise SolverError("Health check returned no solution")
+            except (SolverError, TimeoutError):
+                restarted += 1
+                worker.stop()
+                try:
+                    worker.restart()
+                except SolverError:
+                    pass  # Retried on next checkout
+            finally:
+                self._idle.put(worker)
+        return {"checked": checked, "restarted": restarted}
+
+    def ensure_capacity(self, workers: int):
+        """Allow at least `workers` concurrent solver processes; they start on demand"""
+        with self._lock:
+            self.size = max(self.size, workers)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._workers),
+            "requests": sum(worker.requests for worker in self._workers),
+            "restarts": sum(worker.restarts for worker in self._workers),
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_shared_pools: Dict[Tuple, SolverPool] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(command: Union[str, Sequence[str]], workers: int = 4, cwd: Optional[str] = None,
+                    timeout: float = DEFAULT_TIMEOUT) -> SolverPool:
+    """Process-wide pool per (command, cwd, workers), closed automatically at exit.
+
+    timeout is the default of the pool first created for a key; pass timeout
+    to solve() to override it per request.
+    """
+    key = (tuple([command] if isinstance(command, str) else command), cwd, workers)
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = SolverPool(command, workers=workers, cwd=cwd, timeout=timeout)
+            _shared_pools[key] = pool
+        return pool
+
+
+@atexit.register
+def _close_shared_pools():
+    for pool in _shared_pools.values():
+        pool.close()
+
+
+def _forget_inherited_pools():
+    # A forked child shares the parent's solver pipes; it must start its own
+    # workers rather than talk to (or quit) the parent's
+    _shared_pools.clear()
+
+
+os.register_at_fork(after_in_child=_forget_inherited_pools)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for the shared build-output writer and indexed archives"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from build_writer import ARCHIVE_HEADER, ARCHIVE_MAGIC, BuildWriter, pack_archive
+from tau_compiler import TauCompiler
+from test_tau_compiler import alu_modules
+
+
+def test_batch_commits_once_and_skips_unchanged():
+    """Batched writes land together; identical content is not rewritten"""
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = BuildWriter(tmp)
+        with writer.batch():
+            writer.write("add/add_nibble_0.tau", "solve a=1\n\nquit")
+            writer.write("summary.md", "draft")
+            writer.write("summary.md", "final")
+            assert not (Path(tmp) / "summary.md").exists()
+        assert (Path(tmp) / "summary.md").read_text() == "final"
+        assert writer.stats["written"] == 2 and writer.stats["flushes"] == 1
+
+        target = Path(tmp) / "add" / "add_nibble_0.tau"
+        mtime = target.stat().st_mtime_ns
+        writer.write("add/add_nibble_0.tau", "solve a=1\n\nquit")
+        assert writer.stats["unchanged"] == 1 and target.stat().st_mtime_ns == mtime
+        writer.write("add/add_nibble_0.tau", "solve a=0\n\nquit")
+        assert target.read_text() == "solve a=0\n\nquit"
+        assert not list(Path(tmp).rglob("*.partial"))
+
+
+def test_buffer_limit_and_fsync():
+    """A full buffer flushes early; fsync syncs each file and each directory once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = BuildWriter(tmp, fsync=True, buffer_bytes=10)
+        with writer.batch():
+            writer.write("a/x.tau", "12345")
+            assert writer.stats["flushes"] == 0
+            writer.write("a/y.tau", "67890")
+            assert writer.stats["flushes"] == 1
+        assert writer.stats["fsyncs"] == 3
+
+
+def test_archive_index():
+    """Every archived file is found at its indexed offset with a matching hash"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with BuildWriter(tmp) as writer, writer.batch():
+            writer.write("add/add_nibble_0.tau", "solve s0=1\n\nquit")
+            writer.write("xor/xor_nibble_0.tau", "solve r0=(a0+b0)\n\nquit")
+            writer.write("summary.md", "not a component")
+
+        archive = Path(tmp) / "components.tauarch"
+        assert pack_archive(tmp, archive) == 2
+        data = archive.read_bytes()
+        magic, index_length = ARCHIVE_HEADER.unpack_from(data)
+        assert magic == ARCHIVE_MAGIC
+        start = ARCHIVE_HEADER.size + index_length
+        entries = json.loads(data[ARCHIVE_HEADER.size:start])["entries"]
+        assert sorted(entries) == ["add/add_nibble_0.tau", "xor/xor_nibble_0.tau"]
+        for name, entry in entries.items():
+            blob = data[start + entry["offset"]:start + entry["offset"] + entry["length"]]
+            assert blob == (Path(tmp) / name).read_bytes()
+            assert hashlib.sha256(blob).hexdigest() == entry["sha256"]
+
+        mtime = archive.stat().st_mtime_ns
+        pack_archive(tmp, archive)
+        assert archive.stat().st_mtime_ns == mtime
+
+
+def test_compiler_rebuild_writes_only_manifest():
+    """Recompiling unchanged modules leaves every .tau file and the archive alone"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = TauCompiler(tmp, archive="modules.tauarch")
+        for module in alu_modules(4):
+            compiler.add_module(module)
+        results = compiler.compile_all(jobs=1)
+        files = sum(len(names) for names in results.values())
+        assert compiler.writer.stats["written"] == files + 2
+        assert (Path(tmp) / "modules.tauarch").exists()
+
+        again = TauCompiler(tmp, archive="modules.tauarch")
+        for module in alu_modules(4):
+            again.add_module(module)
+        again.compile_all(jobs=1)
+        assert again.writer.stats["unchanged"] == files + 1
+        assert again.writer.stats["written"] == 1   # manifest.json carries fresh timings
+        assert os.path.exists(os.path.join(tmp, "manifest.json"))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll build writer tests passed")
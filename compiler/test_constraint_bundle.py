@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Tests for the indexed constraint bundle and its readers"""
+
+import hashlib
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "runtime"))
+
+import achieve_100_percent
+import constraint_bundle
+from build_writer import ARCHIVE_HEADER, BuildWriter
+from constraint_bundle import BUNDLE_FILE, BundleError, ConstraintBundle, open_bundle, write_bundle
+from python_runtime import ConstraintRegistry, Instruction, TauValidator
+from tau_solver_pool import FAKE_SOLVER_COMMAND, SolverPool
+
+
+def make_tree(root: Path):
+    (root / "add").mkdir()
+    (root / "xor").mkdir()
+    (root / "add" / "add_nibble_0.tau").write_text("solve s0=1\n\nquit")
+    (root / "xor" / "xor_nibble_0.tau").write_text("solve r0=(a0+b0) && a0=1 && b0=1 && r0=1\n\nquit")
+
+
+def test_mapped_bundle_reads_every_file():
+    """Entries come back byte-for-byte with the hash of the file they were packed from"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        assert write_bundle(root) == 2
+
+        with ConstraintBundle(root / BUNDLE_FILE) as bundle:
+            assert [entry.name for entry in bundle] == ["add/add_nibble_0.tau", "xor/xor_nibble_0.tau"]
+            assert list(bundle.names("xor/")) == ["xor/xor_nibble_0.tau"]
+            for entry in bundle:
+                data = (root / entry.name).read_bytes()
+                assert entry.data == data
+                assert entry.sha256 == hashlib.sha256(data).hexdigest()
+            assert "mul/mul_nibble_0.tau" not in bundle
+
+
+def test_open_bundle_falls_back_to_tree():
+    """Without a bundle file the tree is packed in memory behind the same API"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        bundle = open_bundle(root)
+        assert bundle.path is None and len(bundle) == 2
+        assert bundle.read_text("add/add_nibble_0.tau") == "solve s0=1\n\nquit"
+
+        write_bundle(root, names=["add/add_nibble_0.tau"])
+        assert len(open_bundle(root)) == 1
+
+
+def test_edits_after_packing_are_served():
+    """A .tau file rewritten after write_bundle (as the fix scripts do) repacks the bundle"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        write_bundle(root)
+        with open_bundle(root) as bundle:
+            assert bundle.stale(root) == []
+
+        BuildWriter(root).write("add/add_nibble_0.tau", "solve s0=0 && c0=1\n\nquit")
+        with ConstraintBundle(root / BUNDLE_FILE) as bundle:
+            assert bundle.stale(root) == ["add/add_nibble_0.tau"]
+        with open_bundle(root) as bundle:
+            assert bundle.path == root / BUNDLE_FILE
+            assert bundle.read_text("add/add_nibble_0.tau") == "solve s0=0 && c0=1\n\nquit"
+            assert bundle.stale(root) == []
+        assert ConstraintRegistry.load(root).get(Instruction.ADD).nibbles[0].text == "solve s0=0 && c0=1\n\nquit"
+
+
+def test_added_files_are_served():
+    """A .tau file added after packing, in a packed or a new directory, makes the bundle stale"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        write_bundle(root)
+
+        writer = BuildWriter(root)
+        writer.write("add/add_nibble_1.tau", "solve s1=0\n\nquit")
+        writer.write("sub/sub_nibble_0.tau", "solve d0=1\n\nquit")
+        with ConstraintBundle(root / BUNDLE_FILE) as bundle:
+            assert bundle.stale(root) == ["add/add_nibble_1.tau", "sub/sub_nibble_0.tau"]
+        with open_bundle(root) as bundle:
+            assert bundle.path == root / BUNDLE_FILE and len(bundle) == 4
+            assert bundle.read_text("sub/sub_nibble_0.tau") == "solve d0=1\n\nquit"
+            assert bundle.stale(root) == []
+        assert sorted(ConstraintRegistry.load(root).get(Instruction.ADD).nibbles) == [0, 1]
+
+
+def test_unchanged_tree_lists_only_the_root():
+    """Checking a settled build costs one stat per directory; only the root, where the archive
+    itself was written, is listed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        write_bundle(root)
+        # Age the tree so nothing in it is racy (as new as the archive)
+        for path in (root / "add" / "add_nibble_0.tau", root / "xor" / "xor_nibble_0.tau", root / "add", root / "xor", root):
+            os.utime(path, ns=(10**18, 10**18))
+        write_bundle(root)
+
+        listed = []
+        directory_state = constraint_bundle.directory_state
+        constraint_bundle.directory_state = lambda path: listed.append(path) or directory_state(path)
+        try:
+            with open_bundle(root) as bundle:
+                assert bundle.path == root / BUNDLE_FILE
+            assert listed == [root]
+        finally:
+            constraint_bundle.directory_state = directory_state
+
+
+def test_runtime_load_never_writes():
+    """Loading a registry from a stale bundle serves the edit but leaves the bundle to the build"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        write_bundle(root)
+        packed = (root / BUNDLE_FILE).read_bytes()
+        mtime = (root / BUNDLE_FILE).stat().st_mtime_ns
+
+        BuildWriter(root).write("add/add_nibble_0.tau", "solve s0=0 && c0=1\n\nquit")
+        assert ConstraintRegistry.load(root).get(Instruction.ADD).nibbles[0].text == "solve s0=0 && c0=1\n\nquit"
+        assert (root / BUNDLE_FILE).read_bytes() == packed
+        assert (root / BUNDLE_FILE).stat().st_mtime_ns == mtime
+
+
+def test_corrupt_bundles_are_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root)
+        write_bundle(root)
+        data = (root / BUNDLE_FILE).read_bytes()
+
+        for broken in (b"", data[:ARCHIVE_HEADER.size - 1], b"NOTABNDL" + data[8:], data[:-3]):
+            (root / BUNDLE_FILE).write_bytes(broken)
+            try:
+                ConstraintBundle(root / BUNDLE_FILE)
+            except BundleError:
+                continue
+            assert False, f"expected BundleError for {broken[:16]!r}"
+
+
+def test_build_writes_bundle_for_validation():
+    """generate_all_instructions packs every component; validation reads only the bundle"""
+    with tempfile.TemporaryDirectory() as tmp:
+        achieve_100_percent.OUTPUT_DIR = tmp
+        with redirect_stdout(io.StringIO()):
+            report = achieve_100_percent.generate_all_instructions(jobs=1)
+        bundle = ConstraintBundle(Path(tmp) / BUNDLE_FILE)
+        assert len(bundle) == report["successful_components"]
+
+        (Path(tmp) / "add" / "add_nibble_0.tau").unlink()
+        with redirect_stdout(io.StringIO()):
+            validation = achieve_100_percent.validate_all_components(
+                Path(tmp) / "generation_report.json", tau_command=FAKE_SOLVER_COMMAND, workers=2
+            )["validation"]
+        assert validation["total_validated"] == len(bundle)
+        assert str(Path(tmp) / "add" / "add_nibble_0.tau") in validation["results"]
+
+
+def test_runtime_validator_uses_bundle():
+    """A registry loaded from the bundle gives the same verdicts as one loaded from the files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        achieve_100_percent.OUTPUT_DIR = tmp
+        with redirect_stdout(io.StringIO()):
+            achieve_100_percent.generate_all_instructions(jobs=1)
+
+        pool = SolverPool(FAKE_SOLVER_COMMAND, workers=1)
+        with ConstraintBundle(Path(tmp) / BUNDLE_FILE) as bundle:
+            from_bundle = TauValidator(solver_pool=pool, registry=ConstraintRegistry.from_bundle(bundle))
+        (Path(tmp) / BUNDLE_FILE).unlink()
+        from_files = TauValidator(solver_pool=pool, constraint_root=tmp)
+
+        cases = [(Instruction.ADD, [3, 4], [7]), (Instruction.XOR, [5, 9], [12]), (Instruction.HALT, [], [])]
+        for instruction, inputs, outputs in cases:
+            assert (from_bundle.validate_operation(instruction, inputs, outputs)
+                    == from_files.validate_operation(instruction, inputs, outputs))
+        assert from_bundle.native_checks == from_files.native_checks
+        pool.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll constraint bundle tests passed")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for the constraint IR optimizer run before Tau emission"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "runtime"))
+
+from achieve_100_percent import ArithmeticGenerator, Component, generate_instruction_components
+from constraint_evaluator import compile_expression
+from constraint_ir import (
+    TRUE, Conjunction, Node, assign, conj, conjunct, negate, optimize, optimize_constraints, parse_expression,
+    pins, render, var, xor
+)
+
+
+def test_gf2_simplification():
+    """XOR cancels and folds constants; AND/OR are idempotent and absorb"""
+    cases = {
+        "((x+1)+1)": "x",
+        "(x&x)": "x",
+        "(x|x|0)": "x",
+        "(a+b+a)": "b",
+        "(x&(x+1))": "0",
+        "(x|x')": "1",
+        "((b0+1)&a0)": "(a0&(b0+1))",
+        "(a10+a9+a2)": "(a2+a9+a10)",
+    }
+    for text, expected in cases.items():
+        assert render(parse_expression(text)) == expected, text
+
+
+def test_constant_propagation_keeps_interface():
+    """Pins fold into the circuit; pins and outputs stay, intermediates go"""
+    component = ArithmeticGenerator().generate_add_nibble(1)
+    optimized = optimize_constraints(component.constraints, keep=component.guarantees)
+    assert optimized == ["a4=1", "b4=0", "a5=0", "b5=1", "a6=1", "b6=0", "a7=0", "b7=1", "cin=0",
+                         "s4=1", "s5=1", "s6=1", "s7=1", "c7=0", "cout1=0"]
+
+
+def test_cse_and_dead_variables():
+    constraints = ["t=(a&b)", "u=(b&a)", "v=((a&b)+c)", "w=(u|t)", "dead=(a+c)", "out=(v&w)", "x=y", "z=(x+1+1)"]
+    assert optimize_constraints(constraints, keep=["dead"]) == [
+        "t=(a&b)", "v=(c+t)", "dead=(a+c)", "out=(t&v)", "z=y"
+    ]
+    assert optimize_constraints(["p=(a&b)", "p=(a&b)", "q=p"], keep=["p"]) == ["p=(a&b)", "q=p"]
+
+
+def test_unsupported_and_contradictions_pass_through():
+    constraints = ["cin=0|cin=1", "x=1", "y=(x&z)", "y=1"]
+    assert optimize_constraints(constraints) == ["cin=0|cin=1", "x=1", "z=1"]
+    contradiction = ["x=1", "y=(x+1)", "y=1"]
+    assert optimize_constraints(contradiction) == contradiction
+
+
+def test_generated_components_stay_equisatisfiable():
+    """Every generated component keeps its verdict and none gets longer"""
+    before = after = 0
+    for instruction in ("ADD", "SUB", "MUL", "AND", "XOR", "NOT", "EQ", "LT", "GT", "NEQ", "JZ", "PUSH"):
+        for component in generate_instruction_components(instruction):
+            interface = (component.assumptions or []) + (component.guarantees or [])
+            optimized = " && ".join(optimize_constraints(component.constraints, keep=interface))
+            original = " && ".join(component.constraints)
+            assert (compile_expression(original).satisfiable() ==
+                    compile_expression(optimized).satisfiable()), component.name
+            assert len(optimized) <= len(original), component.name
+            before += len(original)
+            after += len(optimized)
+    assert after < before * 0.8
+
+
+def test_random_circuits_stay_equisatisfiable():
+    rng = random.Random(7)
+    names = ["a", "b", "c", "d"]
+
+    def expression(depth):
+        if depth == 0 or rng.random() < 0.3:
+            return rng.choice(names + ["0", "1"])
+        op = rng.choice("&|+")
+        return f"({expression(depth - 1)}{op}{expression(depth - 1)})"
+
+    for _ in range(300):
+        constraints = [f"{name}={expression(2)}" for name in ("t", "u", "v")]
+        constraints += [f"{rng.choice(['t', 'u', 'v', 'a'])}={rng.choice('01')}" for _ in range(2)]
+        optimized = optimize_constraints(constraints)
+        assert (compile_expression(" && ".join(constraints)).satisfiable() ==
+                compile_expression(" && ".join(optimized)).satisfiable()), constraints
+
+
+def test_nodes_are_interned():
+    """Structurally equal expressions are one shared node"""
+    assert parse_expression("(b+a)") is xor(var("a"), var("b")) is parse_expression("a+b+0")
+    assert conjunct("s0=(a0+b0)") is conjunct(" s0 = (b0+a0) ")
+    assert conjunct("cin=0|cin=1").op == "raw"
+    assert not hasattr(var("a"), "__dict__") and "__slots__" in vars(Node)
+
+
+def test_lengths_are_known_without_rendering():
+    """Every node and conjunction knows its emitted length as it is built"""
+    rng = random.Random(11)
+
+    def expression(depth):
+        if depth == 0 or rng.random() < 0.25:
+            return rng.choice(["a", "b1", "carry10", "0", "1"])
+        return "(" + rng.choice("&|+").join(expression(depth - 1) for _ in range(rng.randint(2, 3))) + ")"
+
+    solve = Conjunction()
+    for index in range(200):
+        node = conjunct(f"t{index}={expression(4)}")
+        assert node.length == len(node.text)
+        assert solve.fits(node, solve.length + solve.cost(node))
+        assert not solve.fits(node, solve.length + solve.cost(node) - 1)
+        solve.add(node)
+        assert solve.length == len(solve.render())
+    solve.add(node)     # Duplicates are dropped
+    assert solve.length == len(solve.render())
+
+
+def test_optimize_returns_nodes():
+    nodes = optimize(["x=1", "y=(x&z)", "w=(z&1)"], keep=["w"])
+    assert all(isinstance(node, Node) for node in nodes)
+    assert Conjunction(nodes).render() == "x=1 && y=z && w=z"
+
+
+def test_fully_optimized_component_stays_solvable():
+    """A component whose conjuncts all simplify away renders `solve 1=1`, not `solve `"""
+    assert optimize(["1=1", "a=a"]) == [TRUE]
+    assert optimize_constraints(["0=0"]) == ["1=1"]
+    assert "\nsolve 1=1\n" in Component("tautology", ["1=1", "b=b"]).to_tau()
+    assert compile_expression(TRUE.text).satisfiable()
+
+
+def test_builders_match_parsed_text():
+    """The emitters' direct builders produce the same nodes the text parser does"""
+    assert negate(var("x")) is parse_expression("x'") is parse_expression("(x+1)")
+    assert pins("a", [1, 0]) == [conjunct("a0=1"), conjunct("a1=0")]
+    built = assign("r", conj(var("a"), negate(var("b"))))
+    assert built is conjunct("r=(a&(b+1))")
+    assert Conjunction(pins("a", [1]) + [built]).render() == "a0=1 && r=(a&(b+1))"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll constraint IR tests passed")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Tests for the dependency-driven scheduler of the full zkVM orchestrator"""
+
+import io
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from full_zkvm_orchestrator import DependencyScheduler, SubagentTask, ZKVMOrchestrator
+
+
+def test_single_worker_does_not_deadlock():
+    """Waiting tasks never hold a worker, so one worker runs the whole DAG"""
+    scheduler = DependencyScheduler({"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]})
+    order = []
+    stats = scheduler.run(lambda name: order.append(name) or True, max_workers=1)
+    assert order[0] == "a" and order[-1] == "d"
+    assert set(order) == {"a", "b", "c", "d"}
+    assert stats.max_workers == 1 and len(stats.task_times) == 4
+
+
+def test_critical_path_first():
+    """Among ready tasks the one heading the longest chain starts first"""
+    scheduler = DependencyScheduler(
+        {"short": [], "long": [], "tail": ["long"]},
+        costs={"short": 5.0, "long": 2.0, "tail": 4.0}
+    )
+    assert scheduler.priority == {"short": 5.0, "long": 6.0, "tail": 4.0}
+    order = []
+    scheduler.run(order.append, max_workers=1)
+    assert order == ["long", "short", "tail"]
+
+
+def test_failure_skips_dependents():
+    """Dependents of a failed task are skipped; independent tasks still run"""
+    scheduler = DependencyScheduler({"a": [], "b": ["a"], "c": ["b"], "d": []})
+    ran = []
+
+    def run(name):
+        ran.append(name)
+        return name != "a"
+
+    results = {}
+    scheduler.run(run, max_workers=2, succeeded=bool,
+                  skip=lambda name, failed: f"skipped after {failed}", results=results)
+    assert sorted(ran) == ["a", "d"]
+    assert results == {"a": False, "b": "skipped after a", "c": "skipped after a", "d": True}
+
+
+def test_invalid_graphs_are_rejected():
+    for dependencies, message in (({"a": ["b", "missing"], "b": []}, "unknown task missing"),
+                                  ({"a": ["b"], "b": ["a"], "c": []}, "cycle among tasks: a, b")):
+        try:
+            DependencyScheduler(dependencies)
+        except ValueError as error:
+            assert message in str(error)
+            continue
+        assert False, f"expected ValueError for {dependencies}"
+
+
+def test_critical_path_and_utilization():
+    """The critical path follows the slowest chain; parallel branches raise utilization"""
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def run(name):
+        with lock:
+            active.append(name)
+            peak.append(len(active))
+        time.sleep({"a": 0.05, "b": 0.05, "c": 0.15, "d": 0.05}[name])
+        with lock:
+            active.remove(name)
+        return True
+
+    scheduler = DependencyScheduler({"a": [], "b": ["a"], "c": ["a"], "d": ["b"]})
+    stats = scheduler.run(run, max_workers=2)
+    assert max(peak) == 2
+    assert stats.critical_path == ["a", "c"]
+    assert 0.2 <= stats.critical_path_time <= stats.wall_time
+    assert 0.5 < stats.utilization <= 1.0
+    assert stats.to_dict()["utilization"] == stats.utilization
+
+
+class FakeGenerator:
+    def __init__(self, log):
+        self.log = log
+
+    def generate(self, operations):
+        self.log.append(operations[0])
+        if operations[0] == "BROKEN":
+            raise RuntimeError("generator failed")
+        return {}
+
+
+class FakeOrchestrator(ZKVMOrchestrator):
+    """Orchestrator whose only subagent is a recording fake"""
+
+    def __init__(self, output_dir, log):
+        self.output_dir = output_dir
+        self.subagents = {"proving": FakeGenerator(log)}
+        self.results = {}
+        self.schedule_stats = None
+
+
+def test_orchestrator_schedules_tasks():
+    """orchestrate() runs the plan through the scheduler and records the schedule"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log = []
+        orchestrator = FakeOrchestrator(tmp, log)
+        orchestrator.create_task_plan = lambda: [
+            SubagentTask("first", "proving", ["FIRST"], []),
+            SubagentTask("broken", "proving", ["BROKEN"], ["first"]),
+            SubagentTask("after_broken", "proving", ["NEVER"], ["broken"]),
+            SubagentTask("second", "proving", ["SECOND"], ["first"]),
+        ]
+        with redirect_stdout(io.StringIO()):
+            orchestrator.orchestrate(max_workers=1)
+
+        assert log[0] == "FIRST" and "NEVER" not in log
+        assert orchestrator.results["second"].success
+        assert orchestrator.results["after_broken"].error == "Dependency failed: broken"
+        assert orchestrator.schedule_stats.critical_path[0] == "first"
+
+        # The next run's priorities come from the recorded execution times
+        costs = orchestrator.estimate_task_costs(orchestrator.create_task_plan())
+        assert costs["second"] == orchestrator.results["second"].execution_time
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll orchestrator tests passed")
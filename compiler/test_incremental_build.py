@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Tests for the content-addressed incremental build in achieve_100_percent"""
+
+import hashlib
+import io
+import json
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import achieve_100_percent
+from achieve_100_percent import BitwiseGenerator, BUILD_MANIFEST, VALIDATION_CHECKPOINT, load_json
+from tau_solver_pool import FAKE_SOLVER_COMMAND
+
+
+def build(output_dir: str, **kwargs):
+    achieve_100_percent.OUTPUT_DIR = output_dir
+    with redirect_stdout(io.StringIO()):
+        return achieve_100_percent.generate_all_instructions(**kwargs)
+
+
+def validate(output_dir: str, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        report = achieve_100_percent.validate_all_components(
+            Path(output_dir) / "generation_report.json", tau_command=FAKE_SOLVER_COMMAND, **kwargs
+        )
+    return report["validation"]
+
+
+def test_unchanged_components_are_skipped():
+    """A second build rewrites nothing and a forced one rewrites everything"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = build(tmp)
+        assert first["written_components"] == first["total_components"]
+        assert len(load_json(Path(tmp) / BUILD_MANIFEST, {})["components"]) == first["successful_components"]
+
+        second = build(tmp)
+        assert second["written_components"] == 0
+        assert second["unchanged_components"] == first["total_components"]
+
+        assert build(tmp, force=True)["written_components"] == first["total_components"]
+
+
+def test_expression_lengths_match_written_files():
+    """Reported lengths are those of the optimized solve lines on disk, also when unchanged"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = build(tmp)
+        longest = max(len(line) - len("solve ")
+                      for path in Path(tmp).rglob("*.tau")
+                      for line in path.read_text().splitlines() if line.startswith("solve "))
+        assert first["max_expression_length"] == longest
+
+        second = build(tmp)
+        assert second["written_components"] == 0
+        assert second["max_expression_length"] == longest
+        assert second["instruction_stats"] == first["instruction_stats"]
+
+
+def test_generator_edit_rebuilds_only_its_components():
+    """Changing one generator rewrites and re-validates only its files"""
+    original = BitwiseGenerator.generate_and_nibble
+
+    def edited(self, nibble):
+        component = original(self, nibble)
+        component.guarantees = [f"r{nibble * 4}"]
+        return component
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build(tmp)
+        baseline = validate(tmp)
+        assert validate(tmp)["total_cached"] == baseline["total_files"]
+
+        # In-process build so the patched generator is used regardless of start method
+        BitwiseGenerator.generate_and_nibble = edited
+        try:
+            report = build(tmp, jobs=1)
+        finally:
+            BitwiseGenerator.generate_and_nibble = original
+        assert report["written_components"] == 8
+        assert "# Guarantees: r4" in (Path(tmp) / "and" / "and_nibble_1.tau").read_text()
+        assert validate(tmp)["total_cached"] == baseline["total_files"] - 8
+
+
+def test_parallel_build_matches_serial():
+    """Sharded generation writes the same tree as an in-process build and reports phase timings"""
+    with tempfile.TemporaryDirectory() as serial, tempfile.TemporaryDirectory() as parallel:
+        serial_report = build(serial, jobs=1)
+        parallel_report = build(parallel, jobs=4)
+
+        def tree(root):
+            return {path.relative_to(root): path.read_text() for path in Path(root).rglob("*.tau")}
+
+        assert tree(serial) == tree(parallel)
+        assert serial_report["instruction_stats"] == parallel_report["instruction_stats"]
+        assert parallel_report["timing"]["jobs"] == 4
+        assert set(parallel_report["timing"]["phases"]) == {"generate", "render", "write", "cleanup", "manifest", "bundle"}
+
+
+def test_parallel_validation_reports_latency():
+    """Every solved file gets a latency and the slowest ones are summarized"""
+    with tempfile.TemporaryDirectory() as tmp:
+        build(tmp)
+        report = validate(tmp, workers=4, slowest=5)
+        solved = report["total_validated"] - report["total_cached"]
+        assert report["total_validated"] == report["total_files"]
+        assert len(report["latency_seconds"]) == solved
+        assert len(report["slowest_files"]) == 5
+        seconds = [entry["seconds"] for entry in report["slowest_files"]]
+        assert seconds == sorted(seconds, reverse=True)
+        assert not (Path(tmp) / VALIDATION_CHECKPOINT).exists()
+
+
+def test_interrupted_validation_resumes():
+    """Files recorded in the checkpoint are not solved again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        build(tmp)
+        done = Path(tmp) / "add" / "add_nibble_0.tau"
+        edited = Path(tmp) / "add" / "add_nibble_1.tau"
+        entries = [
+            {"file": str(done), "hash": hashlib.sha256(done.read_bytes()).hexdigest(),
+             "verdict": "failed", "seconds": 1.5},
+            {"file": str(edited), "hash": "stale", "verdict": "failed", "seconds": 1.5},
+        ]
+        (Path(tmp) / VALIDATION_CHECKPOINT).write_text(
+            "".join(json.dumps(entry) + "\n" for entry in entries) + '{"file": "torn'
+        )
+
+        report = validate(tmp, workers=2)
+        assert report["total_resumed"] == 1
+        assert report["results"][str(done)] == "failed"
+        assert report["results"][str(edited)] == "satisfiable"
+        assert report["slowest_files"][0] == {"file": str(done), "seconds": 1.5}
+
+
+def test_solver_failures_are_not_cached():
+    """A solver that exits instead of answering yields errors, never cached verdicts"""
+    crash_on_request = [sys.executable, "-c",
+                        "import sys; print('tau> ', end='', flush=True); sys.stdin.readline()"]
+    with tempfile.TemporaryDirectory() as tmp:
+        build(tmp)
+        for command in ([sys.executable, "-c", "pass"], crash_on_request):
+            with redirect_stdout(io.StringIO()):
+                report = achieve_100_percent.validate_all_components(
+                    Path(tmp) / "generation_report.json", tau_command=command, workers=2
+                )["validation"]
+            assert report["total_validated"] == 0 and report["total_cached"] == 0
+            assert all(verdict.startswith("error: ") for verdict in report["results"].values())
+            assert load_json(Path(tmp) / achieve_100_percent.VALIDATION_CACHE, None) == {}
+
+        assert validate(tmp, workers=2)["total_cached"] == 0
+
+
+def test_stale_files_are_removed():
+    """Files of components that are no longer generated are deleted"""
+    with tempfile.TemporaryDirectory() as tmp:
+        build(tmp)
+        manifest_path = Path(tmp) / BUILD_MANIFEST
+        manifest = load_json(manifest_path, {})
+        stale = Path(tmp) / "add" / "retired_component.tau"
+        stale.write_text("solve x=1\n\nquit")
+        manifest["components"]["add/retired_component.tau"] = "0" * 64
+        achieve_100_percent.write_json_atomic(manifest_path, manifest)
+
+        assert build(tmp)["removed_components"] == 1
+        assert not stale.exists()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll incremental build tests passed")
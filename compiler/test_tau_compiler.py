@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Tests for splitting compiled constraints into Tau-sized files"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from constraint_ir import Conjunction, conjunct
+from tau_compiler import (
+    SEPARATOR, Constraint, ConstraintType, DependencyGraph, Module, TauCompiler, Variable,
+    create_example_module
+)
+
+
+def make_compiler(tmp, **kwargs):
+    return TauCompiler(output_dir=tmp, **kwargs)
+
+
+def assert_within_limits(compiler, files):
+    for constraints in files:
+        assert len(SEPARATOR.join(constraints)) <= compiler.MAX_EXPR_LENGTH or len(constraints) == 1
+        variables = set().union(*(compiler._extract_variables(c) for c in constraints))
+        assert len(variables) <= compiler.MAX_VARS_PER_FILE or len(constraints) == 1
+
+
+def test_greedy_split_keeps_order():
+    """Greedy mode fills files in input order up to both limits"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp)
+        constraints = [f"x{i}=(y{i}&z{i})" for i in range(40)]
+        files = compiler.split_constraints(constraints)
+        assert [c for group in files for c in group] == constraints
+        assert [len(group) for group in files] == [16, 16, 8]   # 48 variables per file
+        assert_within_limits(compiler, files)
+
+        long_constraint = "r=(" + "+".join(["a"] * 400) + ")"
+        assert compiler.split_constraints([long_constraint, "b=1"]) == [[long_constraint], ["b=1"]]
+
+
+def test_pack_mode_uses_fewer_files():
+    """Best-fit packing fills the gaps greedy splitting leaves behind"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp, split_mode="pack")
+        constraints = [f"v{i}=" + "1" * size for i, size in enumerate((400, 400, 250, 250))]
+        assert len(compiler.split_constraints(constraints, mode="greedy")) == 3
+        packed = compiler.split_constraints(constraints)
+        assert packed == [[constraints[0], constraints[2]], [constraints[1], constraints[3]]]
+        assert_within_limits(compiler, packed)
+
+
+def test_pack_mode_groups_shared_variables():
+    """Constraints over the same variables land in the same file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp, split_mode="pack")
+        chains = [[f"s{c}x{i}=(a{c}x{i}+b{c})" for i in range(12)] for c in range(4)]
+        interleaved = [chain[i] for i in range(12) for chain in chains]
+        files = compiler.split_constraints(interleaved)
+        assert_within_limits(compiler, files)
+        assert len(files) <= len(compiler.split_constraints(interleaved, mode="greedy"))
+
+
+def carry_chains(chains=4, length=12):
+    """Independent carry chains, interleaved the way generators emit them"""
+    return [f"s{c}x{i}=(s{c}x{i - 1}+b{c})" for i in range(1, length + 1) for c in range(chains)]
+
+
+def test_partition_keeps_chains_together():
+    """Partitioning cuts no variables where greedy splitting cuts many"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp, split_mode="partition")
+        constraints = carry_chains()
+        greedy = compiler.split_constraints(constraints, mode="greedy")
+        partitioned = compiler.split_constraints(constraints)
+
+        assert len(compiler.interface_variables(greedy)) > 0
+        assert compiler.interface_variables(partitioned) == set()
+        assert len(partitioned) == 2
+        assert sorted(c for group in partitioned for c in group) == sorted(constraints)
+        assert_within_limits(compiler, partitioned)
+
+
+def test_partition_minimizes_cut_of_long_chain():
+    """A chain too big for one file is cut once, at a single variable"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp, split_mode="partition")
+        constraints = [f"c{i}=(c{i - 1}&g{i})" for i in range(1, 60)]
+        files = compiler.split_constraints(list(reversed(constraints)))
+        assert_within_limits(compiler, files)
+        assert len(compiler.interface_variables(files)) == len(files) - 1
+
+
+def test_split_report_in_manifest():
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp, split_mode="partition")
+        compiler.add_module(create_example_module())
+        compiler.compile_all()
+        manifest = json.loads((Path(tmp) / "manifest.json").read_text())
+        assert manifest["split"]["mode"] == "partition"
+        assert manifest["split"]["modules"]["arithmetic_ops"]["interface_variables"] == 0
+
+
+def test_split_is_linear():
+    """Thousands of constraints over many variables split quickly"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp)
+        constraints = [f"t{i}=(t{i - 1}&u{i % 7})" for i in range(1, 20001)]
+        start = time.perf_counter()
+        for mode in ("greedy", "partition"):
+            files = compiler.split_constraints(constraints, mode=mode)
+            assert sum(len(group) for group in files) == len(constraints)
+            assert_within_limits(compiler, files)
+        assert time.perf_counter() - start < 4.0
+
+
+def test_ir_nodes_split_by_emitted_length():
+    """IR conjuncts are measured by what they render to, not the text they came from"""
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp)
+        nodes = [conjunct(f"s{i} = ( b{i} + a{i} + c{i} )") for i in range(60)]
+        for mode in ("greedy", "pack", "partition"):
+            files = compiler.split_constraints(nodes, mode=mode)
+            assert sorted(n.text for group in files for n in group) == sorted(n.text for n in nodes)
+            for group in files:
+                assert Conjunction(group).length == len(SEPARATOR.join(n.text for n in group))
+                assert Conjunction(group).length <= compiler.MAX_EXPR_LENGTH
+
+
+def test_unknown_mode_is_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        for build in (lambda: make_compiler(tmp, split_mode="random"),
+                      lambda: make_compiler(tmp).split_constraints(["a=1"], mode="random")):
+            try:
+                build()
+            except ValueError as error:
+                assert "random" in str(error)
+                continue
+            assert False, "expected ValueError"
+
+
+def test_compile_module_in_pack_mode():
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp, split_mode="pack")
+        compiler.add_module(create_example_module())
+        files = compiler.compile_all()["arithmetic_ops"]
+        assert files and all((Path(tmp) / name).exists() for name in files)
+
+
+def alu_modules(count):
+    """Modules forming a DAG: module i depends on modules i-1 and i//2"""
+    expressions = ["c = (a + b) mod 256", "c = a - b", "c = a * b"]
+    modules = []
+    for index in range(count):
+        a, b = Variable("a", 8, is_input=True), Variable("b", 8, is_input=True)
+        c = Variable("c", 8, is_output=True)
+        dependencies = sorted({f"alu_{index - 1}", f"alu_{index // 2}"} - {f"alu_{index}"}) if index else []
+        modules.append(Module(f"alu_{index}", [a, b, c],
+                              [Constraint(ConstraintType.ARITHMETIC, [a, b, c], expressions[index % 3])],
+                              dependencies))
+    return modules
+
+
+def test_parallel_compile_matches_serial():
+    """Process-pool compilation writes the same files and manifest in dependency order"""
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as parallel_dir:
+        compilers = []
+        for tmp, jobs in ((serial_dir, 1), (parallel_dir, 3)):
+            compiler = make_compiler(tmp)
+            for module in reversed(alu_modules(8)):
+                compiler.add_module(module)
+            results = compiler.compile_all(jobs=jobs)
+            assert list(results) == compiler.dependency_graph.order
+            compilers.append(compiler)
+
+        def tree(root):
+            return {path.name: path.read_text() for path in Path(root).glob("*.tau")}
+
+        assert tree(serial_dir) == tree(parallel_dir)
+        serial, parallel = compilers
+        assert [Path(f).name for f in serial.generated_files] == [Path(f).name for f in parallel.generated_files]
+        assert serial.split_report == parallel.split_report
+
+        timing = json.loads((Path(parallel_dir) / "manifest.json").read_text())["timing"]
+        assert timing["jobs"] == 3 and set(timing["modules"]) == {f"alu_{i}" for i in range(8)}
+        assert timing["module_cpu_seconds"] == sum(m["cpu_seconds"] for m in timing["modules"].values())
+        assert serial.build_timing["jobs"] == 1
+
+    # Parallelism is opt-in; the default build stays in-process
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp)
+        for module in alu_modules(8):
+            compiler.add_module(module)
+        compiler.compile_all()
+        assert compiler.build_timing["jobs"] == 1
+
+
+def test_dependency_graph_waves():
+    graph = DependencyGraph({"exec": ["alu", "decode"], "alu": ["lut"], "decode": ["lut"],
+                             "lut": [], "memory": None, "verify": ["exec", "exec"]})
+    assert graph.waves == [["lut", "memory"], ["alu", "decode"], ["exec"], ["verify"]]
+    assert graph.levels["verify"] == 3
+    position = {name: index for index, name in enumerate(graph.order)}
+    assert all(position[dep] < position[name] for name, deps in graph.dependencies.items() for dep in deps)
+
+
+def test_dependency_errors_name_the_modules():
+    for dependencies, message in (
+        ({"a": ["b"], "b": ["c"], "c": ["b"], "d": []}, "Dependency cycle between modules: b -> c -> b"),
+        ({"a": ["a"]}, "a -> a"),
+        ({"a": ["missing"]}, "Module a depends on unknown module missing"),
+    ):
+        try:
+            DependencyGraph(dependencies)
+        except ValueError as error:
+            assert message in str(error), str(error)
+            continue
+        assert False, f"expected ValueError for {dependencies}"
+
+
+def test_deep_chain_and_graph_cache():
+    """Long chains need no recursion, and the graph is rebuilt only when modules change"""
+    chain = DependencyGraph({f"m{i}": [f"m{i - 1}"] if i else [] for i in range(50000)})
+    assert chain.order[-1] == "m49999" and len(chain.waves) == 50000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compiler = make_compiler(tmp)
+        modules = alu_modules(4)
+        for module in modules[:3]:
+            compiler.add_module(module)
+        graph = compiler.dependency_graph
+        assert compiler.dependency_graph is graph
+        compiler.add_module(modules[3])
+        assert compiler.dependency_graph is not graph
+        assert compiler.dependency_graph.waves == [["alu_0"], ["alu_1"], ["alu_2"], ["alu_3"]]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll tau compiler tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for the persistent Tau solver pool, run against the fake solver"""
+
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from tau_solver_pool import SolverPool, SolverError, FAKE_SOLVER_COMMAND, extract_commands, get_shared_pool
+
+
+def test_solve_sat_and_unsat():
+    """Answers come back over the REPL and workers are reused"""
+    with SolverPool(FAKE_SOLVER_COMMAND, workers=1) as pool:
+        sat = pool.solve("solve a=1 && b=0")
+        unsat = pool.solve("solve a=1 && a=0")
+        assert sat.satisfiable and "a := 1" in sat.output
+        assert not unsat.satisfiable and not unsat.timed_out
+        assert pool.stats() == {"workers": 1, "requests": 2, "restarts": 0}
+
+
+def test_concurrent_requests():
+    """Threads share a bounded number of workers"""
+    with SolverPool(FAKE_SOLVER_COMMAND, workers=3) as pool:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: pool.solve(f"solve x{i}={i % 2}"), range(40)))
+        assert all(result.satisfiable for result in results)
+        assert pool.stats()["workers"] <= 3
+        assert pool.stats()["requests"] == 40
+
+
+def test_timeout_restarts_worker():
+    """A request past its deadline is reported and the worker replaced"""
+    with SolverPool(FAKE_SOLVER_COMMAND + ["--delay", "2"], workers=1, timeout=0.2) as pool:
+        result = pool.solve("solve a=1")
+        assert result.timed_out and not result.satisfiable
+
+        result = pool.solve("solve a=1", timeout=5)
+        assert result.satisfiable
+        assert pool.stats()["restarts"] == 1
+
+
+def test_crash_is_retried():
+    """A worker that dies mid-request is restarted and the request retried"""
+    with SolverPool(FAKE_SOLVER_COMMAND + ["--crash-after", "1"], workers=1) as pool:
+        assert pool.solve("solve a=1").satisfiable
+        assert pool.solve("solve b=1").satisfiable
+        assert pool.stats()["restarts"] == 1
+
+
+def test_health_check():
+    """Idle workers answer the ping; dead ones are restarted"""
+    with SolverPool(FAKE_SOLVER_COMMAND + ["--crash-after", "1"], workers=1) as pool:
+        pool.solve("solve a=1")
+        assert pool.health_check() == {"checked": 1, "restarted": 1}
+        assert pool.solve("solve a=1").satisfiable
+
+
+def test_missing_solver():
+    """A solver that cannot start raises instead of returning a verdict"""
+    with SolverPool("/nonexistent/run_tau.sh", workers=1) as pool:
+        try:
+            pool.solve("solve a=1")
+        except SolverError:
+            return
+    assert False, "expected SolverError"
+
+
+def test_solve_file():
+    """Files are reduced to their solve commands, relative to the pool cwd"""
+    source = "# Component: demo\n# Guarantees: a\n\nsolve a=1 && b=1\n\nquit\n"
+    assert extract_commands(source) == ["solve a=1 && b=1"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "demo.tau").write_text(source)
+        with SolverPool(FAKE_SOLVER_COMMAND, workers=1, cwd=tmp) as pool:
+            assert pool.solve_file("demo.tau").satisfiable
+
+
+def test_shared_pools_keep_their_size():
+    """A shared pool is reused only by callers asking for the same number of workers"""
+    single = get_shared_pool(FAKE_SOLVER_COMMAND, workers=1)
+    assert get_shared_pool(list(FAKE_SOLVER_COMMAND), workers=1) is single
+    wide = get_shared_pool(FAKE_SOLVER_COMMAND, workers=3)
+    assert wide is not single
+    assert (single.size, wide.size) == (1, 3)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll solver pool tests passed")
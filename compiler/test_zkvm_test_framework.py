@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests for ZKVMTestFramework parallel modes, run against the fake solver"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import achieve_100_percent
+from tau_solver_pool import DEFAULT_TAU_COMMAND, FAKE_SOLVER_COMMAND
+from zkvm_test_framework import DEFAULT_PROJECT_ROOT, ZKVMTestFramework
+
+
+def make_manifest(root: Path) -> Path:
+    """Manifest of satisfiable and contradictory files, relative to the project root"""
+    modules = {}
+    output_dir = root / "build"
+    for module in ("alu", "memory"):
+        (output_dir / module).mkdir(parents=True)
+        files = []
+        for i in range(12):
+            pin = "x=1 && x=0" if i % 5 == 0 else f"x={i % 2}"
+            (output_dir / module / f"part_{i}.tau").write_text(f"solve {pin} && y=(x&1)\n\nquit\n")
+            files.append(f"{module}/part_{i}.tau")
+        modules[module] = files
+
+    manifest = root / "manifest.json"
+    manifest.write_text(json.dumps({"output_dir": "build", "modules": modules}))
+    return manifest
+
+
+def satisfiable_map(results):
+    return {(module, file): result.satisfiable
+            for module, files in results.items() for file, result in files.items()}
+
+
+def test_parallel_modes_agree():
+    """Thread and process modes give identical verdicts without touching the cwd"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = make_manifest(Path(tmp))
+        cwd = os.getcwd()
+
+        verdicts = {}
+        for mode, workers in (("thread", 8), ("process", 4)):
+            framework = ZKVMTestFramework(FAKE_SOLVER_COMMAND, project_root=tmp)
+            with redirect_stdout(io.StringIO()):
+                results = framework.parallel_test_all(str(manifest), max_workers=workers, mode=mode)
+            verdicts[mode] = satisfiable_map(results)
+            assert len(framework.results) == 24
+            assert os.getcwd() == cwd
+
+        assert verdicts["thread"] == verdicts["process"]
+        assert sum(verdicts["thread"].values()) == 24 - 6
+        assert framework.solver_pool.stats()["workers"] <= 8
+
+
+def test_thread_mode_grows_solver_pool():
+    """The shared solver pool is sized to the requested thread count"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = make_manifest(Path(tmp))
+        framework = ZKVMTestFramework(FAKE_SOLVER_COMMAND, project_root=tmp, workers=1)
+        with redirect_stdout(io.StringIO()):
+            framework.parallel_test_all(str(manifest), max_workers=6)
+        assert framework.solver_pool.size == 6
+
+
+def test_success_means_the_solver_answered():
+    """Stderr noise is not a failure; a solver that dies before answering is"""
+    framework = ZKVMTestFramework(FAKE_SOLVER_COMMAND, workers=1)
+    assert framework.project_root == DEFAULT_PROJECT_ROOT == str(Path(__file__).resolve().parent)
+
+    noisy = framework.test_single_file("noisy.tau", "set charvar off\nsolve x=1 && x=0\n\nquit\n")
+    assert noisy.success and not noisy.satisfiable and noisy.error is None
+
+    crash_on_request = [sys.executable, "-c", "print('tau> ', end='', flush=True); input()"]
+    crashed = ZKVMTestFramework(crash_on_request, workers=1).test_single_file("crash.tau", "solve x=1\n")
+    assert not crashed.success and "exited" in crashed.error
+
+
+def test_default_solver_command_is_absolute():
+    """The default command names the run_tau.sh achieve_100_percent uses, wherever it runs from"""
+    with tempfile.TemporaryDirectory() as tmp:
+        framework = ZKVMTestFramework(project_root=tmp, workers=1)
+    command = Path(framework.solver_pool.command[0])
+    assert command.is_absolute() and str(command) == DEFAULT_TAU_COMMAND
+    expected = (Path(__file__).resolve().parent / "../../../external_dependencies/run_tau.sh").resolve()
+    assert command == expected
+    assert Path(achieve_100_percent.TAU_COMMAND) == expected
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll test framework tests passed")
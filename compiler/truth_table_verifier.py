@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Exhaustive truth-table verification of nibble components
+
+Each generated nibble component pins its inputs to one example assignment
+(a0=0 && b0=1 && ...), so a solver run only covers that single case. This
+verifier drops the input pins, evaluates the remaining circuit on every
+input combination at once as NumPy bit columns, and compares each output
+bit with the result the Python runtime (runtime/python_runtime.py)
+computes for the same operands.
+
+    python3 truth_table_verifier.py [ADD SUB AND ...]
+"""
+
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "runtime"))
+
+from achieve_100_percent import Component, generate_instruction_components
+from constraint_evaluator import compile_expression
+from python_runtime import Instruction, TauFoldZKVM
+
+INPUT_PIN = re.compile(r"(a\d+|b\d+|cin)=[01]\Z")
+INPUT_BIT = re.compile(r"([ab])(\d+)\Z")
+NIBBLE_NAME = re.compile(r"([a-z]+)_nibble_(\d+)\Z")
+
+# Constraint IR operators (n-ary) as element-wise numpy reductions
+OPERATIONS = {"&": np.bitwise_and, "|": np.bitwise_or, "+": np.bitwise_xor}
+
+
+@dataclass
+class NibbleSpec:
+    """How a nibble component's variables map onto a runtime instruction"""
+    instruction: Instruction
+    output_prefix: str          # Output bit i is <prefix><input bit index>
+    binary: bool = True
+    carry_out: bool = False     # cout<nibble> is the bit above the result
+
+
+NIBBLE_SPECS = {
+    "add": NibbleSpec(Instruction.ADD, "s", carry_out=True),
+    "sub": NibbleSpec(Instruction.SUB, "diff"),
+    "and": NibbleSpec(Instruction.AND, "r"),
+    "or": NibbleSpec(Instruction.OR, "r"),
+    "xor": NibbleSpec(Instruction.XOR, "r"),
+    "not": NibbleSpec(Instruction.NOT, "r", binary=False),
+    "eq": NibbleSpec(Instruction.EQ, "eq"),
+    "neq": NibbleSpec(Instruction.NEQ, "neq"),
+    "lt": NibbleSpec(Instruction.LT, "lt"),
+    "gt": NibbleSpec(Instruction.GT, "gt"),
+    "lte": NibbleSpec(Instruction.LTE, "lte"),
+    "gte": NibbleSpec(Instruction.GTE, "gte"),
+}
+
+
+@dataclass
+class TruthTableResult:
+    component: str
+    inputs: List[str]
+    rows: int
+    mismatches: int
+    counterexample: Optional[Dict[str, int]] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.mismatches == 0
+
+
+class TruthTableVerifier:
+    """Exhaustively checks nibble components against the runtime's semantics"""
+
+    def __init__(self):
+        self.vm = TauFoldZKVM(validate_constraints=False, trace="off")
+        self._reference_tables: Dict[Tuple, np.ndarray] = {}
+
+    def reference(self, spec: NibbleSpec, width: int, carry_in: bool) -> np.ndarray:
+        """Runtime results for every (a, b, cin) row, indexed a | b << width | cin << 2*width"""
+        key = (spec.instruction, width, carry_in, spec.binary)
+        if key not in self._reference_tables:
+            operands = 2 if spec.binary else 1
+            rows = 1 << (width * operands + carry_in)
+            table = np.zeros(rows, dtype=np.uint64)
+            mask = (1 << width) - 1
+            for row in range(rows):
+                a, b = row & mask, (row >> width) & mask
+                cin = row >> (width * operands)
+                self.vm.state.stack = [a, b] if spec.binary else [a]
+                self.vm._execute_instruction(spec.instruction, [])
+                if carry_in:
+                    self.vm.state.stack.append(cin)
+                    self.vm._execute_instruction(Instruction.ADD, [])
+                table[row] = self.vm.state.stack.pop()
+            self._reference_tables[key] = table
+        return self._reference_tables[key]
+
+    def verify_component(self, component: Component) -> Optional[TruthTableResult]:
+        """Check one component over its full input space; None if it is not a nibble op"""
+        match = NIBBLE_NAME.match(component.name)
+        if not match or match.group(1) not in NIBBLE_SPECS:
+            return None
+        spec = NIBBLE_SPECS[match.group(1)]
+        nibble = int(match.group(2))
+
+        circuit = [c for c in component.constraints if not INPUT_PIN.match(c)]
+        compiled = compile_expression(" && ".join(circuit))
+
+        bits = {"a": [], "b": []}
+        for name in compiled.free_variables:
+            bit = INPUT_BIT.match(name)
+            if bit:
+                bits[bit.group(1)].append(int(bit.group(2)))
+        a_bits = sorted(bits["a"])
+        b_bits = sorted(bits["b"])
+        width = len(a_bits)
+        carry_in = "cin" in compiled.free_variables
+
+        # Column order matches the reference row index: a bits, b bits, then cin
+        inputs = [f"a{i}" for i in a_bits] + [f"b{i}" for i in b_bits] + (["cin"] if carry_in else [])
+        unknown = set(compiled.free_variables) - set(inputs)
+        if unknown:
+            raise ValueError(f"{component.name}: unexpected free variables {sorted(unknown)}")
+
+        rows = 1 << len(inputs)
+        index = np.arange(rows, dtype=np.uint64)
+        values = {name: ((index >> np.uint64(i)) & np.uint64(1)).astype(np.uint8)
+                  for i, name in enumerate(inputs)}
+        for name, expression in compiled.definitions:
+            values[name] = self._evaluate(expression, values, rows)
+
+        ok = np.ones(rows, dtype=bool)
+        for left, right in compiled.checks:
+            ok &= self._evaluate(left, values, rows) == self._evaluate(right, values, rows)
+
+        expected = self.reference(spec, width, carry_in)
+        for position, bit in enumerate(a_bits):
+            name = f"{spec.output_prefix}{bit}"
+            if name in values:
+                ok &= values[name] == ((expected >> np.uint64(position)) & np.uint64(1))
+        carry_name = f"cout{nibble}"
+        if spec.carry_out and carry_name in values:
+            ok &= values[carry_name] == ((expected >> np.uint64(width)) & np.uint64(1))
+
+        failures = np.flatnonzero(~ok)
+        counterexample = None
+        if failures.size:
+            row = int(failures[0])
+            counterexample = {name: (row >> i) & 1 for i, name in enumerate(inputs)}
+        return TruthTableResult(component.name, inputs, rows, int(failures.size), counterexample)
+
+    def _evaluate(self, expression, values: Dict[str, np.ndarray], rows: int) -> np.ndarray:
+        if expression.op == "var":
+            return values[expression.name]
+        if expression.op == "const":
+            return np.full(rows, expression.value, dtype=np.uint8)
+        terms = [self._evaluate(term, values, rows) for term in expression.terms]
+        return OPERATIONS[expression.op].reduce(terms)
+
+    def verify_instruction(self, instruction: str) -> List[TruthTableResult]:
+        results = []
+        for component in generate_instruction_components(instruction):
+            result = self.verify_component(component)
+            if result is not None:
+                results.append(result)
+        return results
+
+
+def main():
+    instructions = [arg.upper() for arg in sys.argv[1:]] or [name.upper() for name in NIBBLE_SPECS]
+    verifier = TruthTableVerifier()
+
+    total = failed = 0
+    for instruction in instructions:
+        for result in verifier.verify_instruction(instruction):
+            total += 1
+            if result.passed:
+                print(f"✓ {result.component:<16} {result.rows:>4} rows")
+            else:
+                failed += 1
+                print(f"✗ {result.component:<16} {result.mismatches}/{result.rows} rows wrong, "
+                      f"e.g. {result.counterexample}")
+
+    print(f"\n{total - failed}/{total} nibble components match the runtime on every input")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
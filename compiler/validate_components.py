@@ -3,16 +3,18 @@
 Automated validation script for TauFoldZKVM components
 """
 
-import subprocess
 import json
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from constraint_bundle import open_bundle
+from tau_solver_pool import extract_commands, get_shared_pool
 
 class TauValidator:
     def __init__(self, tau_executable, output_dir="build/validation_results"):
         self.tau_executable = tau_executable
+        self.solver_pool = get_shared_pool(tau_executable, timeout=5)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.results = {}
@@ -26,26 +28,27 @@ class TauValidator:
             "timeout": 0
         }
     
-    def check_file_size(self, file_path):
-        """Check if file is within Tau limits"""
-        with open(file_path, 'r') as f:
-            content = f.read()
-            # Find the solve statement
-            if 'solve' in content:
-                solve_start = content.index('solve') + 6
-                solve_end = content.find('\n', solve_start)
-                if solve_end == -1:
-                    solve_end = len(content)
-                solve_expr = content[solve_start:solve_end].strip()
-                return len(solve_expr), solve_expr
+    def check_file_size(self, file_path, content=None):
+        """Check if file (or its already loaded content) is within Tau limits"""
+        if content is None:
+            with open(file_path, 'r') as f:
+                content = f.read()
+        # Find the solve statement
+        if 'solve' in content:
+            solve_start = content.index('solve') + 6
+            solve_end = content.find('\n', solve_start)
+            if solve_end == -1:
+                solve_end = len(content)
+            solve_expr = content[solve_start:solve_end].strip()
+            return len(solve_expr), solve_expr
         return 0, ""
     
-    def validate_file(self, tau_file):
+    def validate_file(self, tau_file, content=None):
         """Validate a single Tau file"""
         file_path = Path(tau_file)
         
         # Check file size first
-        expr_len, expr = self.check_file_size(file_path)
+        expr_len, expr = self.check_file_size(file_path, content)
         
         if expr_len > 800:
             return {
@@ -54,17 +57,22 @@ class TauValidator:
                 "error": f"Expression too long: {expr_len} chars (limit: 800)"
             }
         
-        # Run Tau validation
+        # Run Tau validation on a pooled solver process
         try:
-            result = subprocess.run(
-                [self.tau_executable, str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            if content is None:
+                result = self.solver_pool.solve_file(file_path)
+            else:
+                result = self.solver_pool.solve(extract_commands(content))
+            
+            if result.timed_out:
+                return {
+                    "status": "timeout",
+                    "expression_length": expr_len,
+                    "error": "Validation exceeded 5 seconds"
+                }
             
-            output = result.stdout
-            error = result.stderr
+            output = result.output
+            error = result.error
             
             if "solution:" in output:
                 # Extract solution
@@ -100,12 +108,6 @@ class TauValidator:
                     "output": output[:200]
                 }
                 
-        except subprocess.TimeoutExpired:
-            return {
-                "status": "timeout",
-                "expression_length": expr_len,
-                "error": "Validation exceeded 5 seconds"
-            }
         except Exception as e:
             return {
                 "status": "error",
@@ -114,20 +116,21 @@ class TauValidator:
             }
     
     def validate_directory(self, directory):
-        """Validate all Tau files in a directory"""
-        tau_files = sorted(Path(directory).glob("*.tau"))
+        """Validate all Tau files in a directory (read from its constraint bundle if it has one)"""
+        bundle = open_bundle(directory)
         
-        if not tau_files:
+        if not len(bundle):
             print(f"No .tau files found in {directory}")
             return
         
-        print(f"\nValidating {len(tau_files)} files in {directory}...")
+        print(f"\nValidating {len(bundle)} files in {directory}...")
         print("-" * 80)
         
-        for i, tau_file in enumerate(tau_files):
-            print(f"[{i+1}/{len(tau_files)}] {tau_file.name:<30}", end=" ")
+        for i, entry in enumerate(bundle):
+            tau_file = Path(directory) / entry.name
+            print(f"[{i+1}/{len(bundle)}] {tau_file.name:<30}", end=" ")
             
-            result = self.validate_file(tau_file)
+            result = self.validate_file(tau_file, entry.text)
             self.results[str(tau_file)] = result
             self.stats["total"] += 1
             self.stats[result["status"]] += 1
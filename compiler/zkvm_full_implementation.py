@@ -513,8 +513,12 @@ class TauFoldZKVM:
             dependencies=["folding"]
         )
     
-    def build_complete_zkvm(self):
-        """Build the complete zkVM by generating all modules."""
+    def build_complete_zkvm(self, jobs: int = 1):
+        """Build the complete zkVM by generating all modules.
+        
+        With jobs > 1, independent modules compile concurrently on `jobs`
+        processes (see TauCompiler.compile_all).
+        """
         # Generate all modules
         modules = [
             self.generate_lookup_tables_module(),
@@ -531,7 +535,7 @@ class TauFoldZKVM:
             self.compiler.add_module(module)
         
         # Compile all modules
-        results = self.compiler.compile_all()
+        results = self.compiler.compile_all(jobs=jobs)
         
         return results
     
@@ -584,6 +588,9 @@ def main():
             total_files += 1
     
     print(f"\nTotal files generated: {total_files}")
+    timing = vm.compiler.build_timing
+    print(f"Compile wall time: {timing['wall_seconds']:.2f}s for {timing['module_cpu_seconds']:.2f}s "
+          f"of module CPU time on {timing['jobs']} jobs")
     
     # Generate test program
     test_program = vm.generate_test_program()
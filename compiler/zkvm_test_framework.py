@@ -5,12 +5,14 @@ Validates all generated Tau files and tests VM functionality.
 """
 
 import os
-import subprocess
 import json
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 import concurrent.futures
 import time
+from pathlib import Path
+from constraint_bundle import ConstraintBundle, open_bundle
+from tau_solver_pool import DEFAULT_TAU_COMMAND, extract_commands, get_shared_pool
 
 @dataclass
 class TestResult:
@@ -21,43 +23,55 @@ class TestResult:
     error: Optional[str]
     execution_time: float
 
+# Manifests written by zkvm_full_implementation.py hold output directories
+# relative to this directory (e.g. "build/zkvm")
+DEFAULT_PROJECT_ROOT = str(Path(__file__).resolve().parent)
+
 class ZKVMTestFramework:
     """
     Comprehensive test framework for the zkVM.
     Tests all generated Tau files for satisfiability.
     """
     
-    def __init__(self, tau_command: str = "./external_dependencies/run_tau.sh"):
+    def __init__(self, tau_command: str = DEFAULT_TAU_COMMAND,
+                 project_root: str = DEFAULT_PROJECT_ROOT, workers: int = 4):
         self.tau_command = tau_command
         self.results: List[TestResult] = []
-        self.project_root = "/Users/danax/projects/TauStandardLibrary"
+        self.project_root = project_root
+        # Persistent Tau processes, started on first use with the project root as
+        # their cwd; the process-wide working directory is never changed
+        self.solver_pool = get_shared_pool(tau_command, workers=workers, cwd=self.project_root, timeout=30)
     
-    def test_single_file(self, filepath: str) -> TestResult:
-        """Test a single Tau file for satisfiability."""
+    def test_single_file(self, filepath: str, source: Optional[str] = None) -> TestResult:
+        """Test a single Tau file (or its already loaded source) for satisfiability."""
         start_time = time.time()
         
         try:
-            # Change to project root for tau command
-            original_cwd = os.getcwd()
-            os.chdir(self.project_root)
-            
-            # Run Tau on the file
-            result = subprocess.run(
-                [self.tau_command, filepath],
-                capture_output=True,
-                text=True,
-                timeout=30  # 30 second timeout
-            )
+            # Run Tau on the file; relative paths resolve against the project root
+            if source is None:
+                result = self.solver_pool.solve_file(filepath)
+            else:
+                result = self.solver_pool.solve(extract_commands(source))
+            execution_time = time.time() - start_time
             
-            os.chdir(original_cwd)
+            if result.timed_out:
+                return TestResult(
+                    file=filepath,
+                    success=False,
+                    satisfiable=False,
+                    error="Timeout after 30 seconds",
+                    execution_time=execution_time
+                )
             
             # Check if satisfiable
-            output = result.stdout
-            error = result.stderr
+            output = result.output
+            error = result.error
             
-            # Look for solution in output
+            # Look for solution in output; stderr noise alone is not a failure,
+            # only a solver that died without answering or reported an error
             satisfiable = "solution:" in output
-            success = result.returncode == 0 or satisfiable
+            solver_failed = (error is not None and not output) or "Error" in output
+            success = satisfiable or not solver_failed
             
             # Extract error if any
             error_msg = None
@@ -71,8 +85,6 @@ class ZKVMTestFramework:
                         error_msg = line.strip()
                         break
             
-            execution_time = time.time() - start_time
-            
             return TestResult(
                 file=filepath,
                 success=success,
@@ -81,15 +93,6 @@ class ZKVMTestFramework:
                 execution_time=execution_time
             )
             
-        except subprocess.TimeoutExpired:
-            execution_time = time.time() - start_time
-            return TestResult(
-                file=filepath,
-                success=False,
-                satisfiable=False,
-                error="Timeout after 30 seconds",
-                execution_time=execution_time
-            )
         except Exception as e:
             execution_time = time.time() - start_time
             return TestResult(
@@ -100,8 +103,9 @@ class ZKVMTestFramework:
                 execution_time=execution_time
             )
     
-    def test_module(self, module_name: str, files: List[str]) -> Dict[str, TestResult]:
-        """Test all files in a module."""
+    def test_module(self, module_name: str, files: List[str],
+                    sources: Optional[Dict[str, str]] = None) -> Dict[str, TestResult]:
+        """Test all files in a module; sources maps files to text already loaded."""
         module_results = {}
         
         print(f"\nTesting module: {module_name}")
@@ -109,7 +113,7 @@ class ZKVMTestFramework:
         
         for file in files:
             print(f"  Testing {file}...", end="", flush=True)
-            result = self.test_single_file(file)
+            result = self.test_single_file(file, (sources or {}).get(file))
             module_results[file] = result
             self.results.append(result)
             
@@ -132,20 +136,43 @@ class ZKVMTestFramework:
         output_dir = manifest['output_dir']
         
         # Test each module
-        for module_name, files in manifest['modules'].items():
-            # Convert relative paths to full paths
-            full_paths = [
-                os.path.join(output_dir, file) 
-                for file in files
-            ]
-            
-            module_results = self.test_module(module_name, full_paths)
-            all_results[module_name] = module_results
+        with self.open_bundle(manifest) as bundle:
+            for module_name, files in manifest['modules'].items():
+                # Convert relative paths to full paths
+                sources = {
+                    os.path.join(output_dir, file): bundle.read_text(file)
+                    for file in files
+                }
+                
+                module_results = self.test_module(module_name, list(sources), sources)
+                all_results[module_name] = module_results
         
         return all_results
     
-    def parallel_test_all(self, manifest_path: str, max_workers: int = 4) -> Dict[str, Dict[str, TestResult]]:
-        """Test all modules in parallel."""
+    def open_bundle(self, manifest: Dict) -> ConstraintBundle:
+        """Text of every file in a manifest, from one mapped bundle.
+        
+        Uses the archive TauCompiler packed when the manifest names one;
+        otherwise the listed files are packed in memory. Relative output
+        directories resolve against the project root, like the solver's cwd.
+        """
+        root = Path(self.project_root) / manifest['output_dir']
+        names = [file for files in manifest['modules'].values() for file in files]
+        if manifest.get('archive'):
+            return open_bundle(root, names, archive=manifest['archive'])
+        return open_bundle(root, names)
+    
+    def parallel_test_all(self, manifest_path: str, max_workers: int = 4,
+                          mode: str = "thread") -> Dict[str, Dict[str, TestResult]]:
+        """Test all modules in parallel.
+        
+        mode="thread" shares this framework's solver pool between threads;
+        mode="process" runs each file in a worker process with its own
+        framework and solver, for high worker counts on many-core machines.
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown parallel mode: {mode}")
+        
         # Load manifest
         with open(manifest_path, 'r') as f:
             manifest = json.load(f)
@@ -153,26 +180,39 @@ class ZKVMTestFramework:
         all_results = {}
         output_dir = manifest['output_dir']
         
-        print(f"\nRunning parallel tests with {max_workers} workers...")
+        print(f"\nRunning parallel tests with {max_workers} {mode} workers...")
         
-        # Collect all test tasks
+        # Collect all test tasks, reading every file's text from one bundle
         test_tasks = []
-        for module_name, files in manifest['modules'].items():
-            for file in files:
-                full_path = os.path.join(output_dir, file)
-                test_tasks.append((module_name, file, full_path))
+        with self.open_bundle(manifest) as bundle:
+            for module_name, files in manifest['modules'].items():
+                for file in files:
+                    full_path = os.path.join(output_dir, file)
+                    test_tasks.append((module_name, file, full_path, bundle.read_text(file)))
         
         # Run tests in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if mode == "process":
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_test_worker,
+                initargs=(self.tau_command, self.project_root)
+            )
+            test_file = _test_file_in_worker
+        else:
+            self.solver_pool.ensure_capacity(max_workers)
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+            test_file = self.test_single_file
+        
+        with executor:
             # Submit all tasks
             future_to_task = {
-                executor.submit(self.test_single_file, task[2]): task
+                executor.submit(test_file, task[2], task[3]): task
                 for task in test_tasks
             }
             
             # Process results as they complete
             for future in concurrent.futures.as_completed(future_to_task):
-                module_name, file, full_path = future_to_task[future]
+                module_name, file, full_path, _ = future_to_task[future]
                 result = future.result()
                 
                 # Store result
@@ -263,6 +303,16 @@ class ZKVMTestFramework:
             f.write(report)
         print(f"\nReport saved to: {filepath}")
 
+# Per-process framework for parallel_test_all(mode="process")
+_worker_framework: Optional[ZKVMTestFramework] = None
+
+def _init_test_worker(tau_command: str, project_root: str):
+    global _worker_framework
+    _worker_framework = ZKVMTestFramework(tau_command, project_root=project_root, workers=1)
+
+def _test_file_in_worker(filepath: str, source: Optional[str] = None) -> TestResult:
+    return _worker_framework.test_single_file(filepath, source)
+
 def main():
     """Run comprehensive zkVM tests."""
     print("TauFoldZKVM Test Framework")
@@ -4,10 +4,15 @@ Distributed Proving Shard Specification for TauFoldZKVM
 Implements proof sharding for parallel proving with market incentives.
 """
 
+import os
+import sys
 from typing import List, Tuple, Dict
 from dataclasses import dataclass
 from enum import Enum
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "compiler"))
+from constraint_ir import Conjunction, assign, conj, disj, negate, pins, var, xor
+
 class ShardType(Enum):
     """Types of proof shards."""
     TIME_BASED = "time"      # Split by execution steps
@@ -28,144 +33,155 @@ class DistributedProvingSpec:
     """Specification for distributed proving system."""
     
     def __init__(self):
-        self.output_dir = "."
+        self.output_dir = os.path.dirname(os.path.abspath(__file__))
     
     def generate_shard_structure(self) -> str:
         """Generate Tau constraints for proof shard structure."""
-        content = """# Proof Shard Structure
+        header = """# Proof Shard Structure
 # Each shard proves a portion of execution trace
 
 # Shard 0: Steps 0-3
-solve shard0_id0=0 && shard0_id1=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("shard0_id", [0, 0]))
         
         # Start and end steps (2-bit for demo)
-        content += """start0_0=0 && start0_1=0 && end0_0=1 && end0_1=1 && """
+        solve.extend(pins("start0_", [0, 0]) + pins("end0_", [1, 1]))
         
         # Memory range this shard can access
-        content += """mem_start0=0 && mem_start1=0 && mem_end0=1 && mem_end1=1 && """
+        solve.extend(pins("mem_start", [0, 0]) + pins("mem_end", [1, 1]))
         
         # Shard commitment (simplified)
-        content += """commit0_0=1 && commit0_1=0 && commit0_2=1 && commit0_3=1 && """
+        solve.extend(pins("commit0_", [1, 0, 1, 1]))
         
         # Shard 1: Steps 4-7
-        content += """shard1_id0=1 && shard1_id1=0 && """
-        content += """start1_0=0 && start1_1=0 && end1_0=1 && end1_1=1 && """
-        content += """commit1_0=0 && commit1_1=1 && commit1_2=0 && commit1_3=1 && """
+        solve.extend(pins("shard1_id", [1, 0]))
+        solve.extend(pins("start1_", [0, 0]) + pins("end1_", [1, 1]))
+        solve.extend(pins("commit1_", [0, 1, 0, 1]))
         
         # Verify shards don't overlap
-        content += """no_overlap=((end0_0+1)|(end0_1+1)|start1_0|start1_1) && """
+        solve.add(assign("no_overlap", disj(negate(var("end0_0")), negate(var("end0_1")),
+                                            var("start1_0"), var("start1_1"))))
         
         # Both shards valid
-        content += """valid=(commit0_0&commit1_1&no_overlap)"""
+        solve.add(assign("valid", conj(var("commit0_0"), var("commit1_1"), var("no_overlap"))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_proof_request(self) -> str:
         """Generate proof request specification."""
-        content = """# Proof Request Specification
+        header = """# Proof Request Specification
 # Defines work to be proven and rewards
 
 # Program hash (using RC hash)
-solve prog0=1 && prog1=0 && prog2=1 && prog3=1 && prog4=0 && prog5=1 && prog6=0 && prog7=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("prog", [1, 0, 1, 1, 0, 1, 0, 0]))
         
         # Input commitment
-        content += """input0=0 && input1=1 && input2=0 && input3=1 && input4=1 && input5=0 && input6=1 && input7=0 && """
+        solve.extend(pins("input", [0, 1, 0, 1, 1, 0, 1, 0]))
         
         # Execution parameters
-        content += """max_steps0=0 && max_steps1=0 && max_steps2=0 && max_steps3=1 && """  # max_steps = 8
+        solve.extend(pins("max_steps", [0, 0, 0, 1]))  # max_steps = 8
         
         # Reward amount (8-bit)
-        content += """reward0=0 && reward1=0 && reward2=1 && reward3=0 && reward4=0 && reward5=1 && reward6=1 && reward7=0 && """
+        solve.extend(pins("reward", [0, 0, 1, 0, 0, 1, 1, 0]))
         
         # Request ID (hash of above)
-        content += """req_id0=(prog0+input0+max_steps0+reward0) && """
-        content += """req_id1=(prog1+input1+max_steps1+reward1) && """
-        content += """req_id2=(prog2+input2+max_steps2+reward2) && """
-        content += """req_id3=(prog3+input3+max_steps3+reward3) && """
+        for i in range(4):
+            solve.add(assign(f"req_id{i}", xor(var(f"prog{i}"), var(f"input{i}"),
+                                               var(f"max_steps{i}"), var(f"reward{i}"))))
         
         # Valid request check
-        content += """valid=(prog0|prog2|prog3)&(input1|input3|input5)&max_steps3&(reward2|reward5|reward6)"""
+        solve.add(assign("valid", conj(disj(var("prog0"), var("prog2"), var("prog3")),
+                                       disj(var("input1"), var("input3"), var("input5")),
+                                       var("max_steps3"),
+                                       disj(var("reward2"), var("reward5"), var("reward6")))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_shard_assignment(self) -> str:
         """Generate shard assignment to provers."""
-        content = """# Shard Assignment Protocol
+        header = """# Shard Assignment Protocol
 # Assigns shards to provers based on commitment
 
 # Prover addresses (4-bit)
-solve prover0_0=1 && prover0_1=0 && prover0_2=0 && prover0_3=1 && """
-        content += """prover1_0=0 && prover1_1=1 && prover1_2=1 && prover1_3=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("prover0_", [1, 0, 0, 1]))
+        solve.extend(pins("prover1_", [0, 1, 1, 0]))
         
         # Shard commitments (from provers)
-        content += """commit0=1 && commit1=0 && commit2=1 && commit3=0 && """
+        solve.extend(pins("commit", [1, 0, 1, 0]))
         
         # Assignment based on lowest commitment (simplified auction)
-        content += """assign0=((commit0+1)&commit1) && """  # Prover 0 gets shard if commit0 < commit1
-        content += """assign1=(commit0&(commit1+1)) && """  # Prover 1 gets shard if commit1 < commit0
+        commit0, commit1 = var("commit0"), var("commit1")
+        solve.add(assign("assign0", conj(negate(commit0), commit1)))  # Prover 0 gets shard if commit0 < commit1
+        solve.add(assign("assign1", conj(commit0, negate(commit1))))  # Prover 1 gets shard if commit1 < commit0
         
         # Verify assignment
-        content += """valid=(assign0+assign1)"""  # Exactly one prover assigned
+        solve.add(assign("valid", xor(var("assign0"), var("assign1"))))  # Exactly one prover assigned
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_aggregation_tree(self) -> str:
         """Generate aggregation tree for combining shard proofs."""
-        content = """# Proof Aggregation Tree
+        header = """# Proof Aggregation Tree
 # Combines shard proofs via binary tree folding
 
 # Level 0: 4 shard proofs (2-bit identifiers)
-solve proof00=1 && proof01=0 && proof10=0 && proof11=1 && proof20=1 && proof21=1 && proof30=0 && proof31=0 && """
+"""
+        solve = Conjunction()
+        for proof, bits in enumerate(([1, 0], [0, 1], [1, 1], [0, 0])):
+            solve.extend(pins(f"proof{proof}", bits))
         
         # Level 1: Fold pairs
-        content += """fold01_0=(proof00+proof10) && fold01_1=(proof01+proof11) && """
-        content += """fold23_0=(proof20+proof30) && fold23_1=(proof21+proof31) && """
+        for left, right in ((0, 1), (2, 3)):
+            for i in range(2):
+                solve.add(assign(f"fold{left}{right}_{i}", xor(var(f"proof{left}{i}"), var(f"proof{right}{i}"))))
         
         # Level 2: Final fold
-        content += """root0=(fold01_0+fold23_0) && root1=(fold01_1+fold23_1) && """
+        for i in range(2):
+            solve.add(assign(f"root{i}", xor(var(f"fold01_{i}"), var(f"fold23_{i}"))))
         
         # Verify tree structure
-        content += """level1_valid=(fold01_0|fold01_1)&(fold23_0|fold23_1) && """
-        content += """root_valid=(root0+root1) && """
+        solve.add(assign("level1_valid", conj(disj(var("fold01_0"), var("fold01_1")),
+                                              disj(var("fold23_0"), var("fold23_1")))))
+        solve.add(assign("root_valid", xor(var("root0"), var("root1"))))
         
-        content += """valid=(level1_valid&root_valid)"""
+        solve.add(assign("valid", conj(var("level1_valid"), var("root_valid"))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_verification_market(self) -> str:
         """Generate verification market constraints."""
-        content = """# Verification Market
+        header = """# Verification Market
 # Anyone can verify proofs and claim rewards for finding errors
 
 # Submitted proof (4-bit)
-solve proof0=1 && proof1=0 && proof2=1 && proof3=1 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("proof", [1, 0, 1, 1]))
         
         # Expected result
-        content += """expected0=0 && expected1=1 && expected2=1 && expected3=0 && """
+        solve.extend(pins("expected", [0, 1, 1, 0]))
         
         # Verifier checks proof
-        content += """check0=(proof0+expected0) && """
-        content += """check1=(proof1+expected1) && """
-        content += """check2=(proof2+expected2) && """
-        content += """check3=(proof3+expected3) && """
+        for i in range(4):
+            solve.add(assign(f"check{i}", xor(var(f"proof{i}"), var(f"expected{i}"))))
         
         # Is proof valid?
-        content += """all_match=((check0+1)&(check1+1)&(check2+1)&(check3+1)) && """
+        solve.add(assign("all_match", conj(*(negate(var(f"check{i}")) for i in range(4)))))
         
         # Slash if invalid
-        content += """slash=(all_match+1) && """
+        solve.add(assign("slash", negate(var("all_match"))))
         
         # Reward if valid verification
-        content += """reward=slash && """
+        solve.add(assign("reward", var("slash")))
         
-        content += """result=(slash&reward)"""
+        solve.add(assign("result", conj(var("slash"), var("reward"))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_incentive_model(self) -> str:
         """Generate incentive model documentation."""
@@ -328,7 +344,7 @@ The distributed proving system splits zkVM execution proofs into shards that can
         files = self.generate_all_distributed_files()
         
         for filename, content in files:
-            with open(filename, 'w') as f:
+            with open(os.path.join(self.output_dir, filename), 'w') as f:
                 f.write(content)
             print(f"Generated {filename}")
 
@@ -5,8 +5,12 @@ Implements folding with noise vectors for high-degree gates.
 """
 
 import os
+import sys
 from typing import List, Tuple, Dict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "compiler"))
+from constraint_ir import Conjunction, assign, conj, disj, negate, pins, var, xor
+
 class ProtoStarFolder:
     """
     ProtoStar folding scheme implementation.
@@ -14,11 +18,11 @@ class ProtoStarFolder:
     """
     
     def __init__(self):
-        self.output_dir = "."
+        self.output_dir = os.path.dirname(os.path.abspath(__file__))
         
     def generate_instance_structure(self) -> str:
         """Generate Tau constraints for ProtoStar instance structure."""
-        content = """# ProtoStar Instance Structure
+        header = """# ProtoStar Instance Structure
 # Instance = (C, r, u, E) where:
 # C: commitments (using RC hash)
 # r: challenges
@@ -27,113 +31,129 @@ class ProtoStarFolder:
 
 # For 8-bit demonstration
 # Instance 1: Simple computation witness
-solve c10=1 && c11=0 && c12=1 && c13=1 && c14=0 && c15=0 && c16=1 && c17=0 && r10=1 && r11=1 && r12=0 && r13=1 && r14=0 && r15=0 && r16=0 && r17=0 && u10=0 && u11=0 && u12=0 && u13=1 && u14=0 && u15=0 && u16=0 && u17=0 && e10=0 && e11=0 && e12=0 && e13=0 && e14=0 && e15=0 && e16=0 && e17=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("c1", [1, 0, 1, 1, 0, 0, 1, 0]))
+        solve.extend(pins("r1", [1, 1, 0, 1, 0, 0, 0, 0]))
+        solve.extend(pins("u1", [0, 0, 0, 1, 0, 0, 0, 0]))
+        solve.extend(pins("e1", [0] * 8))
         
         # Instance 2
-        content += """c20=0 && c21=1 && c22=1 && c23=0 && c24=1 && c25=0 && c26=0 && c27=1 && r20=0 && r21=1 && r22=1 && r23=0 && r24=1 && r25=0 && r26=0 && r27=0 && u20=0 && u21=1 && u22=0 && u23=0 && u24=0 && u25=0 && u26=0 && u27=0 && e20=0 && e21=0 && e22=0 && e23=0 && e24=0 && e25=0 && e26=0 && e27=0 && """
+        solve.extend(pins("c2", [0, 1, 1, 0, 1, 0, 0, 1]))
+        solve.extend(pins("r2", [0, 1, 1, 0, 1, 0, 0, 0]))
+        solve.extend(pins("u2", [0, 1, 0, 0, 0, 0, 0, 0]))
+        solve.extend(pins("e2", [0] * 8))
         
         # Folding challenge beta
-        content += """beta0=1 && beta1=0 && beta2=1 && beta3=0 && beta4=0 && beta5=0 && beta6=0 && beta7=0 && """
+        solve.extend(pins("beta", [1, 0, 1, 0, 0, 0, 0, 0]))
+        beta = var("beta0")
         
         # Compute folded instance
         # C_fold = C1 + beta * C2 (in binary field, this is XOR when beta bit is 1)
-        for i in range(8):
-            content += f"cf{i}=(c1{i}+((beta0&c2{i}))) && "
-        
         # r_fold = concat(r1, r2, beta) - simplified to XOR for demo
-        for i in range(8):
-            content += f"rf{i}=(r1{i}+(r2{i}&beta0)) && "
-        
         # u_fold = u1 + beta * u2
-        for i in range(8):
-            content += f"uf{i}=(u1{i}+(u2{i}&beta0)) && "
-        
         # E_fold includes cross terms - simplified for demo
-        for i in range(8):
-            content += f"ef{i}=(e1{i}+(e2{i}&beta0)) && "
+        for field in ("c", "r", "u", "e"):
+            for i in range(8):
+                solve.add(assign(f"{field}f{i}", xor(var(f"{field}1{i}"), conj(beta, var(f"{field}2{i}")))))
         
         # Verify folding is valid (simplified check)
-        content += "valid=(cf0|cf1|cf2|cf3|cf4|cf5|cf6|cf7)"
+        solve.add(assign("valid", disj(*(var(f"cf{i}") for i in range(8)))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_noise_vector_handling(self) -> str:
         """Generate constraints for noise vector evolution."""
-        content = """# Noise Vector Evolution in ProtoStar
+        header = """# Noise Vector Evolution in ProtoStar
 # Shows how noise accumulates through folding
 
 # Initial instances have zero noise
-solve e10=0 && e11=0 && e12=0 && e13=0 && e20=0 && e21=0 && e22=0 && e23=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("e1", [0] * 4))
+        solve.extend(pins("e2", [0] * 4))
         
         # After first fold, noise appears from cross terms
-        content += """cross0=1 && cross1=0 && cross2=1 && cross3=1 && """
+        solve.extend(pins("cross", [1, 0, 1, 1]))
         
         # Noise after fold: E' = E1 + beta*(cross) + beta^2*E2
         # In binary field, beta^2 = beta for beta in {0,1}
-        content += """beta=1 && """
-        content += """ef0=(e10+(cross0&beta)+(e20&beta)) && """
-        content += """ef1=(e11+(cross1&beta)+(e21&beta)) && """
-        content += """ef2=(e12+(cross2&beta)+(e22&beta)) && """
-        content += """ef3=(e13+(cross3&beta)+(e23&beta)) && """
+        solve.add(assign("beta", 1))
+        beta = var("beta")
+        for i in range(4):
+            solve.add(assign(f"ef{i}", xor(var(f"e1{i}"), conj(var(f"cross{i}"), beta), conj(var(f"e2{i}"), beta))))
         
         # Check noise is properly tracked
-        content += """noise_present=(ef0|ef1|ef2|ef3)"""
+        solve.add(assign("noise_present", disj(*(var(f"ef{i}") for i in range(4)))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_high_degree_gate(self) -> str:
         """Generate example of high-degree gate handling."""
-        content = """# High-Degree Gate in ProtoStar
+        header = """# High-Degree Gate in ProtoStar
 # Degree-3 constraint: a*b*c = d
 
 # Inputs
-solve a0=1 && a1=0 && a2=1 && a3=0 && b0=1 && b1=1 && b2=0 && b3=0 && c0=0 && c1=1 && c2=1 && c3=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("a", [1, 0, 1, 0]))
+        solve.extend(pins("b", [1, 1, 0, 0]))
+        solve.extend(pins("c", [0, 1, 1, 0]))
         
         # Compute a*b*c bit by bit (degree 3)
         # In binary field, multiplication is AND
-        content += """d0=(a0&b0&c0) && d1=(a1&b1&c1) && d2=(a2&b2&c2) && d3=(a3&b3&c3) && """
+        for i in range(4):
+            solve.add(assign(f"d{i}", conj(var(f"a{i}"), var(f"b{i}"), var(f"c{i}"))))
         
         # Expected result
-        content += """expected0=0 && expected1=0 && expected2=0 && expected3=0 && """
+        solve.extend(pins("expected", [0] * 4))
         
-        # Check result
-        content += """t0=(d0+expected0+1) && t1=(d1+expected1+1) && t2=(d2+expected2+1) && t3=(d3+expected3+1) && """
-        content += """valid=(t0&t1&t2&t3)"""
+        # Check result: t = d XNOR expected
+        for i in range(4):
+            solve.add(assign(f"t{i}", negate(xor(var(f"d{i}"), var(f"expected{i}")))))
+        solve.add(assign("valid", conj(*(var(f"t{i}") for i in range(4)))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_lookup_folding_integration(self) -> str:
         """Show how lookups integrate with folding."""
-        content = """# Lookup Integration with ProtoStar Folding
+        header = """# Lookup Integration with ProtoStar Folding
 # Demonstrates O(d) lookup efficiency
 
 # Lookup table index (4-bit for demo)
-solve idx0=1 && idx1=1 && idx2=0 && idx3=1 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("idx", [1, 1, 0, 1]))
         
         # Lookup result (precomputed)
-        content += """lut0=0 && lut1=1 && lut2=1 && lut3=0 && """
+        solve.extend(pins("lut", [0, 1, 1, 0]))
         
         # Folding parameters
-        content += """beta0=1 && beta1=0 && beta2=0 && beta3=0 && """
+        solve.extend(pins("beta", [1, 0, 0, 0]))
+        
+        def matches(index: str, lut: str, pattern: List[int]) -> List:
+            # pattern[i] = 1: index and table bit i must agree; 0: they must differ
+            checks = []
+            for i, same in enumerate(pattern):
+                differ = xor(var(f"{index}{i}"), var(f"{lut}{i}"))
+                checks.append(negate(differ) if same else differ)
+            return checks
         
         # In ProtoStar, lookups add O(d) constraints
         # Here d=1 for simple lookup
-        content += """lookup_constraint=((idx0+lut0+1)&(idx1+lut1)&(idx2+lut2)&(idx3+lut3+1)) && """
+        solve.add(assign("lookup_constraint", conj(*matches("idx", "lut", [1, 0, 0, 1]))))
         
         # Fold with another lookup
-        content += """idx20=0 && idx21=1 && idx22=1 && idx23=0 && """
-        content += """lut20=1 && lut21=0 && lut22=0 && lut23=1 && """
+        solve.extend(pins("idx2", [0, 1, 1, 0]))
+        solve.extend(pins("lut2", [1, 0, 0, 1]))
         
         # Folded lookup constraint
-        content += """folded_lookup=(lookup_constraint|(beta0&((idx20+lut20)&(idx21+lut21+1)&(idx22+lut22+1)&(idx23+lut23)))) && """
+        solve.add(assign("folded_lookup", disj(var("lookup_constraint"),
+                                               conj(var("beta0"), *matches("idx2", "lut2", [0, 1, 1, 0])))))
         
-        content += """result=folded_lookup"""
+        solve.add(assign("result", var("folded_lookup")))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_all_folding_demos(self) -> List[Tuple[str, str]]:
         """Generate all ProtoStar folding demonstrations."""
@@ -4,9 +4,14 @@ TauFoldZKVM Instruction Set Architecture
 8 instructions mixing lookups and direct constraints.
 """
 
+import os
+import sys
 from enum import IntEnum
 from typing import List, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "compiler"))
+from constraint_ir import Conjunction, assign, conj, disj, negate, pins, var, xor
+
 class Opcode(IntEnum):
     """8-instruction ISA opcodes."""
     LUT8  = 0b000  # 8-bit lookup operation
@@ -22,180 +27,199 @@ class ISAGenerator:
     """Generate Tau constraints for ISA instructions."""
     
     def __init__(self):
-        self.output_dir = "."
+        self.output_dir = os.path.dirname(os.path.abspath(__file__))
     
     def generate_instruction_decoder(self) -> str:
         """Generate instruction decoder constraints."""
-        content = """# Instruction Decoder
+        header = """# Instruction Decoder
 # Decodes 3-bit opcode and sets execution flags
 
-solve op0=0 && op1=0 && op2=0 && """
-        
-        # Decode each instruction
-        content += """is_lut8=((op0+1)&(op1+1)&(op2+1)) && """
-        content += """is_lut16=(op0&(op1+1)&(op2+1)) && """
-        content += """is_fold=((op0+1)&op1&(op2+1)) && """
-        content += """is_comm=(op0&op1&(op2+1)) && """
-        content += """is_load=((op0+1)&(op1+1)&op2) && """
-        content += """is_store=(op0&(op1+1)&op2) && """
-        content += """is_cond=((op0+1)&op1&op2) && """
-        content += """is_halt=(op0&op1&op2) && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("op", [0, 0, 0]))
+        
+        # Decode each instruction: opcode bit i selects op_i or its complement
+        flags = []
+        for opcode in Opcode:
+            flag = f"is_{opcode.name.lower()}"
+            solve.add(assign(flag, conj(*(var(f"op{i}") if (opcode >> i) & 1 else negate(var(f"op{i}"))
+                                          for i in range(3)))))
+            flags.append(var(flag))
         
         # Exactly one instruction active
-        content += """valid=(is_lut8+(is_lut16|is_fold|is_comm|is_load|is_store|is_cond|is_halt))"""
+        solve.add(assign("valid", xor(flags[0], disj(*flags[1:]))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_lut8_instruction(self) -> str:
         """Generate LUT8 instruction execution."""
-        content = """# LUT8 Instruction: 8-bit lookup operation
+        header = """# LUT8 Instruction: 8-bit lookup operation
 # Format: LUT8 rd, rs1, rs2, table_id
 
 # Instruction fields
-solve op0=0 && op1=0 && op2=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("op", [0, 0, 0]))
         
         # Register values (4-bit for demo)
-        content += """rs10=1 && rs11=0 && rs12=1 && rs13=1 && """
-        content += """rs20=0 && rs21=1 && rs22=1 && rs23=0 && """
+        solve.extend(pins("rs1", [1, 0, 1, 1]))
+        solve.extend(pins("rs2", [0, 1, 1, 0]))
         
         # Table ID selects operation (2-bit: 00=AND, 01=OR, 10=XOR, 11=ADD)
-        content += """tid0=0 && tid1=0 && """
+        solve.extend(pins("tid", [0, 0]))
         
         # Decode table selection
-        content += """use_and=((tid0+1)&(tid1+1)) && """
-        content += """use_or=(tid0&(tid1+1)) && """
-        content += """use_xor=((tid0+1)&tid1) && """
-        content += """use_add=(tid0&tid1) && """
+        tid0, tid1 = var("tid0"), var("tid1")
+        solve.add(assign("use_and", conj(negate(tid0), negate(tid1))))
+        solve.add(assign("use_or", conj(tid0, negate(tid1))))
+        solve.add(assign("use_xor", conj(negate(tid0), tid1)))
+        solve.add(assign("use_add", conj(tid0, tid1)))
         
         # Perform operation (simplified 4-bit)
         for i in range(4):
-            content += f"and{i}=(rs1{i}&rs2{i}) && "
-            content += f"or{i}=(rs1{i}|rs2{i}) && "
-            content += f"xor{i}=(rs1{i}+rs2{i}) && "
+            rs1, rs2 = var(f"rs1{i}"), var(f"rs2{i}")
+            solve.add(assign(f"and{i}", conj(rs1, rs2)))
+            solve.add(assign(f"or{i}", disj(rs1, rs2)))
+            solve.add(assign(f"xor{i}", xor(rs1, rs2)))
         
         # Select result based on table ID
         for i in range(4):
-            content += f"rd{i}=((use_and&and{i})|(use_or&or{i})|(use_xor&xor{i})) && "
+            solve.add(assign(f"rd{i}", disj(*(conj(var(f"use_{op}"), var(f"{op}{i}")) for op in ("and", "or", "xor")))))
         
         # Verify result
-        content += """result=(rd0|rd1|rd2|rd3)"""
+        solve.add(assign("result", disj(*(var(f"rd{i}") for i in range(4)))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_fold_instruction(self) -> str:
         """Generate FOLD instruction for ProtoStar folding."""
-        content = """# FOLD Instruction: Fold current instance with accumulator
+        header = """# FOLD Instruction: Fold current instance with accumulator
 # Updates accumulator with folded result
 
 # Current instance (4-bit demo)
-solve curr0=1 && curr1=0 && curr2=1 && curr3=0 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("curr", [1, 0, 1, 0]))
         
         # Accumulator
-        content += """acc0=0 && acc1=1 && acc2=0 && acc3=1 && """
+        solve.extend(pins("acc", [0, 1, 0, 1]))
         
         # Folding challenge
-        content += """beta0=1 && beta1=0 && beta2=0 && beta3=0 && """
+        solve.extend(pins("beta", [1, 0, 0, 0]))
+        beta = var("beta0")
         
         # Fold: acc' = acc + beta * curr
         for i in range(4):
-            content += f"new_acc{i}=(acc{i}+(beta0&curr{i})) && "
+            solve.add(assign(f"new_acc{i}", xor(var(f"acc{i}"), conj(beta, var(f"curr{i}")))))
         
         # Noise vector update (simplified)
-        content += """noise0=0 && noise1=0 && noise2=1 && noise3=0 && """
+        solve.extend(pins("noise", [0, 0, 1, 0]))
         
         # Update noise
         for i in range(4):
-            content += f"new_noise{i}=(noise{i}|(beta0&curr{i}&acc{i})) && "
+            solve.add(assign(f"new_noise{i}", disj(var(f"noise{i}"), conj(beta, var(f"curr{i}"), var(f"acc{i}")))))
         
         # Check folding valid
-        content += """valid=((new_acc0|new_acc1|new_acc2|new_acc3)&(new_noise2))"""
+        solve.add(assign("valid", conj(disj(*(var(f"new_acc{i}") for i in range(4))), var("new_noise2"))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_comm_instruction(self) -> str:
         """Generate COMM instruction for commitments."""
-        content = """# COMM Instruction: Commit to value using RC hash
+        header = """# COMM Instruction: Commit to value using RC hash
 # Produces commitment = RC_hash(value || randomness)
 
 # Value to commit (8-bit)
-solve val0=1 && val1=0 && val2=1 && val3=1 && val4=0 && val5=1 && val6=0 && val7=1 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("val", [1, 0, 1, 1, 0, 1, 0, 1]))
         
         # Randomness
-        content += """r0=0 && r1=1 && r2=0 && r3=1 && r4=1 && r5=0 && r6=1 && r7=0 && """
+        solve.extend(pins("r", [0, 1, 0, 1, 1, 0, 1, 0]))
         
         # Simplified RC permutation (just XOR for demo)
         # Real implementation would use full RC hash
         for i in range(8):
-            content += f"h{i}=(val{i}+r{i}) && "
+            solve.add(assign(f"h{i}", xor(var(f"val{i}"), var(f"r{i}"))))
         
         # Output commitment
-        content += """comm=(h0|h1|h2|h3|h4|h5|h6|h7)"""
+        solve.add(assign("comm", disj(*(var(f"h{i}") for i in range(8)))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_memory_instructions(self) -> str:
         """Generate LOAD/STORE memory instructions."""
-        content = """# Memory Instructions: LOAD and STORE
+        header = """# Memory Instructions: LOAD and STORE
 # Simple memory model with 4 locations (2-bit address)
 
 # Memory state (4 locations x 4 bits each)
-solve m00=1 && m01=0 && m02=1 && m03=0 && m10=0 && m11=1 && m12=0 && m13=1 && m20=1 && m21=1 && m22=0 && m23=0 && m30=0 && m31=0 && m32=1 && m33=1 && """
+"""
+        solve = Conjunction()
+        for location, bits in enumerate(([1, 0, 1, 0], [0, 1, 0, 1], [1, 1, 0, 0], [0, 0, 1, 1])):
+            solve.extend(pins(f"m{location}", bits))
         
         # LOAD instruction: addr=10 (location 2)
-        content += """addr0=0 && addr1=1 && """
-        content += """is_load=1 && is_store=0 && """
+        solve.extend(pins("addr", [0, 1]))
+        solve.add(assign("is_load", 1))
+        solve.add(assign("is_store", 0))
         
         # Address decode
-        content += """sel0=((addr0+1)&(addr1+1)) && """
-        content += """sel1=(addr0&(addr1+1)) && """
-        content += """sel2=((addr0+1)&addr1) && """
-        content += """sel3=(addr0&addr1) && """
+        addr0, addr1 = var("addr0"), var("addr1")
+        solve.add(assign("sel0", conj(negate(addr0), negate(addr1))))
+        solve.add(assign("sel1", conj(addr0, negate(addr1))))
+        solve.add(assign("sel2", conj(negate(addr0), addr1)))
+        solve.add(assign("sel3", conj(addr0, addr1)))
         
         # Load value from selected location
         for i in range(4):
-            content += f"loaded{i}=((sel0&m0{i})|(sel1&m1{i})|(sel2&m2{i})|(sel3&m3{i})) && "
+            solve.add(assign(f"loaded{i}", disj(*(conj(var(f"sel{location}"), var(f"m{location}{i}"))
+                                                   for location in range(4)))))
         
         # Verify loaded value matches memory location 2
-        content += """result=(loaded0&loaded1&(loaded2+1)&(loaded3+1))"""
+        solve.add(assign("result", conj(var("loaded0"), var("loaded1"),
+                                        negate(var("loaded2")), negate(var("loaded3")))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_execution_trace(self) -> str:
         """Generate a simple execution trace."""
-        content = """# Execution Trace: 3 instruction sequence
+        header = """# Execution Trace: 3 instruction sequence
 # ADD, STORE, HALT
 
 # Instruction 0: LUT8 (ADD) r1 = r2 + r3
-solve pc0=0 && pc1=0 && op0_0=0 && op0_1=0 && op0_2=0 && tid0=1 && tid1=1 && """
+"""
+        solve = Conjunction()
+        solve.extend(pins("pc", [0, 0]) + pins("op0_", [0, 0, 0]) + pins("tid", [1, 1]))
         
         # Registers before
-        content += """r20=1 && r21=0 && r22=1 && r23=0 && """  # r2 = 5
-        content += """r30=0 && r31=1 && r32=0 && r33=0 && """  # r3 = 2
+        solve.extend(pins("r2", [1, 0, 1, 0]))  # r2 = 5
+        solve.extend(pins("r3", [0, 1, 0, 0]))  # r3 = 2
         
         # ADD result
-        content += """r10=1 && r11=1 && r12=1 && r13=0 && """  # r1 = 7
+        solve.extend(pins("r1", [1, 1, 1, 0]))  # r1 = 7
         
         # Instruction 1: STORE r1 to addr 0
-        content += """pc0_next=1 && pc1_next=0 && op1_0=1 && op1_1=0 && op1_2=1 && """
-        content += """addr0=0 && addr1=0 && """
+        solve.add(assign("pc0_next", 1))
+        solve.add(assign("pc1_next", 0))
+        solve.extend(pins("op1_", [1, 0, 1]))
+        solve.extend(pins("addr", [0, 0]))
         
         # Memory after store
-        content += """m00_new=1 && m01_new=1 && m02_new=1 && m03_new=0 && """
+        for i, bit in enumerate([1, 1, 1, 0]):
+            solve.add(assign(f"m0{i}_new", bit))
         
         # Instruction 2: HALT
-        content += """pc0_final=0 && pc1_final=1 && op2_0=1 && op2_1=1 && op2_2=1 && """
-        content += """halted=1 && """
+        solve.add(assign("pc0_final", 0))
+        solve.add(assign("pc1_final", 1))
+        solve.extend(pins("op2_", [1, 1, 1]))
+        solve.add(assign("halted", 1))
         
         # Verify execution
-        content += """valid=(r10&r11&r12&(r13+1)&m00_new&m01_new&m02_new&(m03_new+1)&halted)"""
+        solve.add(assign("valid", conj(var("r10"), var("r11"), var("r12"), negate(var("r13")),
+                                       var("m00_new"), var("m01_new"), var("m02_new"), negate(var("m03_new")),
+                                       var("halted"))))
         
-        content += "\n\nquit"
-        return content
+        return header + f"solve {solve.render()}\n\nquit"
     
     def generate_all_isa_files(self) -> List[Tuple[str, str]]:
         """Generate all ISA demonstration files."""
@@ -300,7 +324,7 @@ HALT
         files = self.generate_all_isa_files()
         
         for filename, content in files:
-            with open(filename, 'w') as f:
+            with open(os.path.join(self.output_dir, filename), 'w') as f:
                 f.write(content)
             print(f"Generated {filename}")
 
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Native Evaluator for Generated Tau Constraints
+
+The generated .tau files are conjunctions of bit equations such as
+
+    solve a0=0 && b0=1 && s0=(a0+b0) && c0=(a0&b0) && cout0=c0
+
+over `&` (and), `|` (or), `+` (xor), postfix `'` (complement) and the
+constants 0/1. The grammar is the constraint IR's (compiler/constraint_ir.py):
+compile_tau() parses a file's solve expression once with it into interned
+expression nodes, then lowers them to a topologically ordered bit-op
+program: the first equation for a variable defines it, later ones become
+checks, and variables never defined are free inputs. The program is then
+emitted as a Python function over integers used as bitsets, so one pass
+evaluates a concrete assignment or, bit-parallel, every assignment of up
+to MAX_FREE_VARIABLES free inputs at once.
+
+Anything outside this fragment raises ConstraintSyntaxError so callers can
+fall back to the Tau solver, which stays authoritative.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# One grammar for the emitter and the evaluator: parse with the constraint IR
+COMPILER_DIR = str(Path(__file__).resolve().parent.parent / "compiler")
+if COMPILER_DIR not in sys.path:
+    sys.path.append(COMPILER_DIR)
+
+from constraint_ir import ConstraintSyntaxError, Node, parse_equation, parse_expression, var
+
+MAX_FREE_VARIABLES = 16
+
+# IR operators and their Python bitwise equivalent
+BITWISE = {"|": "|", "+": "^", "&": "&"}
+
+# Expressions are constraint IR nodes: "var", "const" or an n-ary operator over terms
+Expression = Node
+
+
+@dataclass
+class CompiledConstraints:
+    """A solve expression lowered to definitions, checks and free inputs"""
+    definitions: List[Tuple[str, Expression]]   # Topologically ordered
+    checks: List[Tuple[Expression, Expression]]
+    free_variables: List[str]
+    source: str = ""
+    _function: Optional[Callable[..., int]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self._function is None:
+            self._function = self._compile()
+
+    def _compile(self) -> Callable[..., int]:
+        """Emit the bit-op program as a Python function of (mask, *free_variables)"""
+        slots = {}
+        for name in self.free_variables:
+            slots[name] = f"v{len(slots)}"
+        for name, _ in self.definitions:
+            slots[name] = f"v{len(slots)}"
+
+        def emit(expression: Expression) -> str:
+            if expression.op == "var":
+                return slots[expression.name]
+            if expression.op == "const":
+                return "mask" if expression.value else "0"
+            operator = f" {BITWISE[expression.op]} "
+            return "(" + operator.join(emit(term) for term in expression.terms) + ")"
+
+        parameters = ", ".join(["mask"] + [slots[name] for name in self.free_variables])
+        lines = [f"def program({parameters}):"]
+        for name, expression in self.definitions:
+            lines.append(f"    {slots[name]} = {emit(expression)}")
+        lines.append("    ok = mask")
+        for left, right in self.checks:
+            lines.append(f"    ok &= ~({emit(left)} ^ {emit(right)})")
+        lines.append("    return ok & mask")
+
+        namespace: Dict[str, object] = {}
+        exec(compile("\n".join(lines), "<tau constraints>", "exec"), namespace)
+        return namespace["program"]
+
+    def evaluate(self, assignment: Optional[Dict[str, int]] = None) -> bool:
+        """Check one concrete assignment of the free variables"""
+        assignment = assignment or {}
+        missing = [name for name in self.free_variables if name not in assignment]
+        if missing:
+            raise KeyError(f"Unassigned free variables: {', '.join(missing)}")
+        values = [assignment[name] & 1 for name in self.free_variables]
+        return bool(self._function(1, *values))
+
+    def satisfiable(self, max_free_variables: int = MAX_FREE_VARIABLES) -> Optional[bool]:
+        """Decide satisfiability by bit-parallel enumeration of the free variables.
+
+        Returns None when there are too many free variables to enumerate.
+        """
+        count = len(self.free_variables)
+        if count > max_free_variables:
+            return None
+
+        # Bit k of every value is assignment number k: variable i takes bit i of k
+        width = 1 << count
+        mask = (1 << width) - 1
+        patterns = []
+        for i in range(count):
+            block = ((1 << (1 << i)) - 1) << (1 << i)          # 2^i ones above 2^i zeros
+            pattern = 0
+            period = 1 << (i + 1)
+            for start in range(0, width, period):
+                pattern |= block << start
+            patterns.append(pattern)
+        return bool(self._function(mask, *patterns))
+
+
+def extract_solve(tau_source: str) -> str:
+    """The expression of the single solve command in a .tau file"""
+    expressions = [
+        line.strip()[len("solve"):].strip()
+        for line in tau_source.splitlines()
+        if line.strip().startswith("solve ")
+    ]
+    if len(expressions) != 1:
+        raise ConstraintSyntaxError(f"Expected one solve command, found {len(expressions)}")
+    return expressions[0]
+
+
+def compile_expression(expression: str) -> CompiledConstraints:
+    """Compile a solve expression (without the `solve` keyword)"""
+    equations = [parse_equation(conjunct.strip()) for conjunct in expression.split("&&")]
+
+    # The first equation naming a variable on its left defines it
+    definitions: Dict[str, Expression] = {}
+    checks = []
+    for left, right in equations:
+        if left.op == "var" and left.name not in definitions:
+            definitions[left.name] = right
+        else:
+            checks.append((left, right))
+
+    # Kahn's algorithm over definition dependencies
+    dependents: Dict[str, List[str]] = {name: [] for name in definitions}
+    pending: Dict[str, int] = {}
+    for name, expression in definitions.items():
+        needed = expression.variables & definitions.keys()
+        pending[name] = len(needed)
+        for dependency in needed:
+            dependents[dependency].append(name)
+
+    ready = [name for name, count in pending.items() if count == 0]
+    ordered = []
+    while ready:
+        name = ready.pop()
+        ordered.append(name)
+        for dependent in dependents[name]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    # Definitions on a cycle cannot be computed; they become free and checked
+    cyclic = [name for name in definitions if pending[name] > 0]
+    for name in cyclic:
+        checks.append((var(name), definitions.pop(name)))
+
+    used = set()
+    for expression in definitions.values():
+        used |= expression.variables
+    for left, right in checks:
+        used |= left.variables | right.variables
+    free_variables = sorted(used - set(ordered))
+
+    return CompiledConstraints(
+        definitions=[(name, definitions[name]) for name in ordered],
+        checks=checks,
+        free_variables=free_variables,
+        source=expression
+    )
+
+
+def compile_tau(source: Union[str, Path]) -> CompiledConstraints:
+    """Compile the solve command of a .tau file (path or file text)"""
+    if isinstance(source, Path):
+        source = source.read_text()
+    return compile_expression(extract_solve(source))
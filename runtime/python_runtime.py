@@ -7,13 +7,23 @@ Every operation is verified against Tau constraints, making runtime errors impos
 """
 
 import os
-import subprocess
+import sys
 import json
-from typing import List, Dict, Any, Optional, Union, Tuple
+import hashlib
+import queue
+import sqlite3
+import threading
+from array import array
+from collections import deque, OrderedDict
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Iterator, NamedTuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import partial
 from pathlib import Path
 
+from constraint_evaluator import CompiledConstraints, ConstraintSyntaxError, compile_tau
+from trace_format import TraceFileWriter
+
 class VMError(Exception):
     """Base exception for VM errors"""
     pass
@@ -98,6 +108,212 @@ class Instruction(Enum):
     RAND = "rand"
     ID = "id"
 
+# Opcode numbering for the compact program form (enum declaration order)
+OPCODE_TO_INSTRUCTION: List[Instruction] = list(Instruction)
+INSTRUCTION_TO_OPCODE: Dict[Instruction, int] = {
+    instruction: opcode for opcode, instruction in enumerate(OPCODE_TO_INSTRUCTION)
+}
+
+# Instructions whose operand is a program address rather than a data immediate
+BRANCH_INSTRUCTIONS = frozenset({Instruction.JMP, Instruction.JZ, Instruction.JNZ, Instruction.CALL})
+
+# Marker for "no operand" in the operand columns. Operands may be any signed
+# 64-bit value (negative immediates included); the most negative one is reserved.
+NO_OPERAND = -(1 << 63)
+
+@dataclass
+class CompactProgram:
+    """Pre-decoded program as parallel arrays indexed by program counter.
+    
+    opcodes holds one byte per instruction, immediates the data operand of
+    PUSH/LOAD/STORE-style instructions and targets the address operand of
+    branches; slots without an operand hold NO_OPERAND.
+    """
+    
+    opcodes: array = field(default_factory=lambda: array('B'))
+    immediates: array = field(default_factory=lambda: array('q'))
+    targets: array = field(default_factory=lambda: array('q'))
+    
+    @classmethod
+    def from_instructions(cls, program: List[Tuple[Instruction, List[int]]]) -> 'CompactProgram':
+        """Lower (Instruction, args) pairs into the array-backed form"""
+        compact = cls()
+        
+        for pc, (instruction, args) in enumerate(program):
+            operand = args[0] if args else NO_OPERAND
+            if args and not (isinstance(operand, int) and NO_OPERAND < operand < 1 << 63):
+                raise VMError(f"Operand of {instruction.value.upper()} at {pc} must be an int in "
+                              f"[-2**63 + 1, 2**63 - 1] (signed 64-bit, -2**63 is reserved): {operand!r}")
+            
+            compact.opcodes.append(INSTRUCTION_TO_OPCODE[instruction])
+            if instruction in BRANCH_INSTRUCTIONS:
+                compact.immediates.append(NO_OPERAND)
+                compact.targets.append(operand)
+            else:
+                compact.immediates.append(operand)
+                compact.targets.append(NO_OPERAND)
+        
+        return compact
+    
+    def __len__(self) -> int:
+        return len(self.opcodes)
+    
+    def __getitem__(self, pc: int) -> Tuple[Instruction, List[int]]:
+        """Decode a single slot back into (Instruction, args)"""
+        instruction = OPCODE_TO_INSTRUCTION[self.opcodes[pc]]
+        operand = self.operand(pc)
+        return instruction, [] if operand == NO_OPERAND else [operand]
+    
+    def operand(self, pc: int) -> int:
+        """Operand of the slot at pc (immediate or branch target)"""
+        target = self.targets[pc]
+        return target if target != NO_OPERAND else self.immediates[pc]
+
+# Instructions that end a basic block (control leaves the straight-line path)
+BLOCK_TERMINATORS = BRANCH_INSTRUCTIONS | {Instruction.RET, Instruction.HALT}
+
+def find_basic_blocks(program: CompactProgram) -> List[Tuple[int, int]]:
+    """Split a program into basic blocks as (start, end) pc ranges, end exclusive"""
+    size = len(program)
+    leaders = {0} if size else set()
+    
+    for pc in range(size):
+        instruction = OPCODE_TO_INSTRUCTION[program.opcodes[pc]]
+        if instruction in BLOCK_TERMINATORS and pc + 1 < size:
+            leaders.add(pc + 1)
+        target = program.targets[pc]
+        if 0 <= target < size:
+            leaders.add(target)
+    
+    starts = sorted(leaders)
+    return list(zip(starts, starts[1:] + [size]))
+
+@dataclass
+class Superinstruction:
+    """A fused run of instructions executed as one dispatch.
+    
+    run executes the whole sequence; it is only taken when the stack holds at
+    least min_depth values, which guarantees none of the fused instructions
+    can fail part-way. steps holds one (pc, opcode, operand, pc_after,
+    stack_delta) template per fused instruction so the execution trace is
+    identical to single-stepping; pc_after is None for a trailing branch.
+    """
+    
+    name: str
+    length: int
+    min_depth: int
+    run: Callable[[Any], None]
+    steps: List[Tuple[int, int, int, Optional[int], int]]
+
+def _fused_push_add(vm, k: int):
+    stack = vm.state.stack
+    stack[-1] = (stack[-1] + k) & 0xFFFFFFFF
+    vm.state.program_counter += 2
+
+def _fused_push_sub(vm, k: int):
+    stack = vm.state.stack
+    stack[-1] = (stack[-1] - k) & 0xFFFFFFFF
+    vm.state.program_counter += 2
+
+def _fused_dup_jz(vm, target: int):
+    state = vm.state
+    state.program_counter = target if state.stack[-1] == 0 else state.program_counter + 2
+
+def _fused_dup_jnz(vm, target: int):
+    state = vm.state
+    state.program_counter = target if state.stack[-1] != 0 else state.program_counter + 2
+
+def _fused_push_eq_jz(vm, k: int, target: int):
+    state = vm.state
+    state.program_counter = target if state.stack.pop() != k else state.program_counter + 3
+
+def _fused_push_eq_jnz(vm, k: int, target: int):
+    state = vm.state
+    state.program_counter = target if state.stack.pop() == k else state.program_counter + 3
+
+def _fused_dup_push_eq_jz(vm, k: int, target: int):
+    state = vm.state
+    state.program_counter = target if state.stack[-1] != k else state.program_counter + 4
+
+def _fused_dup_push_eq_jnz(vm, k: int, target: int):
+    state = vm.state
+    state.program_counter = target if state.stack[-1] == k else state.program_counter + 4
+
+# Fusion patterns: instruction sequence -> (kernel, minimum stack depth).
+# Kernels receive the PUSH immediate as k and the branch target as target.
+SUPERINSTRUCTION_PATTERNS: Dict[Tuple[Instruction, ...], Tuple[Callable, int]] = {
+    (Instruction.DUP, Instruction.PUSH, Instruction.EQ, Instruction.JZ): (_fused_dup_push_eq_jz, 1),
+    (Instruction.DUP, Instruction.PUSH, Instruction.EQ, Instruction.JNZ): (_fused_dup_push_eq_jnz, 1),
+    (Instruction.PUSH, Instruction.EQ, Instruction.JZ): (_fused_push_eq_jz, 1),
+    (Instruction.PUSH, Instruction.EQ, Instruction.JNZ): (_fused_push_eq_jnz, 1),
+    (Instruction.PUSH, Instruction.ADD): (_fused_push_add, 1),
+    (Instruction.PUSH, Instruction.SUB): (_fused_push_sub, 1),
+    (Instruction.DUP, Instruction.JZ): (_fused_dup_jz, 1),
+    (Instruction.DUP, Instruction.JNZ): (_fused_dup_jnz, 1),
+}
+
+# Net stack effect of the instructions that can appear in a pattern
+_STACK_DELTAS = {
+    Instruction.PUSH: 1, Instruction.DUP: 1, Instruction.ADD: -1, Instruction.SUB: -1,
+    Instruction.EQ: -1, Instruction.JZ: -1, Instruction.JNZ: -1,
+}
+
+def compile_superinstructions(program: CompactProgram) -> List[Optional[Superinstruction]]:
+    """Fuse common sequences inside each basic block.
+    
+    Returns a list parallel to the program with a Superinstruction at the pc
+    where each fused run starts and None elsewhere. Every pc keeps its
+    ordinary handler, so jumps into the middle of a fused run stay correct.
+    """
+    fused: List[Optional[Superinstruction]] = [None] * len(program)
+    patterns = sorted(SUPERINSTRUCTION_PATTERNS, key=len, reverse=True)
+    
+    for start, end in find_basic_blocks(program):
+        pc = start
+        while pc < end:
+            for pattern in patterns:
+                superinstruction = _match_pattern(program, pc, end, pattern)
+                if superinstruction:
+                    fused[pc] = superinstruction
+                    pc += superinstruction.length
+                    break
+            else:
+                pc += 1
+    
+    return fused
+
+def _match_pattern(program: CompactProgram, pc: int, end: int,
+                   pattern: Tuple[Instruction, ...]) -> Optional[Superinstruction]:
+    """Build a Superinstruction if pattern occurs at pc within the block ending at end"""
+    if pc + len(pattern) > end:
+        return None
+    
+    kernel_args = {}
+    steps = []
+    for offset, expected in enumerate(pattern):
+        slot = pc + offset
+        if OPCODE_TO_INSTRUCTION[program.opcodes[slot]] != expected:
+            return None
+        
+        operand = program.operand(slot)
+        if expected == Instruction.PUSH or expected in BRANCH_INSTRUCTIONS:
+            # Missing operands must raise from the ordinary handler
+            if operand == NO_OPERAND:
+                return None
+            kernel_args["target" if expected in BRANCH_INSTRUCTIONS else "k"] = operand
+        
+        pc_after = None if expected in BRANCH_INSTRUCTIONS else slot + 1
+        steps.append((slot, program.opcodes[slot], operand, pc_after, _STACK_DELTAS[expected]))
+    
+    kernel, min_depth = SUPERINSTRUCTION_PATTERNS[pattern]
+    return Superinstruction(
+        name="_".join(instruction.value for instruction in pattern),
+        length=len(pattern),
+        min_depth=min_depth,
+        run=partial(kernel, **kernel_args),
+        steps=steps
+    )
+
 @dataclass
 class VMState:
     """Complete VM state with all registers and memory"""
@@ -114,7 +330,7 @@ class VMState:
     
     # Program state
     program_counter: int = 0
-    program: List[Tuple[Instruction, List[int]]] = field(default_factory=list)
+    program: CompactProgram = field(default_factory=CompactProgram)
     
     # Execution state
     halted: bool = False
@@ -128,27 +344,359 @@ class VMState:
     input_buffer: List[int] = field(default_factory=list)
     output_buffer: List[int] = field(default_factory=list)
 
-class TauValidator:
-    """Interface to Tau constraint validation system"""
+class TraceStep(NamedTuple):
+    """One executed instruction as seen by a trace sink"""
+    cycle: int
+    pc: int
+    opcode: int
+    operand: int
+    next_pc: int
+    stack_depth: int
+    register_deltas: Tuple[Tuple[int, int], ...]
+
+class TraceSink:
+    """Receives one record per executed instruction.
+    
+    register_deltas holds (register, new_value) pairs for registers written
+    by the instruction, so sinks never see full register snapshots.
+    """
+    
+    def record(self, cycle: int, pc: int, opcode: int, operand: int, next_pc: int,
+               stack_depth: int, register_deltas: Tuple[Tuple[int, int], ...]):
+        raise NotImplementedError
+    
+    def flush(self):
+        """Push any buffered records to their destination"""
+        pass
+    
+    def close(self):
+        self.flush()
+    
+    def entries(self) -> List[Any]:
+        """Records to report as the "trace" field of an execution result"""
+        return []
     
-    def __init__(self, tau_path: str = None):
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ListTraceSink(TraceSink):
+    """Unbounded list of per-cycle dicts (the original execution trace format)"""
+    
+    def __init__(self, registers: List[int]):
+        self.trace: List[Dict[str, Any]] = []
+        self._registers = list(registers)
+    
+    def record(self, cycle, pc, opcode, operand, next_pc, stack_depth, register_deltas):
+        for register, value in register_deltas:
+            self._registers[register] = value
+        self.trace.append({
+            "cycle": cycle,
+            "pc": next_pc,
+            "instruction": OPCODE_TO_INSTRUCTION[opcode].value,
+            "args": [] if operand == NO_OPERAND else [operand],
+            "stack_size": stack_depth,
+            "registers": self._registers.copy()
+        })
+    
+    def entries(self) -> List[Dict[str, Any]]:
+        return self.trace
+
+class RingTraceSink(TraceSink):
+    """Keeps only the most recent capacity steps"""
+    
+    def __init__(self, capacity: int = 1024):
+        self.steps = deque(maxlen=capacity)
+    
+    def record(self, cycle, pc, opcode, operand, next_pc, stack_depth, register_deltas):
+        self.steps.append(TraceStep(cycle, pc, opcode, operand, next_pc, stack_depth, register_deltas))
+    
+    def entries(self) -> List[Dict[str, Any]]:
+        return [step._asdict() for step in self.steps]
+
+class _StepBufferSink(TraceSink):
+    """Collects TraceSteps between generator yields"""
+    
+    def __init__(self):
+        self.steps: List[TraceStep] = []
+    
+    def record(self, cycle, pc, opcode, operand, next_pc, stack_depth, register_deltas):
+        self.steps.append(TraceStep(cycle, pc, opcode, operand, next_pc, stack_depth, register_deltas))
+    
+    def drain(self) -> List[TraceStep]:
+        steps, self.steps = self.steps, []
+        return steps
+
+def create_trace_sink(mode: str, registers: Optional[List[int]] = None,
+                      capacity: int = 1024, path: Union[str, Path, None] = None) -> Optional[TraceSink]:
+    """Build a trace sink for one of the modes "off", "list", "ring", "columnar" or "file" """
+    if mode == "off":
+        return None
+    if mode == "list":
+        return ListTraceSink(registers or [0] * 16)
+    if mode == "ring":
+        return RingTraceSink(capacity)
+    if mode in ("columnar", "file"):
+        # Both names write the columnar trace file of trace_format
+        if path is None:
+            raise VMError(f"{mode.capitalize()} trace requires an output path")
+        return TraceFileWriter(path)
+    raise VMError(f"Unknown trace mode: {mode}")
+
+class ValidationCache:
+    """Memoized constraint-check verdicts with LRU eviction.
+    
+    Keys are (instruction, constraint file hash, nibble input tuple). With
+    a path, verdicts are also persisted to a sqlite database so repeated
+    programs skip the solver across runs; the in-memory LRU stays the
+    first lookup.
+    """
+    
+    def __init__(self, max_entries: int = 65536, path: Union[str, Path, None] = None):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, bool]" = OrderedDict()
+        self._db = None
+        self._lock = threading.Lock()  # Shared with AsyncValidator worker threads
+        
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, verdict INTEGER NOT NULL)"
+            )
+            self._db.commit()
+    
+    @staticmethod
+    def make_key(instruction: Instruction, file_hash: str, nibble_inputs: Tuple[int, ...]) -> Tuple:
+        return (instruction.value, file_hash, tuple(nibble_inputs))
+    
+    def get(self, key: Tuple) -> Optional[bool]:
+        """Cached verdict for key, or None on a miss"""
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return verdict
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT verdict FROM verdicts WHERE key = ?", (self._db_key(key),)
+                ).fetchone()
+                if row is not None:
+                    verdict = bool(row[0])
+                    self._remember(key, verdict)
+                    self.hits += 1
+                    return verdict
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: Tuple, verdict: bool):
+        """Record a definitive solver verdict"""
+        with self._lock:
+            self._remember(key, verdict)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, verdict) VALUES (?, ?)",
+                    (self._db_key(key), int(verdict))
+                )
+                self._db.commit()
+    
+    def _remember(self, key: Tuple, verdict: bool):
+        self._entries[key] = verdict
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    @staticmethod
+    def _db_key(key: Tuple) -> str:
+        instruction, file_hash, nibble_inputs = key
+        return f"{instruction}:{file_hash}:{','.join(map(str, nibble_inputs))}"
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+def _use_compiler_modules():
+    """Make compiler/ (solver pool, constraint bundles) importable from the runtime"""
+    compiler_dir = str(Path(__file__).resolve().parent.parent / "compiler")
+    if compiler_dir not in sys.path:
+        sys.path.append(compiler_dir)
+
+class ConstraintComponent(NamedTuple):
+    """One generated .tau component, hashed and parsed when the registry loads"""
+    name: str                                  # Path relative to the constraint root
+    sha256: str
+    text: str
+    compiled: Optional[CompiledConstraints]    # None: needs the Tau solver
+    
+    @classmethod
+    def from_text(cls, name: str, text: str) -> "ConstraintComponent":
+        """Component of constraint text that did not come from a bundle"""
+        return cls(name, hashlib.sha256(text.encode()).hexdigest(), text, _compile_or_none(text))
+
+def _compile_or_none(text: str) -> Optional[CompiledConstraints]:
+    try:
+        return compile_tau(text)
+    except ConstraintSyntaxError:
+        return None
+
+class InstructionConstraints(NamedTuple):
+    """The components validating one instruction"""
+    nibbles: Dict[int, ConstraintComponent]
+    aggregator: Optional[ConstraintComponent]
+    components: List[ConstraintComponent]      # Every component, in name order
+
+class ConstraintRegistry:
+    """Constraint components of every instruction, loaded and parsed once.
+    
+    Read from the constraint bundle under root (or its .tau tree when there
+    is no bundle), so looking up an executed instruction's constraints
+    touches no files. Loading never writes: a missing or stale bundle is
+    packed in memory, and writing constraints.tauarch is the build's job.
+    """
+    
+    DEFAULT_ROOT = Path(__file__).resolve().parent.parent / "compiler" / "build" / "zkvm_100_percent"
+    
+    def __init__(self, instructions: Dict[Instruction, InstructionConstraints], root: Optional[Path] = None):
+        self.instructions = instructions
+        self.root = root
+    
+    @classmethod
+    def check_root(cls, root: Union[str, Path, None] = None) -> Path:
+        """The constraint root, resolved; raises VMError if it holds no components.
+        
+        A cheap check (a few stats, nothing parsed) for callers that load lazily.
+        """
+        root = Path(root) if root is not None else cls.DEFAULT_ROOT
+        if not root.is_dir():
+            raise VMError(f"Constraint root not found: {root}")
+        _use_compiler_modules()
+        from constraint_bundle import BUNDLE_FILE
+        if not (root / BUNDLE_FILE).exists() and not any(
+                next((root / instruction.value).glob("*.tau"), None) for instruction in Instruction):
+            raise VMError(f"No instruction constraints under {root}")
+        return root
+    
+    @classmethod
+    def load(cls, root: Union[str, Path, None] = None) -> "ConstraintRegistry":
+        """Registry of the build under root (default: compiler/build/zkvm_100_percent)"""
+        root = cls.check_root(root)
+        from constraint_bundle import open_bundle
+        with open_bundle(root, repack=False) as bundle:
+            registry = cls.from_bundle(bundle, root)
+        if not registry.instructions:
+            raise VMError(f"No instruction constraints under {root}")
+        return registry
+    
+    @classmethod
+    def from_bundle(cls, bundle, root: Optional[Path] = None) -> "ConstraintRegistry":
+        """Registry of a ConstraintBundle; components outside an instruction directory are ignored"""
+        compiled_by_hash: Dict[str, Optional[CompiledConstraints]] = {}
+        grouped: Dict[Instruction, List[Tuple[str, ConstraintComponent]]] = {}
+        for entry in bundle:
+            directory, _, filename = entry.name.rpartition("/")
+            try:
+                instruction = Instruction(directory)
+            except ValueError:
+                continue
+            
+            if entry.sha256 not in compiled_by_hash:
+                compiled_by_hash[entry.sha256] = _compile_or_none(entry.text)
+            component = ConstraintComponent(entry.name, entry.sha256, entry.text, compiled_by_hash[entry.sha256])
+            grouped.setdefault(instruction, []).append((filename, component))
+        
+        instructions = {}
+        for instruction, files in grouped.items():
+            nibbles = {}
+            aggregator = None
+            for filename, component in files:
+                stem = filename[:-len(".tau")]
+                prefix = f"{instruction.value}_nibble_"
+                if stem.startswith(prefix) and stem[len(prefix):].isdigit():
+                    nibbles[int(stem[len(prefix):])] = component
+                elif stem == f"{instruction.value}_aggregator":
+                    aggregator = component
+            instructions[instruction] = InstructionConstraints(
+                nibbles, aggregator, sorted((component for _, component in files), key=lambda c: c.name)
+            )
+        return cls(instructions, root)
+    
+    def get(self, instruction: Instruction) -> InstructionConstraints:
+        constraints = self.instructions.get(instruction)
+        if constraints is None:
+            raise VMError(f"Constraint files not found for {instruction.value}")
+        return constraints
+    
+    def __contains__(self, instruction: Instruction) -> bool:
+        return instruction in self.instructions
+    
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+class TauValidator:
+    """Interface to Tau constraint validation system
+    
+    Every instruction's constraints come from a ConstraintRegistry (of
+    constraint_root, or the default build directory). The root is checked at
+    construction; the registry is loaded on first use, after which validating
+    an executed instruction does no filesystem I/O.
+    """
+    
+    def __init__(self, tau_path: str = None, cache: Optional[ValidationCache] = None,
+                 cache_path: Union[str, Path, None] = None, solver_pool=None, native: bool = True,
+                 registry: Optional[ConstraintRegistry] = None,
+                 constraint_root: Union[str, Path, None] = None):
         self.tau_path = tau_path or "/Users/danax/projects/TauStandardLibrary/external_dependencies/run_tau.sh"
-        self.constraint_cache = {}
+        self.constraint_cache = cache or ValidationCache(path=cache_path)
+        self._solver_pool = solver_pool
+        
+        # In-process evaluation of the and/or/xor fragment; Tau decides everything else
+        self.native = native
+        self.native_checks = 0
+        
+        self._registry = registry
+        self._registry_lock = threading.Lock()
+        self.constraint_root = registry.root if registry else ConstraintRegistry.check_root(constraint_root)
+    
+    @property
+    def registry(self) -> ConstraintRegistry:
+        """Constraints of every instruction, loaded once on first access"""
+        if self._registry is None:
+            with self._registry_lock:
+                if self._registry is None:
+                    self._registry = ConstraintRegistry.load(self.constraint_root)
+        return self._registry
+    
+    @property
+    def solver_pool(self):
+        """Persistent Tau workers, shared by every validator using the same tau_path"""
+        if self._solver_pool is None:
+            _use_compiler_modules()
+            from tau_solver_pool import get_shared_pool
+            self._solver_pool = get_shared_pool([self.tau_path], workers=1, timeout=10)
+        return self._solver_pool
         
     def validate_operation(self, instruction: Instruction, inputs: List[int], outputs: List[int]) -> bool:
         """Validate an operation against its Tau constraints"""
         
-        # Map instruction to constraint files
-        constraint_dir = Path("../compiler/build/zkvm_100_percent") / instruction.value
-        
-        if not constraint_dir.exists():
-            raise VMError(f"Constraint files not found for {instruction.value}")
+        # Map instruction to its preloaded constraint components
+        constraints = self.registry.get(instruction)
         
         # For 32-bit operations, validate each nibble
         if self._is_32bit_operation(instruction):
-            return self._validate_32bit_operation(instruction, inputs, outputs, constraint_dir)
+            return self._validate_32bit_operation(instruction, inputs, outputs, constraints)
         else:
-            return self._validate_simple_operation(instruction, inputs, outputs, constraint_dir)
+            return self._validate_simple_operation(instruction, inputs, outputs, constraints)
     
     def _is_32bit_operation(self, instruction: Instruction) -> bool:
         """Check if instruction operates on 32-bit values"""
@@ -158,8 +706,8 @@ class TauValidator:
         
         return instruction in arithmetic_ops or instruction in bitwise_ops or instruction in comparison_ops
     
-    def _validate_32bit_operation(self, instruction: Instruction, inputs: List[int], outputs: List[int], 
-                                 constraint_dir: Path) -> bool:
+    def _validate_32bit_operation(self, instruction: Instruction, inputs: List[int], outputs: List[int],
+                                 constraints: InstructionConstraints) -> bool:
         """Validate 32-bit operation by checking all nibbles"""
         
         # Decompose inputs and outputs into nibbles
@@ -173,52 +721,67 @@ class TauValidator:
         
         # Validate each nibble component
         for i in range(8):  # 8 nibbles per 32-bit value
-            nibble_file = constraint_dir / f"{instruction.value}_nibble_{i}.tau"
-            if nibble_file.exists():
-                if not self._validate_constraint_file(nibble_file, input_nibbles, output_nibbles, i):
+            nibble_file = constraints.nibbles.get(i)
+            if nibble_file is not None:
+                nibble_inputs = tuple(input_nibbles[i::8]) + tuple(output_nibbles[i::8])
+                if not self._validate_cached(instruction, nibble_file, nibble_inputs,
+                                             input_nibbles, output_nibbles, i):
                     return False
         
         # Check aggregator if it exists
-        aggregator_file = constraint_dir / f"{instruction.value}_aggregator.tau"
-        if aggregator_file.exists():
-            return self._validate_constraint_file(aggregator_file, input_nibbles, output_nibbles)
+        aggregator_file = constraints.aggregator
+        if aggregator_file is not None:
+            return self._validate_cached(instruction, aggregator_file,
+                                         tuple(input_nibbles) + tuple(output_nibbles),
+                                         input_nibbles, output_nibbles)
             
         return True
     
     def _validate_simple_operation(self, instruction: Instruction, inputs: List[int], outputs: List[int],
-                                  constraint_dir: Path) -> bool:
+                                  constraints: InstructionConstraints) -> bool:
         """Validate simple operations like HALT, NOP"""
         
         # Find the constraint file
-        constraint_files = list(constraint_dir.glob("*.tau"))
+        constraint_files = constraints.components
         if not constraint_files:
             raise VMError(f"No constraint files found for {instruction.value}")
         
         # For simple operations, just check the first file
-        return self._validate_constraint_file(constraint_files[0], inputs, outputs)
-    
-    def _validate_constraint_file(self, tau_file: Path, inputs: List[int], outputs: List[int], 
-                                 nibble_index: int = None) -> bool:
-        """Validate specific constraint file with given inputs/outputs"""
+        return self._validate_cached(instruction, constraint_files[0], tuple(inputs) + tuple(outputs),
+                                     inputs, outputs)
+    
+    def _validate_cached(self, instruction: Instruction, component: ConstraintComponent,
+                         nibble_inputs: Tuple[int, ...], inputs: List[int], outputs: List[int],
+                         nibble_index: int = None) -> bool:
+        """Validate a registry component, consulting the verdict cache first"""
+        key = ValidationCache.make_key(instruction, component.sha256, nibble_inputs)
+        verdict = self.constraint_cache.get(key)
+        if verdict is None:
+            try:
+                verdict = self._solve(component)
+            except Exception as e:
+                # Solver failures are not verdicts, so they are never cached
+                print(f"Warning: Constraint validation failed for {component.name}: {e}")
+                return False  # Fail safe - if validation fails, reject operation
+            self.constraint_cache.put(key, verdict)
+        return verdict
+    
+    def _solve(self, component: ConstraintComponent) -> bool:
+        """Run the Tau satisfiability check; raises if the solver cannot run"""
+        if self.native and component.compiled:
+            verdict = component.compiled.satisfiable()
+            if verdict is not None:
+                self.native_checks += 1
+                return verdict
         
-        try:
-            # Run Tau satisfiability check
-            result = subprocess.run(
-                [self.tau_path, str(tau_file)],
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            
-            # Check if solution exists
-            if result.returncode == 0 and 'solution' in result.stdout:
-                return True
-            else:
-                return False
-                
-        except Exception as e:
-            print(f"Warning: Constraint validation failed for {tau_file}: {e}")
-            return False  # Fail safe - if validation fails, reject operation
+        _use_compiler_modules()
+        from tau_solver_pool import extract_commands
+        result = self.solver_pool.solve(extract_commands(component.text))
+        if result.timed_out or (result.error and not result.output):
+            raise VMError(f"Tau solver failed: {result.error}")
+        
+        # Check if solution exists
+        return result.satisfiable
     
     def _to_nibbles(self, value: int) -> List[int]:
         """Convert 32-bit value to list of 4-bit nibbles"""
@@ -227,17 +790,188 @@ class TauValidator:
             nibbles.append((value >> (4 * i)) & 0xF)
         return nibbles
 
+class AsyncValidator:
+    """Validates executed instructions off the interpreter thread.
+    
+    The interpreter submits (cycle, instruction, inputs, outputs) records
+    and keeps running. Worker threads take records in batches, check each
+    distinct (instruction, inputs, outputs) once and attach the verdict to
+    every cycle that produced it. submit() blocks while max_pending records
+    are queued, so the interpreter cannot run unboundedly ahead; join()
+    waits for the backlog and returns the violations in cycle order.
+    """
+    
+    def __init__(self, validator: TauValidator, max_pending: int = 1024, workers: int = 2,
+                 batch_size: int = 64):
+        self.validator = validator
+        self.max_pending = max_pending
+        self.workers = workers
+        self.batch_size = batch_size
+        self.submitted = 0
+        self.checked = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._verdicts: Dict[Tuple, bool] = {}
+        self._in_flight: Dict[Tuple, List[Tuple]] = {}
+        self._violations: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+    
+    def submit(self, cycle: int, instruction: Instruction, inputs: List[int], outputs: List[int]):
+        """Queue one executed instruction, blocking while the backlog is full"""
+        if not self._threads:
+            self._start()
+        self.submitted += 1
+        
+        key = (instruction, tuple(inputs), tuple(outputs))
+        verdict = self._verdicts.get(key)
+        if verdict is not None:
+            if not verdict:
+                with self._lock:
+                    self._violations.append(self._violation(cycle, instruction, inputs, outputs))
+            return
+        self._queue.put((cycle, instruction, inputs, outputs, key))
+    
+    def join(self) -> List[Dict[str, Any]]:
+        """Wait for all submitted records and return their violations, oldest first"""
+        if self._threads:
+            self._queue.join()
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+        
+        with self._lock:
+            violations = sorted(self._violations, key=lambda violation: violation["cycle"])
+            self._violations = []
+        return violations
+    
+    def _start(self):
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"tau-validator-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _worker(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                self._queue.task_done()
+                return
+            
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    # Leave the stop sentinel for this worker's next get()
+                    self._queue.task_done()
+                    self._queue.put(None)
+                    break
+                batch.append(record)
+            self._process(batch)
+    
+    def _process(self, batch: List[Tuple]):
+        """Resolve a batch, checking each distinct key once across all workers"""
+        to_check = []
+        resolved = 0
+        with self._lock:
+            for record in batch:
+                key = record[-1]
+                if key in self._verdicts:
+                    if not self._verdicts[key]:
+                        self._violations.append(self._violation(*record[:4]))
+                    resolved += 1
+                elif key in self._in_flight:
+                    self._in_flight[key].append(record)
+                else:
+                    self._in_flight[key] = [record]
+                    to_check.append(record)
+        
+        for _ in range(resolved):
+            self._queue.task_done()
+        
+        for cycle, instruction, inputs, outputs, key in to_check:
+            try:
+                verdict = self.validator.validate_operation(instruction, inputs, outputs)
+            except Exception as e:
+                print(f"Warning: Constraint validation error: {e}")
+                verdict = None
+            
+            with self._lock:
+                self.checked += 1
+                waiting = self._in_flight.pop(key)
+                if verdict is not None:
+                    self._verdicts[key] = verdict
+                if verdict is False:
+                    self._violations.extend(self._violation(*record[:4]) for record in waiting)
+            for _ in waiting:
+                self._queue.task_done()
+    
+    @staticmethod
+    def _violation(cycle: int, instruction: Instruction, inputs: List[int], outputs: List[int]) -> Dict[str, Any]:
+        return {
+            "cycle": cycle,
+            "instruction": instruction.value,
+            "inputs": inputs,
+            "outputs": outputs
+        }
+
 class TauFoldZKVM:
     """Complete TauFoldZKVM Runtime with mathematical guarantees"""
     
-    def __init__(self, validate_constraints: bool = True):
+    # Instructions whose handlers consume the slot's operand
+    _ARG_INSTRUCTIONS = frozenset({
+        Instruction.LOAD, Instruction.STORE, Instruction.MLOAD, Instruction.MSTORE,
+        Instruction.PUSH, Instruction.JMP, Instruction.JZ, Instruction.JNZ, Instruction.CALL
+    })
+    
+    def __init__(self, validate_constraints: bool = True, superinstructions: bool = True,
+                 trace: Union[str, TraceSink] = "list", trace_path: Union[str, Path, None] = None,
+                 validator: Optional[TauValidator] = None, validation: str = "sync",
+                 validation_backlog: int = 1024, constraint_root: Union[str, Path, None] = None):
         self.state = VMState()
-        self.validator = TauValidator() if validate_constraints else None
-        self.execution_trace = []
+        if validate_constraints:
+            # Checks the constraint root now; its constraints load on the first validated instruction
+            self.validator = validator or TauValidator(constraint_root=constraint_root)
+        else:
+            self.validator = None
         self.constraint_violations = []
         
+        # "async" checks constraints on background threads while the interpreter runs ahead
+        if validation not in ("sync", "async"):
+            raise VMError(f"Unknown validation mode: {validation}")
+        self.async_validator = None
+        if self.validator and validation == "async":
+            self.async_validator = AsyncValidator(self.validator, max_pending=validation_backlog)
+        
+        # Trace sink: a mode name for create_trace_sink or a TraceSink instance.
+        # A sink built from a mode name belongs to the VM and is closed by execute()
+        if isinstance(trace, str):
+            self.trace_sink = create_trace_sink(trace, registers=self.state.registers, path=trace_path)
+        else:
+            self.trace_sink = trace
+        self._owns_trace_sink = isinstance(trace, str)
+        self.execution_trace = self.trace_sink.trace if isinstance(self.trace_sink, ListTraceSink) else []
+        self._traced_registers = list(self.state.registers)
+        self._handlers = self._build_dispatch_table()
+        self._dispatch: List[Callable[["TauFoldZKVM"], None]] = []
+        
+        # Fused execution needs per-instruction validation off
+        self.use_superinstructions = superinstructions and self.validator is None
+        self._superinstructions: List[Optional[Superinstruction]] = []
+        
     def load_program(self, program: List[Tuple[str, List[int]]]):
-        """Load program into VM memory"""
+        """Load program into VM memory
+        
+        Operands are stored in signed 64-bit columns (CompactProgram), so each
+        must be an int from -2**63 + 1 to 2**63 - 1; -2**63 is reserved as
+        NO_OPERAND. Anything else raises VMError here, naming the instruction.
+        """
         parsed_program = []
         
         for inst_name, args in program:
@@ -247,12 +981,26 @@ class TauFoldZKVM:
             except ValueError:
                 raise VMError(f"Unknown instruction: {inst_name}")
         
-        self.state.program = parsed_program
+        program = CompactProgram.from_instructions(parsed_program)
+        self.state.program = program
+        self._dispatch = [
+            self._bind_handler(OPCODE_TO_INSTRUCTION[opcode], program.operand(pc))
+            for pc, opcode in enumerate(program.opcodes)
+        ]
+        if self.use_superinstructions:
+            self._superinstructions = compile_superinstructions(program)
+        else:
+            self._superinstructions = [None] * len(program)
         self.state.program_counter = 0
         self.state.halted = False
         
     def execute(self, max_cycles: int = 10000) -> Dict[str, Any]:
-        """Execute loaded program with constraint validation"""
+        """Execute loaded program with constraint validation
+        
+        On return a trace sink the VM created (trace="file" or "columnar")
+        is closed, leaving the trace file compacted to its exact size; a
+        sink passed in as an instance is only flushed, and the caller closes it.
+        """
         
         execution_result = {
             "success": False,
@@ -264,157 +1012,184 @@ class TauFoldZKVM:
         }
         
         try:
-            while not self.state.halted and self.state.cycle_count < max_cycles:
-                if self.state.program_counter >= len(self.state.program):
-                    break
-                
-                # Fetch instruction
-                instruction, args = self.state.program[self.state.program_counter]
-                
-                # Execute with constraint validation
-                self._execute_instruction(instruction, args)
-                
-                # Record execution trace
-                self.execution_trace.append({
-                    "cycle": self.state.cycle_count,
-                    "pc": self.state.program_counter,
-                    "instruction": instruction.value,
-                    "args": args,
-                    "stack_size": len(self.state.stack),
-                    "registers": self.state.registers.copy()
-                })
-                
-                self.state.cycle_count += 1
+            self._run(max_cycles)
+            self._join_validation()
                 
             execution_result["success"] = True
             execution_result["cycles"] = self.state.cycle_count
             execution_result["final_state"] = self._serialize_state()
-            execution_result["trace"] = self.execution_trace
+            execution_result["trace"] = self.trace_sink.entries() if self.trace_sink else []
             execution_result["constraint_violations"] = self.constraint_violations
             
         except Exception as e:
             execution_result["error"] = str(e)
             execution_result["final_state"] = self._serialize_state()
+        
+        finally:
+            self._join_validation()
+            if self.trace_sink:
+                if self._owns_trace_sink:
+                    self.trace_sink.close()
+                else:
+                    self.trace_sink.flush()
             
         return execution_result
     
+    def _join_validation(self):
+        """Wait for queued asynchronous checks and collect their violations"""
+        if self.async_validator:
+            self.constraint_violations.extend(self.async_validator.join())
+    
+    def iter_trace(self, max_cycles: int = 10000, chunk_cycles: int = 1024) -> Iterator[TraceStep]:
+        """Execute lazily, yielding one TraceStep per executed instruction.
+        
+        The interpreter runs chunk_cycles at a time between yields; any
+        configured trace sink is bypassed while the generator is active.
+        Execution errors propagate to the consumer.
+        """
+        buffer = _StepBufferSink()
+        previous_sink, self.trace_sink = self.trace_sink, buffer
+        
+        try:
+            while self.state.cycle_count < max_cycles:
+                start_cycle = self.state.cycle_count
+                self._run(min(max_cycles, start_cycle + chunk_cycles))
+                yield from buffer.drain()
+                
+                if self.state.cycle_count == start_cycle or self.state.halted:
+                    break
+        finally:
+            self.trace_sink = previous_sink
+            self._join_validation()
+    
+    def _run(self, max_cycles: int):
+        """Interpreter loop: run until HALT, end of program or max_cycles"""
+        state = self.state
+        program = state.program
+        opcodes = program.opcodes
+        immediates = program.immediates
+        targets = program.targets
+        registers = state.registers
+        dispatch = self._dispatch
+        fused = self._superinstructions
+        validator = self.validator
+        record = self.trace_sink.record if self.trace_sink else None
+        
+        while not state.halted and state.cycle_count < max_cycles:
+            pc = state.program_counter
+            if pc >= len(opcodes):
+                break
+            
+            # Take a fused run when it cannot fail part-way or overrun max_cycles
+            superinstruction = fused[pc]
+            if (superinstruction is not None
+                    and len(state.stack) >= superinstruction.min_depth
+                    and state.cycle_count + superinstruction.length <= max_cycles):
+                self._run_superinstruction(superinstruction, record)
+                continue
+            
+            # Execute with constraint validation
+            dispatch[pc](self)
+            if validator:
+                self._validate_step(OPCODE_TO_INSTRUCTION[opcodes[pc]])
+            
+            # Record execution trace
+            if record:
+                register_deltas = self._register_deltas() if registers != self._traced_registers else ()
+                operand = targets[pc] if targets[pc] != NO_OPERAND else immediates[pc]
+                record(state.cycle_count, pc, opcodes[pc], operand, state.program_counter,
+                       len(state.stack), register_deltas)
+            
+            state.cycle_count += 1
+    
+    def _register_deltas(self) -> Tuple[Tuple[int, int], ...]:
+        """Registers written since the last traced step, as (register, value) pairs"""
+        traced = self._traced_registers
+        deltas = tuple(
+            (register, value) for register, value in enumerate(self.state.registers)
+            if traced[register] != value
+        )
+        for register, value in deltas:
+            traced[register] = value
+        return deltas
+    
+    def _run_superinstruction(self, superinstruction: Superinstruction,
+                              record: Optional[Callable[..., None]]):
+        """Execute a fused run and record one trace entry per fused instruction"""
+        state = self.state
+        
+        if not record:
+            superinstruction.run(self)
+            state.cycle_count += superinstruction.length
+            return
+        
+        stack_depth = len(state.stack)
+        superinstruction.run(self)
+        
+        # Fused instructions never write registers, so register deltas are empty
+        for pc, opcode, operand, pc_after, stack_delta in superinstruction.steps:
+            stack_depth += stack_delta
+            next_pc = state.program_counter if pc_after is None else pc_after
+            record(state.cycle_count, pc, opcode, operand, next_pc, stack_depth, ())
+            state.cycle_count += 1
+    
     def _execute_instruction(self, instruction: Instruction, args: List[int]):
         """Execute single instruction with constraint validation"""
         
-        # Store state before execution for validation
-        inputs = []
+        handler = self._handlers.get(instruction)
+        if handler is None:
+            raise VMError(f"Unimplemented instruction: {instruction.value}")
         
-        # Execute instruction based on type
-        if instruction == Instruction.ADD:
-            self._execute_add()
-        elif instruction == Instruction.SUB:
-            self._execute_sub()
-        elif instruction == Instruction.MUL:
-            self._execute_mul()
-        elif instruction == Instruction.DIV:
-            self._execute_div()
-        elif instruction == Instruction.MOD:
-            self._execute_mod()
-        elif instruction == Instruction.AND:
-            self._execute_and()
-        elif instruction == Instruction.OR:
-            self._execute_or()
-        elif instruction == Instruction.XOR:
-            self._execute_xor()
-        elif instruction == Instruction.NOT:
-            self._execute_not()
-        elif instruction == Instruction.SHL:
-            self._execute_shl()
-        elif instruction == Instruction.SHR:
-            self._execute_shr()
-        elif instruction == Instruction.EQ:
-            self._execute_eq()
-        elif instruction == Instruction.NEQ:
-            self._execute_neq()
-        elif instruction == Instruction.LT:
-            self._execute_lt()
-        elif instruction == Instruction.GT:
-            self._execute_gt()
-        elif instruction == Instruction.LTE:
-            self._execute_lte()
-        elif instruction == Instruction.GTE:
-            self._execute_gte()
-        elif instruction == Instruction.LOAD:
-            self._execute_load(args)
-        elif instruction == Instruction.STORE:
-            self._execute_store(args)
-        elif instruction == Instruction.MLOAD:
-            self._execute_mload(args)
-        elif instruction == Instruction.MSTORE:
-            self._execute_mstore(args)
-        elif instruction == Instruction.PUSH:
-            self._execute_push(args)
-        elif instruction == Instruction.POP:
-            self._execute_pop()
-        elif instruction == Instruction.DUP:
-            self._execute_dup()
-        elif instruction == Instruction.SWAP:
-            self._execute_swap()
-        elif instruction == Instruction.JMP:
-            self._execute_jmp(args)
-        elif instruction == Instruction.JZ:
-            self._execute_jz(args)
-        elif instruction == Instruction.JNZ:
-            self._execute_jnz(args)
-        elif instruction == Instruction.CALL:
-            self._execute_call(args)
-        elif instruction == Instruction.RET:
-            self._execute_ret()
-        elif instruction == Instruction.HASH:
-            self._execute_hash()
-        elif instruction == Instruction.VERIFY:
-            self._execute_verify()
-        elif instruction == Instruction.SIGN:
-            self._execute_sign()
-        elif instruction == Instruction.HALT:
-            self._execute_halt()
-        elif instruction == Instruction.NOP:
-            self._execute_nop()
-        elif instruction == Instruction.DEBUG:
-            self._execute_debug()
-        elif instruction == Instruction.ASSERT:
-            self._execute_assert()
-        elif instruction == Instruction.LOG:
-            self._execute_log()
-        elif instruction == Instruction.READ:
-            self._execute_read()
-        elif instruction == Instruction.WRITE:
-            self._execute_write()
-        elif instruction == Instruction.SEND:
-            self._execute_send()
-        elif instruction == Instruction.RECV:
-            self._execute_recv()
-        elif instruction == Instruction.TIME:
-            self._execute_time()
-        elif instruction == Instruction.RAND:
-            self._execute_rand()
-        elif instruction == Instruction.ID:
-            self._execute_id()
+        if instruction in self._ARG_INSTRUCTIONS:
+            handler(self, args[0] if args else NO_OPERAND)
         else:
-            raise VMError(f"Unimplemented instruction: {instruction.value}")
+            handler(self)
         
-        # Validate operation if validator is enabled
         if self.validator:
-            # Get outputs after execution
-            outputs = []
-            
-            try:
-                if not self.validator.validate_operation(instruction, inputs, outputs):
-                    self.constraint_violations.append({
-                        "cycle": self.state.cycle_count,
-                        "instruction": instruction.value,
-                        "inputs": inputs,
-                        "outputs": outputs
-                    })
-                    # Note: We continue execution but record the violation
-                    # In production, you might want to halt on constraint violations
-            except Exception as e:
-                print(f"Warning: Constraint validation error: {e}")
+            self._validate_step(instruction)
+    
+    @classmethod
+    def _build_dispatch_table(cls) -> Dict[Instruction, Callable]:
+        """Map every instruction to its (unbound) handler function"""
+        return {
+            instruction: getattr(cls, f"_execute_{instruction.name.lower()}")
+            for instruction in Instruction
+        }
+    
+    def _bind_handler(self, instruction: Instruction, operand: int) -> Callable[["TauFoldZKVM"], None]:
+        """Pre-bind a program slot's handler to its operand.
+        
+        Handlers stay unbound from the VM instance so the dispatch table
+        does not form a reference cycle through self.
+        """
+        handler = self._handlers[instruction]
+        if instruction in self._ARG_INSTRUCTIONS:
+            return partial(handler, operand=operand)
+        return handler
+    
+    def _validate_step(self, instruction: Instruction):
+        """Validate the instruction just executed against its constraints"""
+        
+        # Store state before/after execution for validation
+        inputs = []
+        outputs = []
+        
+        if self.async_validator:
+            self.async_validator.submit(self.state.cycle_count, instruction, inputs, outputs)
+            return
+        
+        try:
+            if not self.validator.validate_operation(instruction, inputs, outputs):
+                self.constraint_violations.append({
+                    "cycle": self.state.cycle_count,
+                    "instruction": instruction.value,
+                    "inputs": inputs,
+                    "outputs": outputs
+                })
+                # Note: We continue execution but record the violation
+                # In production, you might want to halt on constraint violations
+        except Exception as e:
+            print(f"Warning: Constraint validation error: {e}")
     
     # Arithmetic Operations
     def _execute_add(self):
@@ -614,14 +1389,14 @@ class TauFoldZKVM:
         self.state.program_counter += 1
     
     # Memory Operations
-    def _execute_load(self, args):
+    def _execute_load(self, operand: int = NO_OPERAND):
         """Load from memory address"""
-        if not args:
+        if operand == NO_OPERAND:
             if len(self.state.stack) < 1:
                 raise StackUnderflowError("LOAD requires address on stack")
             addr = self.state.stack.pop()
         else:
-            addr = args[0]
+            addr = operand
             
         if addr >= len(self.state.memory):
             raise MemoryError(f"Invalid memory address: {addr}")
@@ -630,19 +1405,19 @@ class TauFoldZKVM:
         self.state.stack.append(value)
         self.state.program_counter += 1
     
-    def _execute_store(self, args):
+    def _execute_store(self, operand: int = NO_OPERAND):
         """Store to memory address"""
         if len(self.state.stack) < 1:
             raise StackUnderflowError("STORE requires value on stack")
             
         value = self.state.stack.pop()
         
-        if not args:
+        if operand == NO_OPERAND:
             if len(self.state.stack) < 1:
                 raise StackUnderflowError("STORE requires address on stack")
             addr = self.state.stack.pop()
         else:
-            addr = args[0]
+            addr = operand
             
         if addr >= len(self.state.memory):
             raise MemoryError(f"Invalid memory address: {addr}")
@@ -650,21 +1425,21 @@ class TauFoldZKVM:
         self.state.memory[addr] = value
         self.state.program_counter += 1
     
-    def _execute_mload(self, args):
+    def _execute_mload(self, operand: int = NO_OPERAND):
         """Memory load (alternative form)"""
-        self._execute_load(args)
+        self._execute_load(operand)
     
-    def _execute_mstore(self, args):
+    def _execute_mstore(self, operand: int = NO_OPERAND):
         """Memory store (alternative form)"""
-        self._execute_store(args)
+        self._execute_store(operand)
     
     # Stack Operations
-    def _execute_push(self, args):
+    def _execute_push(self, operand: int = NO_OPERAND):
         """Push immediate value to stack"""
-        if not args:
+        if operand == NO_OPERAND:
             raise VMError("PUSH requires immediate value")
             
-        self.state.stack.append(args[0])
+        self.state.stack.append(operand)
         self.state.program_counter += 1
     
     def _execute_pop(self):
@@ -696,16 +1471,16 @@ class TauFoldZKVM:
         self.state.program_counter += 1
     
     # Control Flow
-    def _execute_jmp(self, args):
+    def _execute_jmp(self, operand: int = NO_OPERAND):
         """Unconditional jump"""
-        if not args:
+        if operand == NO_OPERAND:
             raise VMError("JMP requires target address")
             
-        self.state.program_counter = args[0]
+        self.state.program_counter = operand
     
-    def _execute_jz(self, args):
+    def _execute_jz(self, operand: int = NO_OPERAND):
         """Jump if zero"""
-        if not args:
+        if operand == NO_OPERAND:
             raise VMError("JZ requires target address")
             
         if len(self.state.stack) < 1:
@@ -713,13 +1488,13 @@ class TauFoldZKVM:
             
         condition = self.state.stack.pop()
         if condition == 0:
-            self.state.program_counter = args[0]
+            self.state.program_counter = operand
         else:
             self.state.program_counter += 1
     
-    def _execute_jnz(self, args):
+    def _execute_jnz(self, operand: int = NO_OPERAND):
         """Jump if not zero"""
-        if not args:
+        if operand == NO_OPERAND:
             raise VMError("JNZ requires target address")
             
         if len(self.state.stack) < 1:
@@ -727,18 +1502,18 @@ class TauFoldZKVM:
             
         condition = self.state.stack.pop()
         if condition != 0:
-            self.state.program_counter = args[0]
+            self.state.program_counter = operand
         else:
             self.state.program_counter += 1
     
-    def _execute_call(self, args):
+    def _execute_call(self, operand: int = NO_OPERAND):
         """Function call"""
-        if not args:
+        if operand == NO_OPERAND:
             raise VMError("CALL requires target address")
             
         # Push return address to stack
         self.state.stack.append(self.state.program_counter + 1)
-        self.state.program_counter = args[0]
+        self.state.program_counter = operand
     
     def _execute_ret(self):
         """Function return"""
@@ -933,6 +1708,27 @@ def create_fibonacci_program() -> List[Tuple[str, List[int]]]:
         ("halt", [])
     ]
 
+def load_json_program(path: Union[str, Path]) -> List[Tuple[str, List[int]]]:
+    """Load a program in the Rust runtime's JSON format (see runtime/examples)"""
+    with open(path) as f:
+        data = json.load(f)
+
+    program = []
+    for entry in data["instructions"]:
+        if isinstance(entry, dict):
+            # {"Push": 42} or {"Load": null}
+            (name, value), = entry.items()
+            args = [] if value is None else [value]
+        elif "(" in entry:
+            # "Push(42)"
+            name, value = entry.rstrip(")").split("(", 1)
+            args = [int(value)] if value else []
+        else:
+            name, args = entry, []
+        program.append((name.lower(), args))
+
+    return program
+
 if __name__ == "__main__":
     print("🚀 TauFoldZKVM Python Runtime")
     print("=" * 50)
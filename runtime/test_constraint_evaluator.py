@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the native evaluator of generated Tau constraints
+"""
+
+import re
+import sys
+from itertools import product
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "compiler"))
+
+from constraint_evaluator import (
+    ConstraintSyntaxError, compile_expression, compile_tau, parse_expression
+)
+from constraint_ir import conj, disj, var, xor
+from python_runtime import ConstraintComponent, TauValidator, Instruction
+from achieve_100_percent import ArithmeticGenerator
+from tau_solver_pool import SolverPool, FAKE_SOLVER_COMMAND
+
+BUILD_DIR = Path(__file__).parent.parent / "compiler" / "build" / "zkvm_100_percent"
+
+
+def test_parse_precedence():
+    """& binds tighter than + (xor), which binds tighter than |"""
+    assert parse_expression("a|b+c&d") is disj(var("a"), xor(var("b"), conj(var("c"), var("d"))))
+    assert parse_expression("((a))") is var("a")
+
+
+def test_complement():
+    """Postfix ' parses as in the constraint IR, so generated NOT components run natively"""
+    assert compile_expression("a=1 && r=a' && r=0").satisfiable() is True
+    assert compile_expression("a=1 && r=a' && r=1").satisfiable() is False
+    compiled = compile_expression("r=(a&b)' && r=0")
+    assert compiled.free_variables == ["a", "b"]
+    assert [compiled.evaluate({"a": a, "b": b}) for a, b in product((0, 1), repeat=2)] == [False, False, False, True]
+
+
+def test_definitions_are_ordered():
+    """Definitions may appear before their inputs; redefinitions become checks"""
+    compiled = compile_expression("s=(x+y) && x=1 && y=0 && s=1")
+    assert [name for name, _ in compiled.definitions].index("s") == 2
+    assert len(compiled.checks) == 1 and compiled.free_variables == []
+    assert compiled.satisfiable() is True
+    assert compile_expression("s=(x+y) && x=1 && y=1 && s=1").satisfiable() is False
+
+
+def test_free_variables_are_enumerated():
+    """Free inputs are searched bit-parallel and evaluated individually"""
+    compiled = compile_expression("c=(a&b) && c=1 && d=(a|b)")
+    assert compiled.free_variables == ["a", "b"]
+    assert compiled.satisfiable() is True
+    assert [compiled.evaluate({"a": a, "b": b}) for a, b in product((0, 1), repeat=2)] == [False, False, False, True]
+    assert compile_expression("x=(a&b) && x=(a+b) && x=1").satisfiable() is False
+    assert compile_expression("a=(b&1) && b=a").satisfiable() is True   # Cycle: checked, not computed
+
+
+def test_full_adder_truth_table():
+    """The generated ripple-carry nibble adder agrees with integer addition"""
+    # Unoptimized circuit: rendered files fold the example input pins into constants
+    constraints = ArithmeticGenerator().generate_add_nibble(0).constraints
+    logic = " && ".join(c for c in constraints if not re.fullmatch(r"[ab]\d=\d", c))
+
+    def outputs(total):
+        return " && ".join(f"s{i}={(total >> i) & 1}" for i in range(4)) + f" && cout0={total >> 4}"
+
+    for a, b in product(range(16), repeat=2):
+        pins = " && ".join(f"a{i}={(a >> i) & 1} && b{i}={(b >> i) & 1}" for i in range(4))
+        assert compile_expression(f"{pins} && {logic} && {outputs(a + b)}").satisfiable() is True
+        assert compile_expression(f"{pins} && {logic} && {outputs((a + b + 1) % 32)}").satisfiable() is False
+
+
+def test_generated_components_compile():
+    """Every generated component is inside the supported fragment"""
+    files = sorted(BUILD_DIR.rglob("*.tau"))
+    assert files
+    for path in files:
+        assert compile_tau(path).satisfiable() is not None, path
+
+
+def test_unsupported_syntax():
+    """Operators outside and/or/xor are left to the Tau solver"""
+    for expression in ("a!=b", "a=2", "a=(b&c", "a&b", "a=b''c"):
+        try:
+            compile_expression(expression)
+        except ConstraintSyntaxError:
+            continue
+        assert False, f"expected ConstraintSyntaxError for {expression}"
+
+
+def test_validator_fast_path():
+    """TauValidator answers supported files natively and falls back to Tau"""
+    native = ConstraintComponent.from_text("xor/xor_nibble_0.tau",
+                                           "solve a0=1 && b0=1 && r0=(a0+b0) && r0=1\n\nquit\n")
+    fallback = ConstraintComponent.from_text("not/not_nibble_0.tau", "solve a0=1 && r0!=a0\n\nquit\n")
+
+    pool = SolverPool(FAKE_SOLVER_COMMAND, workers=1)
+    validator = TauValidator(solver_pool=pool)
+    assert validator._validate_cached(Instruction.XOR, native, (1,), [], []) is False
+    assert validator._validate_cached(Instruction.NOT, fallback, (1,), [], []) is True
+    assert validator.native_checks == 1
+    assert pool.stats()["requests"] == 1
+    pool.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll constraint evaluator tests passed")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the preloaded constraint registry behind TauValidator
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "compiler"))
+
+from python_runtime import ConstraintRegistry, Instruction, TauFoldZKVM, TauValidator, VMError
+from tau_solver_pool import SolverPool, FAKE_SOLVER_COMMAND
+
+
+def make_tree(root: Path):
+    """Two XOR nibbles, an aggregator that needs Tau, and a HALT component"""
+    (root / "xor").mkdir(parents=True)
+    (root / "halt").mkdir()
+    (root / "notes").mkdir()
+    (root / "xor" / "xor_nibble_0.tau").write_text("solve a0=1 && b0=1 && r0=(a0+b0) && r0=0\n\nquit\n")
+    (root / "xor" / "xor_nibble_1.tau").write_text("solve a0=1 && b0=0 && r0=(a0+b0) && r0=0\n\nquit\n")
+    (root / "xor" / "xor_aggregator.tau").write_text("solve r!=r0 && r0=1\n\nquit\n")
+    (root / "halt" / "halt.tau").write_text("solve halt=1 && pc_hold=1\n\nquit\n")
+    (root / "notes" / "scratch.tau").write_text("solve x=1\n\nquit\n")
+
+
+def test_registry_groups_and_preparses():
+    """Components are grouped per instruction and parsed once, at load time"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(Path(tmp))
+        registry = ConstraintRegistry.load(tmp)
+
+        assert len(registry) == 2 and Instruction.ADD not in registry
+        xor = registry.get(Instruction.XOR)
+        assert sorted(xor.nibbles) == [0, 1]
+        assert xor.aggregator.name == "xor/xor_aggregator.tau" and xor.aggregator.compiled is None
+        assert xor.nibbles[0].compiled.satisfiable() is True
+        assert [c.name for c in registry.get(Instruction.HALT).components] == ["halt/halt.tau"]
+
+        try:
+            registry.get(Instruction.ADD)
+        except VMError:
+            pass
+        else:
+            assert False, "expected VMError for an instruction without constraints"
+
+
+def test_validation_does_no_filesystem_io():
+    """Once loaded, validation works with the constraint tree gone"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "build"
+        make_tree(root)
+        pool = SolverPool(FAKE_SOLVER_COMMAND, workers=1)
+        validator = TauValidator(solver_pool=pool, constraint_root=root)
+        assert Instruction.XOR in validator.registry
+        shutil.rmtree(root)
+
+        assert validator.validate_operation(Instruction.XOR, [3, 5], [6]) is False   # Nibble 1 is UNSAT
+        assert validator.validate_operation(Instruction.HALT, [], []) is True
+        assert validator.native_checks == 3
+        assert pool.stats()["requests"] == 0
+        pool.close()
+
+
+def test_default_root_ignores_cwd():
+    """The default registry resolves against the repository, not the working directory"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            registry = ConstraintRegistry.load()
+        finally:
+            os.chdir(cwd)
+    assert registry.root == ConstraintRegistry.DEFAULT_ROOT
+    assert len(registry.get(Instruction.ADD).nibbles) == 8
+
+
+def test_vm_loads_registry_on_first_use():
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(Path(tmp))
+        vm = TauFoldZKVM(constraint_root=tmp, trace="off")
+        assert vm.validator._registry is None
+        assert vm.validator.registry.root == Path(tmp)
+        assert Instruction.XOR in vm.validator.registry
+
+
+def test_missing_or_empty_root_is_rejected_at_construction():
+    """A wrong constraint_root fails when the validator is built, not as an empty registry"""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "notes").mkdir()
+        (Path(tmp) / "notes" / "scratch.tau").write_text("solve x=1\n\nquit\n")
+        for root in (Path(tmp) / "missing", Path(tmp)):
+            for construct in (lambda: TauValidator(constraint_root=root),
+                              lambda: TauFoldZKVM(constraint_root=root, trace="off"),
+                              lambda: ConstraintRegistry.load(root)):
+                try:
+                    construct()
+                except VMError:
+                    continue
+                assert False, f"expected VMError for constraint root {root}"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll constraint registry tests passed")
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Tests for the TauFoldZKVM Python runtime interpreter
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from python_runtime import (
+    TauFoldZKVM, Instruction, VMError, CompactProgram, NO_OPERAND, AsyncValidator,
+    find_basic_blocks, compile_superinstructions,
+    RingTraceSink, create_trace_sink, INSTRUCTION_TO_OPCODE,
+    create_simple_program, create_fibonacci_program, load_json_program
+)
+from trace_format import TraceFileReader
+
+EXAMPLES_DIR = Path(__file__).parent / "examples"
+
+
+def run_program(program, max_cycles=10000, superinstructions=True, trace="list"):
+    vm = TauFoldZKVM(validate_constraints=False, superinstructions=superinstructions, trace=trace)
+    vm.load_program(program)
+    return vm, vm.execute(max_cycles)
+
+
+def compact(program):
+    return CompactProgram.from_instructions([(Instruction(name), args) for name, args in program])
+
+
+def test_simple_program():
+    """PUSH/PUSH/ADD/DUP/LOG/HALT leaves the sum on the stack"""
+    _, result = run_program(create_simple_program())
+    assert result["success"]
+    assert result["cycles"] == 6
+    assert result["final_state"]["stack"] == [100]
+
+
+def test_fibonacci_program():
+    """The looping Fibonacci program terminates with a stable cycle count"""
+    _, result = run_program(create_fibonacci_program())
+    assert result["success"]
+    assert result["cycles"] == 105
+    assert result["final_state"]["stack"] == [0, 1024, 0]
+
+
+def test_dispatch_table_covers_instruction_set():
+    """Every instruction has a handler in the dispatch table"""
+    vm = TauFoldZKVM(validate_constraints=False)
+    assert set(vm._handlers) == set(Instruction)
+
+
+def test_execute_instruction_direct():
+    """Single-step execution uses the same handlers as the main loop"""
+    vm = TauFoldZKVM(validate_constraints=False)
+    vm._execute_instruction(Instruction.PUSH, [7])
+    vm._execute_instruction(Instruction.PUSH, [5])
+    vm._execute_instruction(Instruction.SUB, [])
+    assert vm.state.stack == [2]
+    assert vm.state.program_counter == 3
+
+
+def test_unknown_instruction():
+    """Loading an unknown mnemonic is rejected"""
+    vm = TauFoldZKVM(validate_constraints=False)
+    try:
+        vm.load_program([("bogus", [])])
+    except VMError:
+        return
+    assert False, "expected VMError"
+
+
+def test_compact_program_round_trip():
+    """Lowering to parallel arrays keeps every slot decodable"""
+    program = [(Instruction(name), args) for name, args in create_fibonacci_program()]
+    compact = CompactProgram.from_instructions(program)
+
+    assert len(compact) == len(program)
+    assert compact.opcodes.typecode == "B"
+    assert [compact[pc] for pc in range(len(compact))] == program
+
+    # Branch operands land in the target column, data operands in immediates
+    jz_pc = 4
+    assert compact.targets[jz_pc] == 15 and compact.immediates[jz_pc] == NO_OPERAND
+    assert compact.immediates[0] == 0 and compact.targets[0] == NO_OPERAND
+
+
+def test_compact_program_operand_range():
+    """Any signed 64-bit operand loads, including -1 and values above u32"""
+    program = [(Instruction.PUSH, [-1]), (Instruction.PUSH, [1 << 32]), (Instruction.ADD, []),
+               (Instruction.HALT, [])]
+    compact = CompactProgram.from_instructions(program)
+    assert [compact[pc] for pc in range(len(compact))] == program
+
+    vm, _ = run_program([("PUSH", [-1]), ("PUSH", [1 << 32]), ("HALT", [])])
+    assert vm.state.stack == [-1, 1 << 32]
+
+    vm, _ = run_program([("PUSH", [NO_OPERAND + 1]), ("PUSH", [(1 << 63) - 1]), ("HALT", [])])
+    assert vm.state.stack == [NO_OPERAND + 1, (1 << 63) - 1]
+
+    for operand in (NO_OPERAND, 1 << 63, -(1 << 70), 1.5):
+        try:
+            TauFoldZKVM(validate_constraints=False).load_program([("PUSH", [operand])])
+        except VMError as e:
+            assert "PUSH at 0" in str(e) and "signed 64-bit" in str(e)
+            continue
+        assert False, f"expected VMError for {operand}"
+
+
+def test_basic_blocks():
+    """Leaders are pc 0, branch targets and the slot after each branch"""
+    blocks = find_basic_blocks(compact(create_fibonacci_program()))
+    assert blocks == [(0, 3), (3, 5), (5, 13), (13, 15)]
+
+
+def test_superinstruction_selection():
+    """Fibonacci fuses DUP;JZ and PUSH;SUB inside their blocks"""
+    fused = compile_superinstructions(compact(create_fibonacci_program()))
+    names = {pc: sup.name for pc, sup in enumerate(fused) if sup}
+    assert names == {3: "dup_jz", 10: "push_sub"}
+
+
+def test_superinstructions_match_single_step():
+    """Fused execution yields identical cycles, traces and final state"""
+    countdown = [
+        ("push", [5]),
+        ("dup", []), ("push", [0]), ("eq", []), ("jnz", [8]),
+        ("push", [1]), ("sub", []),
+        ("jmp", [1]),
+        ("push", [3]), ("add", []),
+        ("halt", [])
+    ]
+    underflow = [("push", [1]), ("add", []), ("halt", [])]
+    programs = [create_fibonacci_program(), create_simple_program(), countdown, underflow]
+
+    for program in programs:
+        for max_cycles in (10000, 4, 11):
+            fast, fast_result = run_program(program, max_cycles)
+            slow, slow_result = run_program(program, max_cycles, superinstructions=False)
+            assert fast_result == slow_result
+            assert fast.state.program_counter == slow.state.program_counter
+
+    fused = compile_superinstructions(compact(countdown))
+    assert [sup.name for sup in fused if sup] == ["dup_push_eq_jnz", "push_sub", "push_add"]
+    _, result = run_program(countdown)
+    assert result["final_state"]["stack"] == [3]
+
+
+def test_trace_off():
+    """With tracing off the result carries no per-cycle records"""
+    _, result = run_program(create_fibonacci_program(), trace="off")
+    assert result["success"] and result["cycles"] == 105
+    assert result["trace"] == []
+
+
+def test_ring_trace_keeps_last_steps():
+    """The ring buffer holds exactly the final N steps"""
+    _, full = run_program(create_fibonacci_program())
+    sink = RingTraceSink(capacity=8)
+    _, result = run_program(create_fibonacci_program(), trace=sink)
+
+    assert [step["cycle"] for step in result["trace"]] == list(range(97, 105))
+    assert [step["next_pc"] for step in result["trace"]] == [entry["pc"] for entry in full["trace"][-8:]]
+    # The loop exits with JZ past the last slot, ending the program
+    assert result["trace"][-1]["opcode"] == INSTRUCTION_TO_OPCODE[Instruction.JZ]
+
+
+def test_iter_trace_matches_ring():
+    """Generator consumption yields the same steps as a recording sink"""
+    for superinstructions in (True, False):
+        sink = RingTraceSink(capacity=1000)
+        run_program(create_fibonacci_program(), trace=sink, superinstructions=superinstructions)
+
+        vm = TauFoldZKVM(validate_constraints=False, superinstructions=superinstructions)
+        vm.load_program(create_fibonacci_program())
+        steps = list(vm.iter_trace(chunk_cycles=7))
+
+        assert steps == list(sink.steps)
+        assert vm.state.program_counter == 15 and vm.state.cycle_count == 105
+
+
+def test_columnar_trace_stream():
+    """The "columnar" mode writes the trace file format and agrees with the in-memory steps"""
+    ring = RingTraceSink(capacity=1000)
+    run_program(create_fibonacci_program(), trace=ring)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fib.trace"
+        sink = create_trace_sink("columnar", path=path)
+        sink.buffer_rows = 16
+        with sink:
+            run_program(create_fibonacci_program(), trace=sink)
+
+        with TraceFileReader(path) as reader:
+            for field in ("pc", "opcode", "operand", "next_pc", "stack_depth"):
+                column = reader.raw_column(field)
+                assert list(column) == [getattr(step, field) for step in ring.steps], field
+                column.release()
+            assert reader.register_delta_rows == 0
+
+
+def test_register_deltas():
+    """Register writes reach sinks as (register, value) pairs, not snapshots"""
+    vm = TauFoldZKVM(validate_constraints=False, trace="ring")
+    vm.load_program([("nop", []), ("nop", []), ("halt", [])])
+    vm.state.registers[3] = 99
+    result = vm.execute()
+
+    assert result["trace"][0]["register_deltas"] == ((3, 99),)
+    assert result["trace"][1]["register_deltas"] == ()
+
+
+class RejectingValidator:
+    """Validator stand-in that rejects one instruction and counts its checks"""
+    
+    def __init__(self, reject=Instruction.ADD, delay=0.0):
+        self.reject = reject
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def validate_operation(self, instruction, inputs, outputs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return instruction != self.reject
+
+
+def test_async_validation_matches_sync():
+    """Queued checks report the same violations as blocking ones, deduplicated"""
+    results = {}
+    for mode in ("sync", "async"):
+        validator = RejectingValidator()
+        vm = TauFoldZKVM(validator=validator, validation=mode)
+        vm.load_program(create_fibonacci_program())
+        results[mode] = (vm.execute(), validator.calls)
+    
+    (sync_result, sync_calls), (async_result, async_calls) = results["sync"], results["async"]
+    assert sync_result == async_result
+    assert [v["cycle"] for v in async_result["constraint_violations"]] == list(range(8, 105, 10))
+    assert sync_calls == 105
+    # One check per distinct instruction executed (the loop never reaches LOG/HALT)
+    assert async_calls == 7
+
+
+def test_async_validation_backpressure():
+    """A slow validator with a tiny backlog still sees every cycle before execute returns"""
+    validator = RejectingValidator(reject=Instruction.PUSH, delay=0.001)
+    checker = AsyncValidator(validator, max_pending=2, workers=3, batch_size=1)
+    for cycle in range(50):
+        checker.submit(cycle, Instruction.PUSH, [cycle], [])
+        assert checker._queue.qsize() <= 2
+    
+    violations = checker.join()
+    assert [v["cycle"] for v in violations] == list(range(50))
+    assert validator.calls == 50
+    assert checker.join() == []
+
+
+def test_json_examples():
+    """The shared runtime/examples programs run to HALT"""
+    expected_tops = {"arithmetic": 200, "simple": 100}
+    for path in sorted(EXAMPLES_DIR.glob("*.json")):
+        vm, result = run_program(load_json_program(path))
+        assert result["success"], path.name
+        assert vm.state.halted, path.name
+        if path.stem in expected_tops:
+            assert vm.state.stack[-1] == expected_tops[path.stem]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll runtime tests passed")
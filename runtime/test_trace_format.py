@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar on-disk trace format
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from python_runtime import TauFoldZKVM, RingTraceSink, create_fibonacci_program
+from trace_format import (
+    TraceFileWriter, TraceFileReader, TraceFormatError, STEP_COLUMNS, REGISTER_DELTA_COLUMNS, ALIGNMENT
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def reference_steps():
+    sink = RingTraceSink(capacity=1000)
+    vm = TauFoldZKVM(validate_constraints=False, trace=sink)
+    vm.load_program(create_fibonacci_program())
+    vm.execute()
+    return list(sink.steps)
+
+
+def write_trace(path, buffer_rows=65536):
+    vm = TauFoldZKVM(validate_constraints=False, trace=TraceFileWriter(path, buffer_rows=buffer_rows))
+    vm.load_program(create_fibonacci_program())
+    result = vm.execute()
+    vm.trace_sink.close()
+    return result
+
+
+def test_execute_writes_trace_file():
+    """execute() with trace="file" closes the trace it opened, compacted to its exact size"""
+    steps = reference_steps()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fib.trace"
+        vm = TauFoldZKVM(validate_constraints=False, trace="file", trace_path=path)
+        vm.load_program(create_fibonacci_program())
+        result = vm.execute()
+
+        with TraceFileReader(path) as reader:
+            assert len(reader) == result["cycles"] == len(steps)
+            assert reader.first_cycle == 0
+            sizes = dict(STEP_COLUMNS + REGISTER_DELTA_COLUMNS)
+            end = max(offset + rows * int(sizes[name].lstrip("<")[1:])
+                      for name, (_, offset, rows) in reader.columns.items())
+        # No reserved space left: the 65536-row buffers alone would be megabytes
+        assert path.stat().st_size == end < 65536
+        assert [p.name for p in Path(tmp).iterdir()] == ["fib.trace"]
+
+
+def test_columns_round_trip():
+    """Every step column matches the in-memory trace, across buffer spills"""
+    steps = reference_steps()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fib.trace"
+        write_trace(path, buffer_rows=16)
+
+        with TraceFileReader(path) as reader:
+            for name, _ in STEP_COLUMNS:
+                _, offset, rows = reader.columns[name]
+                assert offset % ALIGNMENT == 0
+                view = reader.raw_column(name)
+                assert list(view) == [getattr(step, name) for step in steps], name
+                view.release()
+            assert reader.register_delta_rows == 0
+
+        # Scratch files are removed on close
+        assert [p.name for p in Path(tmp).iterdir()] == ["fib.trace"]
+
+
+def test_numpy_shards():
+    """Shards are zero-copy views over the mapped file"""
+    if numpy is None:
+        return
+
+    steps = reference_steps()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fib.trace"
+        write_trace(path)
+
+        with TraceFileReader(path) as reader:
+            pcs = []
+            for start, shard in reader.shards(32):
+                assert not shard["pc"].flags.owndata
+                pcs.extend(shard["pc"].tolist())
+            assert pcs == [step.pc for step in steps]
+            del shard
+
+
+def test_flush_appends_in_place():
+    """Flushes that fit the reserved space append without rewriting the file"""
+    steps = reference_steps()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fib.trace"
+        writer = TraceFileWriter(path, buffer_rows=16)
+        for step in steps[:8]:
+            writer.record(*step)
+        writer.flush()
+        inode = path.stat().st_ino
+        for step in steps[8:16]:
+            writer.record(*step)
+        writer.flush()
+        assert path.stat().st_ino == inode and writer.moves == 0
+        with TraceFileReader(path) as reader:
+            assert len(reader) == 16
+
+        # Growing past the reservation doubles it: a logarithmic number of moves
+        for step in steps[16:]:
+            writer.record(*step)
+        writer.flush()
+        assert writer.moves == 3   # 16 -> 32 -> 64 -> 128 rows for 105 steps
+        writer.close()
+        with TraceFileReader(path) as reader:
+            assert len(reader) == len(steps)
+            assert path.stat().st_size == reader.columns["register_value"][1]
+
+
+def test_rejects_foreign_files():
+    """Files without the trace magic are refused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bogus.trace"
+        path.write_bytes(b"not a trace file at all, just some bytes" * 2)
+        try:
+            TraceFileReader(path)
+        except TraceFormatError:
+            return
+        assert False, "expected TraceFormatError"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll trace format tests passed")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the constraint-validation verdict cache
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "compiler"))
+
+from python_runtime import ConstraintComponent, TauValidator, ValidationCache, Instruction
+from tau_solver_pool import SolverPool, FAKE_SOLVER_COMMAND
+
+
+def make_validator() -> TauValidator:
+    """Validator backed by a private pool of the fake Tau REPL, native fast path off"""
+    return TauValidator(solver_pool=SolverPool(FAKE_SOLVER_COMMAND, workers=1), native=False)
+
+
+def solver_calls(validator: TauValidator) -> int:
+    return validator.solver_pool.stats()["requests"]
+
+
+def test_verdicts_are_memoized():
+    """Repeated checks with the same nibble inputs run the solver once"""
+    component = ConstraintComponent.from_text("add/add_nibble_0.tau", "solve a0=1 && b0=0\nquit")
+    validator = make_validator()
+
+    for _ in range(3):
+        assert validator._validate_cached(Instruction.ADD, component, (1, 2, 3), [], [])
+    assert solver_calls(validator) == 1
+
+    # New inputs and edited constraints are both misses
+    assert validator._validate_cached(Instruction.ADD, component, (4, 5, 9), [], [])
+    edited = ConstraintComponent.from_text(component.name, "solve a0=0 && b0=0\nquit")
+    assert validator._validate_cached(Instruction.ADD, edited, (1, 2, 3), [], [])
+    assert solver_calls(validator) == 3
+    assert validator.constraint_cache.hits == 2
+    validator.solver_pool.close()
+
+
+def test_solver_errors_are_not_cached():
+    """A solver that cannot run rejects the operation but leaves no verdict"""
+    with tempfile.TemporaryDirectory() as tmp:
+        component = ConstraintComponent.from_text("halt/halt.tau", "solve h=1\nquit")
+        validator = TauValidator(tau_path=str(Path(tmp) / "missing_solver.sh"), native=False)
+
+        assert not validator._validate_cached(Instruction.HALT, component, (), [], [])
+        assert len(validator.constraint_cache) == 0
+
+
+def test_lru_eviction():
+    """The least recently used verdict is evicted first"""
+    cache = ValidationCache(max_entries=2)
+    keys = [ValidationCache.make_key(Instruction.XOR, "h", (i,)) for i in range(3)]
+
+    cache.put(keys[0], True)
+    cache.put(keys[1], False)
+    assert cache.get(keys[0]) is True      # keys[1] is now least recent
+    cache.put(keys[2], True)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is True and cache.get(keys[2]) is True
+
+
+def test_persistent_store():
+    """Verdicts survive across cache instances through sqlite"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "verdicts.sqlite"
+        key = ValidationCache.make_key(Instruction.SUB, "abc123", (7, 1, 6))
+
+        first = ValidationCache(path=path)
+        first.put(key, False)
+        first.close()
+
+        second = ValidationCache(path=path)
+        assert second.get(key) is False
+        assert second.hits == 1
+        second.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    print("\nAll validation cache tests passed")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+TauFoldZKVM Columnar Trace Format
+
+Fixed-width, columnar on-disk execution traces for the prover and folding
+stages. A trace file is a header, a column directory and one contiguous
+little-endian array per column, each aligned to 64 bytes:
+
+    header     magic, version, column count, step rows, delta rows, first cycle
+    directory  per column: name, dtype, byte offset, row count
+    columns    pc | opcode | operand | next_pc | stack_depth |
+               register_cycle | register_index | register_value
+
+Step columns hold one row per executed instruction (cycle = first_cycle +
+row); the register_* columns are a sparse table with one row per register
+write. TraceFileReader memory-maps the file so columns are exposed as
+NumPy views and can be sliced into shards without parsing or copying.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"TFZTRACE"
+VERSION = 1
+ALIGNMENT = 64
+
+HEADER = struct.Struct("<8sHHQQQ")        # magic, version, column_count, rows, delta_rows, first_cycle
+COLUMN_ENTRY = struct.Struct("<24s8sQQ")  # name, dtype, offset, rows
+
+# Per-step columns: (name, NumPy dtype string)
+STEP_COLUMNS = (
+    ("pc", "<u4"),
+    ("opcode", "u1"),
+    ("operand", "<i8"),
+    ("next_pc", "<i8"),
+    ("stack_depth", "<u4"),
+)
+
+# Sparse register-delta columns, one row per register write
+REGISTER_DELTA_COLUMNS = (
+    ("register_cycle", "<u8"),
+    ("register_index", "u1"),
+    ("register_value", "<u8"),
+)
+
+# memoryview.cast formats for the raw (NumPy-free) column views
+_CAST_FORMATS = {"<u4": "I", "u1": "B", "<i8": "q", "<u8": "Q"}
+
+
+class TraceFormatError(Exception):
+    """Raised when a trace file is malformed or of an unsupported version"""
+    pass
+
+
+def _typecode(dtype: str) -> str:
+    """array typecode with the exact item size of a fixed-width dtype"""
+    kind, size = dtype.lstrip("<")[0], int(dtype.lstrip("<")[1:])
+    candidates = "bhilq" if kind == "i" else "BHILQ"
+    for typecode in candidates:
+        if array(typecode).itemsize == size:
+            return typecode
+    raise TraceFormatError(f"No array typecode for {dtype}")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class TraceFileWriter:
+    """Trace sink that writes the columnar trace format.
+
+    Implements the TraceSink interface of python_runtime, so it can be
+    passed as TauFoldZKVM(trace=TraceFileWriter(path)). Rows are buffered
+    in arrays; flush() appends each column's new rows in place, into space
+    reserved after the column, and rewrites the header and directory, so
+    the file at path is readable after every flush at a cost proportional
+    to the rows added. A column that outgrows its space is moved together
+    with the others into a file with twice the reservations (amortized
+    constant work per row); close() compacts the file to its exact size.
+    """
+
+    def __init__(self, path: Union[str, Path], buffer_rows: int = 65536):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_rows = buffer_rows
+        self.first_cycle: Optional[int] = None
+        self.moves = 0
+
+        self._all_columns = STEP_COLUMNS + REGISTER_DELTA_COLUMNS
+        self._sizes = {name: int(dtype.lstrip("<")[1:]) for name, dtype in self._all_columns}
+        self._buffers = {name: array(_typecode(dtype)) for name, dtype in self._all_columns}
+        self._rows = {name: 0 for name, _ in self._all_columns}
+        self._capacity = {name: buffer_rows for name, _ in self._all_columns}
+        self._offsets = self._layout(self._capacity)
+        self._file = open(self.path, "w+b")
+        self._write_header(self._file)
+        self._step_appends = [self._buffers[name].append for name, _ in STEP_COLUMNS]
+
+    @property
+    def rows(self) -> int:
+        return self._rows["pc"] + len(self._buffers["pc"])
+
+    def record(self, cycle, pc, opcode, operand, next_pc, stack_depth, register_deltas):
+        if self.first_cycle is None:
+            self.first_cycle = cycle
+
+        append_pc, append_opcode, append_operand, append_next_pc, append_depth = self._step_appends
+        append_pc(pc)
+        append_opcode(opcode)
+        append_operand(operand)
+        append_next_pc(next_pc)
+        append_depth(stack_depth)
+
+        for register, value in register_deltas:
+            self._buffers["register_cycle"].append(cycle)
+            self._buffers["register_index"].append(register)
+            self._buffers["register_value"].append(value)
+
+        if len(self._buffers["pc"]) >= self.buffer_rows:
+            self.flush()
+
+    def entries(self) -> List:
+        return []
+
+    def _layout(self, capacity: Dict[str, int]) -> Dict[str, int]:
+        """Column offsets when each column has room for capacity[name] rows"""
+        offset = _align(HEADER.size + COLUMN_ENTRY.size * len(self._all_columns))
+        offsets = {}
+        for name, _ in self._all_columns:
+            offsets[name] = offset
+            offset = _align(offset + capacity[name] * self._sizes[name])
+        return offsets
+
+    def _write_header(self, out):
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, len(self._all_columns), self._rows["pc"],
+                              self._rows["register_cycle"], self.first_cycle or 0))
+        for name, dtype in self._all_columns:
+            out.write(COLUMN_ENTRY.pack(name.encode(), dtype.encode(), self._offsets[name], self._rows[name]))
+        # Readers may map every column, including empty ones at the end
+        out.truncate(max(self._offsets[name] + self._rows[name] * self._sizes[name] for name in self._offsets))
+
+    def _move(self, capacity: Dict[str, int]):
+        """Rewrite the file with new column reservations, replacing it atomically"""
+        offsets = self._layout(capacity)
+        partial = self.path.with_name(self.path.name + ".partial")
+        with open(partial, "w+b") as out:
+            for name, _ in self._all_columns:
+                self._file.seek(self._offsets[name])
+                out.seek(offsets[name])
+                remaining = self._rows[name] * self._sizes[name]
+                while remaining:
+                    chunk = self._file.read(min(remaining, 1 << 20))
+                    out.write(chunk)
+                    remaining -= len(chunk)
+            self._capacity, self._offsets = capacity, offsets
+            self._write_header(out)
+        self._file.close()
+        os.replace(partial, self.path)
+        self._file = open(self.path, "r+b")
+        self.moves += 1
+
+    def flush(self):
+        """Append buffered rows in place and update the header and directory"""
+        if self._file is None:
+            return
+
+        pending = {name: self._rows[name] + len(buffer) for name, buffer in self._buffers.items()}
+        if any(pending[name] > self._capacity[name] for name in pending):
+            self._move({name: max(2 * self._capacity[name], pending[name]) for name in pending})
+
+        for name, buffer in self._buffers.items():
+            if not buffer:
+                continue
+            if sys.byteorder != "little" and buffer.itemsize > 1:
+                buffer.byteswap()
+            self._file.seek(self._offsets[name] + self._rows[name] * self._sizes[name])
+            buffer.tofile(self._file)
+            self._rows[name] += len(buffer)
+            del buffer[:]
+
+        self._write_header(self._file)
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        if self._capacity != self._rows:
+            self._move(dict(self._rows))
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TraceFileReader:
+    """Memory-mapped reader for the columnar trace format.
+
+    column() returns NumPy arrays that view the mapped file directly;
+    raw_column() returns the same data as a memoryview for callers without
+    NumPy. Views must be released before close().
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise TraceFormatError(f"Empty trace file: {self.path}")
+
+        try:
+            magic, version, column_count, rows, delta_rows, first_cycle = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise TraceFormatError(f"Not a TauFoldZKVM trace file: {self.path}")
+            if version != VERSION:
+                raise TraceFormatError(f"Unsupported trace version {version}: {self.path}")
+        except (TraceFormatError, struct.error) as e:
+            self._mmap.close()
+            self._file.close()
+            if isinstance(e, struct.error):
+                raise TraceFormatError(f"Truncated trace header: {self.path}")
+            raise
+
+        self.rows = rows
+        self.register_delta_rows = delta_rows
+        self.first_cycle = first_cycle
+        self.columns: Dict[str, Tuple[str, int, int]] = {}
+        for index in range(column_count):
+            name, dtype, offset, column_rows = COLUMN_ENTRY.unpack_from(
+                self._mmap, HEADER.size + index * COLUMN_ENTRY.size
+            )
+            self.columns[name.rstrip(b"\0").decode()] = (dtype.rstrip(b"\0").decode(), offset, column_rows)
+        self._views: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _entry(self, name: str) -> Tuple[str, int, int]:
+        if name not in self.columns:
+            raise KeyError(f"Unknown trace column: {name}")
+        return self.columns[name]
+
+    def column(self, name: str):
+        """Zero-copy NumPy view of a whole column"""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("NumPy is required for TraceFileReader.column(); use raw_column() instead")
+
+        if name not in self._views:
+            dtype, offset, rows = self._entry(name)
+            self._views[name] = np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=rows, offset=offset)
+        return self._views[name]
+
+    def raw_column(self, name: str) -> memoryview:
+        """Zero-copy memoryview of a whole column (native byte order)"""
+        dtype, offset, rows = self._entry(name)
+        size = int(dtype.lstrip("<")[1:])
+        return memoryview(self._mmap)[offset:offset + rows * size].cast(_CAST_FORMATS[dtype])
+
+    def shard(self, start: int, stop: int) -> Dict[str, object]:
+        """Views of steps [start, stop) plus the register writes in that cycle range"""
+        shard = {name: self.column(name)[start:stop] for name, _ in STEP_COLUMNS}
+
+        cycles = self.column("register_cycle")
+        low, high = cycles.searchsorted([self.first_cycle + start, self.first_cycle + stop])
+        for name, _ in REGISTER_DELTA_COLUMNS:
+            shard[name] = self.column(name)[low:high]
+        return shard
+
+    def shards(self, shard_rows: int) -> Iterator[Tuple[int, Dict[str, object]]]:
+        """Split the trace into consecutive shards of shard_rows steps"""
+        for start in range(0, self.rows, shard_rows):
+            yield start, self.shard(start, min(start + shard_rows, self.rows))
+
+    def close(self):
+        self._views.clear()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()